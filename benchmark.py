@@ -0,0 +1,388 @@
+"""
+Benchmarks for the drilling report parser.
+Generates synthetic DOR workbooks and times each stage of a report, so changes that slow it down are caught.
+"""
+
+
+# IMPORTS
+try:
+    import os
+    import sys
+    import io
+    import copy
+    import json
+    import time
+    import random
+    import argparse
+    import tempfile
+    import subprocess
+    from contextlib import redirect_stdout
+    from datetime import date, datetime, time as clock, timedelta
+    from openpyxl import Workbook
+    import pandas as pd
+    import main
+except:
+    print("Please install the required modules by running the setup.bat file.")
+    exit()
+
+
+# CONSTANTS
+
+# Stored timings to compare against, written with --save-baseline.
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+# How much slower (as a fraction) than the baseline a stage can be before it is reported as a regression.
+TOLERANCE = 0.25
+
+# Stages shorter than this (in seconds) are too noisy to be compared against the baseline.
+MINIMUM_COMPARED_TIME = 0.01
+
+START_DATE = date(2024, 1, 1)
+FIRST_DEPTH = 1500.0
+STAGES = ["open", "read", "parse", "aggregate", "render", "report"]
+STARTUP_CASE = "startup"
+
+
+# UTILITY FUNCTIONS
+
+def to_cell_time(minutes: int) -> clock | datetime:
+    """
+    Convert minutes since midnight to the value Excel stores in a time cell.
+    The end of the day is stored as 1, which is read back as "1900-01-01 00:00:00".
+
+    Parameters:
+        minutes (int): The minutes since midnight, from 0 to 1440.
+
+    Returns:
+        time | datetime: The value of the cell.
+    """
+
+    if minutes >= 1440:
+        return datetime(1900, 1, 1)
+    return clock(minutes // 60, minutes % 60)
+
+def describe_drilling(generator: random.Random, depth: float, mud_weight: int) -> str:
+    """
+    Write the description of a drilling operation, as it would be in a DOR.
+
+    Parameters:
+        generator (random.Random): The random number generator.
+        depth (float): The depth drilled to, in metres.
+        mud_weight (int): The mud weight, in kg/m³.
+
+    Returns:
+        str: The description of the operation.
+    """
+
+    entries = [
+        f"{mud_weight} kg/m³ MW",
+        f"{generator.choice([1250, 1262.5, 1270])} kg/m³ ECD",
+        f"{generator.choice([2.1, 2.25, 2.4])} m³/min",
+        generator.choice([
+            f"{generator.randint(300, 3000)} kPa BP",
+            f"{generator.randint(100, 900)} kPa Line Restriction",
+            f"{generator.randint(100, 900)} kPa"
+        ])
+    ]
+    generator.shuffle(entries)
+    return f"Drilling (to {depth:.1f}m) @ " + ". ".join(entries)
+
+def describe_connection(generator: random.Random, depth: float, mud_weight: int) -> str:
+    """
+    Write the description of a connection, as it would be in a DOR.
+
+    Parameters:
+        generator (random.Random): The random number generator.
+        depth (float): The depth of the connection, in metres.
+        mud_weight (int): The mud weight, in kg/m³.
+
+    Returns:
+        str: The description of the operation.
+    """
+
+    entries = [
+        f"{mud_weight} kg/m³ MW",
+        f"{generator.choice([1230, 1240.5])} kg/m³ ESD",
+        generator.choice([
+            "No BP",
+            "Closed Choke BP",
+            f"{generator.randint(0, 2000)} to {generator.randint(2000, 4000)} kPa BP"
+        ]),
+        generator.choice([
+            "No Gas to Report",
+            f"{generator.uniform(0, 30):.1f} KSCM/Day B/U",
+            f"{generator.uniform(0, 5):.1f} ShakerGas B/U",
+            "Flame B/U"
+        ])
+    ]
+    return f"Connection @ {depth:.1f}m. " + ". ".join(entries)
+
+def generate_workbook(filename: str, days: int, operations: int, seed: int = 1) -> None:
+    """
+    Generate a synthetic DOR workbook.
+    Each day is a sheet named after its date, with 21 header rows below the title, followed by the operations table and the crew table.
+    The operations of a day cover it from 0:00 to 24:00, and are drilling operations, connections and other operations, with realistic descriptions.
+
+    Parameters:
+        filename (str): The path of the workbook to write.
+        days (int): The number of days (sheets).
+        operations (int): The number of operations per day, at most 1440.
+        seed (int): The seed of the random number generator, so the same workbook is generated every time. Default is 1.
+
+    Returns:
+        None
+    """
+
+    generator = random.Random(seed)
+    workbook = Workbook(write_only=True)
+    summary = workbook.create_sheet("Summary")
+    summary.append(["Well summary"])
+
+    depth = FIRST_DEPTH
+    for day in range(days):
+        sheet = workbook.create_sheet((START_DATE + timedelta(days=day)).strftime("%Y %b-%d"))
+        sheet.append(["Daily Operations Report"])
+        for row in range(21):
+            sheet.append([f"Header {row + 1}", None, generator.randint(0, 100)])
+
+        # Split the day into operations at random minutes.
+        cuts = sorted(generator.sample(range(1, 1440), min(operations, 1440) - 1))
+        for start, end in zip([0] + cuts, cuts + [1440]):
+            mud_weight = generator.choice([1180, 1190, 1200])
+            kind = generator.choice("DDCCCX")
+            if kind == "D":
+                depth += generator.uniform(5, 60)
+                code = "D"
+                description = describe_drilling(generator, depth, mud_weight)
+            elif kind == "C":
+                code = generator.choice(["C", "C", 3])
+                description = describe_connection(generator, depth, mud_weight)
+            else:
+                code = "X"
+                description = generator.choice(["Circulate bottoms up", "Flow check", "Service rig"])
+            sheet.append([to_cell_time(start), None, to_cell_time(end), (end - start) / 60, None, code, None, description])
+
+        sheet.append([])
+        sheet.append(["Crew", None, "Driller"])
+        for row in range(20):
+            sheet.append([None, "Personnel", None, None, 12.5])
+
+    workbook.save(filename)
+
+def measure(function, repeats: int) -> float:
+    """
+    Time a function, keeping the fastest of several runs to reduce noise.
+    Anything the function prints, such as warnings, is discarded.
+
+    Parameters:
+        function (callable): The function to time, called without arguments.
+        repeats (int): The number of runs.
+
+    Returns:
+        float: The fastest time, in seconds.
+    """
+
+    best = None
+    for _ in range(repeats):
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - start
+        if best == None or elapsed < best:
+            best = elapsed
+    return best
+
+def benchmark_workbook(filename: str, repeats: int, workers: int) -> dict:
+    """
+    Time each stage of a report on a workbook.
+    The stages are opening the workbook, reading the operations tables, parsing them, aggregating the days, rendering the document,
+    and generating the whole report the way the command line does.
+
+    Parameters:
+        filename (str): The path of the workbook.
+        repeats (int): The number of runs of each stage, the fastest is kept.
+        workers (int): The number of worker processes used for the whole report.
+
+    Returns:
+        dict: The time of each stage, in seconds.
+    """
+
+    timings = {}
+    timings["open"] = measure(lambda: pd.ExcelFile(filename), repeats)
+
+    data = pd.ExcelFile(filename)
+    sheets = main.get_date_sheets(data)
+    rows = []
+    def read():
+        rows[:] = [list(main.read_operations(data, sheet)) for sheet in sheets]
+    timings["read"] = measure(read, repeats)
+
+    # Parsing changes the rows, so every run parses a fresh copy.
+    copies = [copy.deepcopy(rows) for _ in range(repeats)]
+    days = []
+    def parse():
+        days[:] = [main.parse_sheet(day) for day in copies.pop()]
+    timings["parse"] = measure(parse, repeats)
+
+    numbers = list(range(1, len(days) + 1))
+    def aggregate():
+        table = main.build_operation_table(days, numbers)
+        main.build_rows(main.summarize_days(table, numbers, main.LINE_RESTRICTION_MAXIMUM))
+    timings["aggregate"] = measure(aggregate, repeats)
+
+    with redirect_stdout(io.StringIO()):
+        report = main.create_report(data, sheets, sheets[0], "00:00", sheets[-1], "23:59", workers=1)
+    timings["render"] = measure(lambda: main.write_document(report, io.BytesIO()), repeats)
+
+    def whole():
+        workbook = pd.ExcelFile(filename)
+        sheets = main.get_date_sheets(workbook)
+        report = main.create_report(workbook, sheets, sheets[0], "00:00", sheets[-1], "23:59", workers=workers)
+        main.write_document(report, io.BytesIO())
+    timings["report"] = measure(whole, repeats)
+
+    return timings
+
+def measure_startup(repeats: int) -> dict:
+    """
+    Time how long the program takes to start, without the time the Python interpreter itself takes.
+    Each run is a new process, so nothing is already imported.
+
+    Parameters:
+        repeats (int): The number of runs, the fastest is kept.
+
+    Returns:
+        dict: The time to import the program, and to print the command-line help, in seconds.
+    """
+
+    directory = os.path.dirname(os.path.abspath(main.__file__))
+    commands = {
+        "interpreter": [sys.executable, "-c", "pass"],
+        "import": [sys.executable, "-c", "import main"],
+        "help": [sys.executable, "main.py", "--help"]
+    }
+
+    timings = {}
+    for name, command in commands.items():
+        def start():
+            subprocess.run(command, cwd=directory, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        timings[name] = measure(start, repeats)
+    interpreter = timings.pop("interpreter")
+    return {name: max(elapsed - interpreter, 0.0) for name, elapsed in timings.items()}
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Compare timings against the baseline.
+
+    Parameters:
+        results (dict): The timings of each case and stage, in seconds.
+        baseline (dict): The stored timings, in the same format.
+        tolerance (float): How much slower (as a fraction) a stage can be before it is a regression.
+
+    Returns:
+        list: The regressions, as tuples of the case, the stage, the baseline time and the new time.
+    """
+
+    regressions = []
+    for case, timings in results.items():
+        for stage, elapsed in timings.items():
+            previous = baseline.get(case, {}).get(stage)
+            if previous == None or max(previous, elapsed) < MINIMUM_COMPARED_TIME:
+                continue
+            if elapsed > previous * (1 + tolerance):
+                regressions.append((case, stage, previous, elapsed))
+    return regressions
+
+def run(options: argparse.Namespace) -> int:
+    """
+    Run the benchmarks on generated workbooks, print the timings and compare them against the baseline.
+
+    Parameters:
+        options (argparse.Namespace): The command-line options.
+
+    Returns:
+        int: The exit code, EXIT_FAILURE if a stage regressed or there is no baseline to compare against.
+    """
+
+    directory = options.workbooks or tempfile.mkdtemp(prefix="dor_benchmark_")
+    os.makedirs(directory, exist_ok=True)
+
+    results = {STARTUP_CASE: measure_startup(options.repeats)}
+    main.fprint(f"{main.Colors.BOLD}{STARTUP_CASE}")
+    for stage, elapsed in results[STARTUP_CASE].items():
+        main.fprint(f"\t{stage:<10}{elapsed:>9.3f}s")
+
+    for days in options.days:
+        case = f"{days} days x {options.operations} operations"
+        filename = os.path.join(directory, f"dor_{days}x{options.operations}_{options.seed}.xlsx")
+        if not os.path.exists(filename):
+            generate_workbook(filename, days, options.operations, options.seed)
+        results[case] = benchmark_workbook(filename, options.repeats, options.workers)
+
+        main.fprint(f"{main.Colors.BOLD}{case}")
+        for stage in STAGES:
+            main.fprint(f"\t{stage:<10}{results[case][stage]:>9.3f}s")
+
+    baseline = {}
+    if os.path.exists(options.baseline):
+        with open(options.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    if options.save_baseline:
+        baseline.update(results)
+        with open(options.baseline, "w", encoding="utf-8") as file:
+            json.dump(baseline, file, indent=4)
+        main.fprint(f"Baseline saved to {options.baseline}.")
+        return main.EXIT_SUCCESS
+
+    # Timings depend on the machine, so there is no baseline until one is saved on it, and nothing was checked.
+    if len(baseline) == 0:
+        main.Logger.error(f"No baseline to compare against in {options.baseline}, so regressions were not checked. Run with --save-baseline first to store one.")
+        return main.EXIT_FAILURE
+
+    regressions = compare(results, baseline, options.tolerance)
+    for case, stage, previous, elapsed in regressions:
+        main.Logger.error(f"{case}: {stage} took {elapsed:.3f}s, {elapsed / previous - 1:.0%} slower than the baseline ({previous:.3f}s).")
+    if len(regressions) > 0:
+        return main.EXIT_FAILURE
+    main.fprint(f"{main.Colors.GREEN}No regressions against the baseline.")
+    return main.EXIT_SUCCESS
+
+
+# MAIN FUNCTION
+
+def benchmark(arguments: list) -> int:
+    parser = argparse.ArgumentParser(prog="benchmark.py", description="Generate synthetic DOR workbooks and benchmark the drilling report parser.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="generate a synthetic DOR workbook")
+    generate.add_argument("output", help="the path of the workbook to write (.xlsx)")
+    generate.add_argument("--days", type=int, default=30, help="the number of days (sheets). Default is 30")
+    generate.add_argument("--operations", type=int, default=30, help="the number of operations per day. Default is 30")
+    generate.add_argument("--seed", type=int, default=1, help="the seed of the random data. Default is 1")
+
+    runner = commands.add_parser("run", help="time each stage of a report and compare against the baseline")
+    runner.add_argument("--days", type=int, nargs="+", default=[10, 60, 180], help="the numbers of days of the benchmarked workbooks. Default is 10 60 180")
+    runner.add_argument("--operations", type=int, default=30, help="the number of operations per day. Default is 30")
+    runner.add_argument("--seed", type=int, default=1, help="the seed of the random data. Default is 1")
+    runner.add_argument("--repeats", type=int, default=3, help="the number of runs of each stage, the fastest is kept. Default is 3")
+    runner.add_argument("--workers", type=int, default=main.WORKERS, help="the number of worker processes for the whole report. Default is the number of CPUs")
+    runner.add_argument("--workbooks", metavar="DIRECTORY", help="where to keep the generated workbooks, so they are reused. Default is a temporary directory")
+    runner.add_argument("--baseline", default=BASELINE_FILE, help="the baseline file. Default is benchmark_baseline.json next to this file")
+    runner.add_argument("--save-baseline", action="store_true", help="store the timings as the new baseline instead of comparing")
+    runner.add_argument("--tolerance", type=float, default=TOLERANCE, help="how much slower than the baseline a stage can be, as a fraction. Default is 0.25")
+    options = parser.parse_args(arguments)
+
+    days = options.days if type(options.days) == list else [options.days]
+    if min(days) < 1 or not 1 <= options.operations <= 1440:
+        main.Logger.error("The number of days must be at least 1, and the number of operations between 1 and 1440.")
+        return main.EXIT_USAGE
+
+    if options.command == "generate":
+        generate_workbook(options.output, options.days, options.operations, options.seed)
+        main.fprint(f"Workbook saved as {options.output}.")
+        return main.EXIT_SUCCESS
+    return run(options)
+
+if __name__ == "__main__":
+    sys.exit(benchmark(sys.argv[1:]))
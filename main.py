@@ -5,25 +5,236 @@ Feel free to read through the code and understand how it works.
 
 
 # IMPORTS
+from __future__ import annotations
 try:
     import os
+    import sys
     import math
+    import argparse
     import re
-    import pandas as pd
-    from docx import Document
-    from docx.shared import Pt, Cm, RGBColor
-    from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-    from docx.enum.table import WD_ALIGN_VERTICAL
+    import hashlib
+    import pickle
+    import json
+    import zipfile
+    import importlib.util
+    import threading
+    from io import BytesIO
+    from collections import OrderedDict
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    from urllib.parse import urlparse, parse_qs
+    from bisect import bisect_left, bisect_right
+    from time import perf_counter, monotonic, sleep
+    from contextlib import contextmanager
+    from functools import lru_cache
+    from xml.sax.saxutils import escape
+    from concurrent.futures import ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
     from datetime import datetime
-    from docx.oxml.ns import nsdecls
-    from docx.oxml import parse_xml
-    import tkinter as tk
-    from tkinter import filedialog
+
+    # Heavy modules are only imported when they are first used, so the program starts quickly.
+    # pandas is loaded on first access and tkinter when a dialog is opened. python-docx is only needed for its document template, found when a document is written.
+    # pandas picks and imports the Excel engine (openpyxl, pyxlsb or xlrd) for the format of each file it opens.
+    for name in ["pandas", "numpy"]:
+        spec = importlib.util.find_spec(name)
+        if spec == None:
+            raise ImportError(name)
+        # Modules that were already imported, for example by a script importing this one, are used as they are.
+        if name in sys.modules:
+            continue
+        spec.loader = importlib.util.LazyLoader(spec.loader)
+        sys.modules[name] = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(sys.modules[name])
+    pd = sys.modules["pandas"]
+    np = sys.modules["numpy"]
 except:
     print("Please install the required modules by running the setup.bat file.")
     exit()
 
 
+# CONSTANTS
+
+# Location and maximum size (in bytes) of the on-disk cache of parsed sheets.
+CACHE_DIRECTORY = os.path.join(os.path.expanduser("~"), ".drilling_report_parser", "cache")
+CACHE_SIZE_LIMIT = 64 * 1024 * 1024
+
+# Version of the cached data format, entries written with another version are ignored.
+CACHE_VERSION = 1
+
+# Location of the day summaries stored for incremental reports, and the version of their format.
+STORE_DIRECTORY = os.path.join(os.path.expanduser("~"), ".drilling_report_parser", "days")
+STORE_VERSION = 3
+
+# Statistics of each day kept with its summary, for range queries that do not need the operations, see RangeStatistics.
+# They are independent of the line restriction threshold. Each value has either a minimum and maximum, or a sum and count for its mean.
+DAY_STATISTICS = [
+    "depth_minimum",
+    "depth_maximum",
+    "mud_weight_minimum",
+    "mud_weight_maximum",
+    "pump_rate_minimum",
+    "pump_rate_maximum",
+    "dynamic_bp_minimum",
+    "dynamic_bp_maximum",
+    "static_bp_minimum",
+    "static_bp_maximum",
+    "ecd_sum",
+    "ecd_count",
+    "esd_sum",
+    "esd_count",
+    "kscm_gas_maximum",
+    "shaker_gas_maximum"
+]
+STATISTIC_VALUES = {
+    "depth": ("Depth", "m"),
+    "mud_weight": ("Mud weight", "kg/m³"),
+    "pump_rate": ("Pump rate", "m³/min"),
+    "dynamic_bp": ("Dynamic BP", "kPa"),
+    "static_bp": ("Static BP", "kPa"),
+    "ecd": ("ECD", "kg/m³"),
+    "esd": ("ESD", "kg/m³"),
+    "kscm_gas": ("B/U gas", "KSCM/Day B/U"),
+    "shaker_gas": ("B/U gas", "ShakerGas B/U")
+}
+
+# Number of rows above the operations table in a DOR sheet, including the column headers.
+OPERATIONS_FIRST_ROW = 22
+
+# Number of leading values in a row that make up an operation (From, To, Duration, Code, Description).
+OPERATION_COLUMNS = 5
+
+# Number of rows read at first when looking for the end of the operations table.
+OPERATIONS_READ_ROWS = 64
+
+# Text values pandas treats as missing when reading a sheet, along with the errors Excel shows in cells.
+MISSING_VALUES = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+    "#DIV/0!", "#NAME?", "#NULL!", "#NUM!", "#REF!", "#VALUE!"
+}
+
+# Patterns used to split an operation description into the part before and after the first "@", and to find the keywords of each entry.
+DESCRIPTION_PATTERN = re.compile(r"([^@]*)(?:@([^@]*))?")
+DESCRIPTION_KEYWORDS = re.compile(r"kPa Line Restriction|kPa BP|kPa|BP|MW|ECD|ESD|m³/min|KSCM/Day B/U|ShakerGas B/U|No Gas to Report|Flame B/U")
+
+# Patterns used to find the shared strings part of an .xlsx or .xlsm archive, and each of its entries.
+SHARED_STRINGS_RELATIONSHIP = re.compile(rb"<Relationship\b[^>]*?Type=\"[^\"]*/sharedStrings\"[^>]*>")
+SHARED_STRINGS_TARGET = re.compile(rb"Target=\"([^\"]*)\"")
+SHARED_STRINGS_ENTRY = re.compile(rb"<(?:\w+:)?si\b[^>]*?(?:/>|>.*?</(?:\w+:)?si>)", re.DOTALL)
+GAS_KEYWORDS = {"KSCM/Day B/U", "ShakerGas B/U", "No Gas to Report", "Flame B/U"}
+
+# Columns of the table of operations built by build_operation_table.
+OPERATION_TABLE_COLUMNS = [
+    "day", "type", "from", "to", "duration",
+    "depth", "mud_weight", "pump_rate", "dynamic_bp", "static_bp_start", "static_bp_end", "ecd", "esd", "gas",
+    "gas_unit"
+]
+
+# Units of the columns of the table of operations that are always reported in the same unit.
+OPERATION_TABLE_UNITS = {
+    "depth": "m",
+    "mud_weight": "kg/m³",
+    "pump_rate": "m³/min",
+    "dynamic_bp": "kPa",
+    "ecd": "kg/m³",
+    "esd": "kg/m³"
+}
+
+# Line restriction threshold used when none is given, meaning Line Restriction is always reported.
+LINE_RESTRICTION_MAXIMUM = 999999999
+
+# File extensions of the Excel files looked for in batch mode.
+WORKBOOK_EXTENSIONS = [".xlsb", ".xls", ".xlsx", ".xlsm"]
+
+# Format of the names of the sheets with a DOR (example: "2024 Dec-18").
+SHEET_DATE_FORMAT = "%Y %b-%d"
+
+# Number of days above which the interactive mode lists only the first and last days, and asks for a date instead.
+SHEET_LIST_MAXIMUM = 31
+SHEET_LIST_EDGE = 5
+
+# Exit codes of the command-line mode.
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+EXIT_USAGE = 2
+
+# Maximum number of operation descriptions whose extracted values are kept, so descriptions that repeat are only parsed once.
+DESCRIPTION_CACHE_SIZE = 4096
+
+# Number of worker processes used to parse sheets, and the number of sheets below which parsing stays in this process.
+WORKERS = os.cpu_count() or 1
+PARALLEL_MINIMUM_SHEETS = 4
+
+# Levels a report can be made at besides days, and the fraction of a day at which the second 12-hour tour starts.
+REPORT_LEVELS = ["tour", "week", "well"]
+TOUR_START = 0.5
+
+# Number of days read, parsed and summarized together when creating a report. Their operations are dropped once summarized, so memory use does not grow with the length of the range.
+STREAM_CHUNK_DAYS = 64
+REPORT_HEADERS = [
+    "Drilling Interval (mMD)",
+    "Mud Weight (kg/m³)",
+    "Pump Rate (m³/min)",
+    "Dynamic BP (kPa)",
+    "Static BP (kPa)",
+    "Avg ECD/ESD (kg/m³)",
+    "Comments"
+]
+REPORT_COLUMN_WIDTHS = [2.72, 2.22, 2, 2.25, 2.25, 2.5, 5.11] # In centimetres.
+REPORT_MARGIN = 1.27 # In centimetres.
+DOCUMENT_PAGE_WIDTH = 12240 # The page width of the template, in twentieths of a point.
+DOCUMENT_PART = "word/document.xml"
+
+# Columns of the exported daily rows and operations, with the units of the values.
+ROW_EXPORT_COLUMNS = ["Date", *REPORT_HEADERS]
+OPERATION_EXPORT_COLUMNS = [
+    "Date",
+    "Type",
+    "From",
+    "To",
+    "Duration (h)",
+    "Depth (mMD)",
+    "Mud Weight (kg/m³)",
+    "Pump Rate (m³/min)",
+    "Dynamic BP (kPa)",
+    "Static BP Start (kPa)",
+    "Static BP End (kPa)",
+    "ECD (kg/m³)",
+    "ESD (kg/m³)",
+    "Gas",
+    "Gas Unit"
+]
+EXPORT_FORMATS = [".csv", ".jsonl", ".parquet"]
+
+# Values with duration-weighted statistics, with their names and units, the percentiles calculated for them, and their exported columns.
+WEIGHTED_VALUES = {
+    "ecd": ("ECD", "kg/m³"),
+    "esd": ("ESD", "kg/m³"),
+    "mud_weight": ("Mud Weight", "kg/m³"),
+    "pump_rate": ("Pump Rate", "m³/min"),
+    "dynamic_bp": ("Dynamic BP", "kPa")
+}
+PERCENTILES = [10, 50, 90]
+WEIGHTED_EXPORT_COLUMNS = [
+    column
+    for name, unit in WEIGHTED_VALUES.values()
+    for column in [f"Weighted {name} ({unit})", *[f"{name} P{percentile} ({unit})" for percentile in PERCENTILES]]
+]
+
+# Address the report service listens on, and the maximum memory (in bytes) its cache of open workbooks may use.
+SERVICE_HOST = "127.0.0.1"
+SERVICE_CACHE_SIZE_LIMIT = 512 * 1024 * 1024
+
+# Seconds between checks of a watched directory, and seconds a changed Excel file must stay unchanged before its report is generated.
+WATCH_INTERVAL = 5
+WATCH_DEBOUNCE = 10
+
+# Output formats of the report service, with their content types.
+SERVICE_FORMATS = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "json": "application/json",
+    "csv": "text/csv; charset=utf-8"
+}
+
+
 # CLASSES
 
 class Colors:
@@ -47,11 +258,14 @@ class Value:
     """
     This class represents a numerical value.
     Values exist for easy access to the value and its unit.
+    Units are interned, so the many values sharing a unit share one string and their units compare quickly.
     """
 
+    __slots__ = ("value", "unit")
+
     def __init__(self, value: int | float, unit: str):
         self.value = value
-        self.unit = unit
+        self.unit = sys.intern(unit)
 
     def __str__(self):
         return f"{self.value}{self.unit}"
@@ -195,13 +409,67 @@ class Range:
     def __str__(self):
         return f"{str(self.start)} to {str(self.end)}"
 
+class ValueArray:
+    """
+    This class represents many numerical values with the same unit, stored in a contiguous array.
+    Values that are not reported are stored as NaN.
+    """
+
+    __slots__ = ("values", "unit")
+
+    def __init__(self, values, unit: str):
+        self.values = np.asarray(values, dtype=np.float64)
+        self.unit = sys.intern(unit)
+
+    def from_values(values: list, unit: str) -> ValueArray:
+        """
+        Create an array from a list of values.
+
+        Parameters:
+            values (list): The values, or None for values that are not reported.
+            unit (str): The unit of the values.
+
+        Returns:
+            ValueArray: The array of values.
+
+        Raises:
+            ValueError: If a value has a different unit.
+        """
+
+        unit = sys.intern(unit)
+        numbers = []
+        for value in values:
+            if value == None:
+                numbers.append(math.nan)
+                continue
+            if value.unit is not unit and value.unit != unit:
+                raise ValueError(f"Cannot create an array of values in {unit} with a value in {value.unit}.")
+            numbers.append(value.value)
+        return ValueArray(numbers, unit)
+
+    def __len__(self):
+        return len(self.values)
+
 class Operation:
     """
     This class represents an operation in the process.
+    The values reported in the description are extracted once, when the operation is created, and shared with other operations with the same description.
     """
 
+    __slots__ = ("data", "depth", "mud_weight", "ecd", "esd", "pump_rate", "dynamic_bp", "static_bp", "gas")
+
     def __init__(self, data: list):
         self.data = data
+        (
+            self.depth,
+            self.mud_weight,
+            self.ecd,
+            self.esd,
+            self.pump_rate,
+            self.dynamic_bp,
+            self.static_bp,
+            self.gas
+        ) = parse_description(self.get_operation(), type(self).__name__)
 
     def __str__(self) -> str:
         return str(self.data)
@@ -222,363 +490,3589 @@ class Operation:
         return self.data[4]
     
     def get_mud_weight(self) -> Value | None:
-        operation = self.get_operation()
-        try:
-            data = operation.split("@")[1].split(". ")
-            for entry in data:
-                if "MW" in entry:
-                    return Value(float(entry.replace("kg/m³ MW", "").strip()), "kg/m³")
-            return None
-        except:
-            return None
+        return self.mud_weight
         
 class Drilling(Operation):
     """
     This class represents a drilling operation in the process.
     """
 
+    __slots__ = ()
+
     def __str__(self) -> str:
         return str(f"[{convert_time(self.get_from())} - {convert_time(self.get_to())}] Drilling to {self.get_depth()} at {self.get_pump_rate()}. {self.get_mud_weight()} MW. {self.get_ecd()} ECD.")
 
     def get_depth(self) -> Value | None:
-        try:
-            operation = self.get_operation()
-            return Value(float(operation.split("@")[0].replace("Drilling (to ", "").replace("m)", "")), "m")
-        except:
-            Logger.warn("No depth reported for this operation.")
-            return None
+        return self.depth
     
     def get_ecd(self) -> Value | None:
-        operation = self.get_operation()
-        try:
-            data = operation.split("@")[1].split(". ")
-            for entry in data:
-                if "ECD" in entry:
-                    return Value(float(entry.replace("kg/m³ ECD", "").strip()), "kg/m³")
-            return None
-        except:
-            return None
+        return self.ecd
         
     def get_dynamic_bp(self) -> Value | None:
-        operation = self.get_operation()
-        try:
-            data = operation.split("@")[1].split(". ")
-            for entry in data:
-                if "kPa Line Restriction" in entry:
-                    return Value(float(entry.replace("kPa Line Restriction", "").strip()), "kPa")
-                elif "kPa BP" in entry:
-                    return Value(float(entry.replace("kPa BP", "").strip()), "kPa")
-                elif "kPa" in entry:
-                    return Value(float(entry.replace("kPA", "").strip()), "kPa")
-            return None
-        except:
-            return None
+        return self.dynamic_bp
         
     def get_pump_rate(self) -> Value | None:
-        operation = self.get_operation()
-        try:
-            data = operation.split("@")[1].split(". ")
-            for entry in data:
-                if "m³/min" in entry:
-                    return Value(float(entry.replace("m³/min", "").strip()), "m³/min")
-            return None
-        except:
-            return None
+        return self.pump_rate
 
 class Connection(Operation):
     """
     This class represents a connection operation in the process.
     """
 
+    __slots__ = ()
+
     def __str__(self) -> str:
         return str(f"[{convert_time(self.get_from())} - {convert_time(self.get_to())}] Connection at {self.get_depth()}. {self.get_mud_weight()} MW. {self.get_esd()} ESD. {self.get_static_bp()} BP. {self.get_gas()} B/U.")
 
     def get_depth(self) -> Value | None:
-        try:
-            operation = self.get_operation()
-            return Value(float(operation.split("@")[1].split(". ")[0].replace("m", "").strip()), "m")
-        except:
-            Logger.warn("No depth reported for this operation.")
-            return None
+        return self.depth
     
     def get_esd(self) -> Value | None:
-        try:
-            operation = self.get_operation()
-            data = operation.split("@")[1].split(". ")
-            for entry in data:
-                if "ESD" in entry:
-                    return Value(float(entry.replace("kg/m³ ESD", "").strip()), "kg/m³")
-            return None
-        except:
-            return None
+        return self.esd
         
     def get_gas(self) -> Value | None:
-        try:
-            operation = self.get_operation()
-            data = operation.split("@")[1].split(". ")
-            for entry in data:
-                if "KSCM/Day B/U" in entry:
-                    return Value(float(entry.replace("KSCM/Day B/U", "").strip()), "KSCM/Day B/U")
-                elif "ShakerGas B/U" in entry:
-                    return Value(float(entry.replace("ShakerGas B/U", "").strip()), "ShakerGas B/U")
-                elif "No Gas to Report" in entry:
-                    return Value(0, "KSCM/Day")
-                elif "Flame B/U" in entry:
-                    return Value(0, "Flame B/U")
-            return None
-        except Exception as e:
-            return None
+        return self.gas
         
     def get_static_bp(self) -> Value | Range | None:
-        try:
-            operation = self.get_operation()
-            data = operation.split("@")[1].split(". ")
-            for entry in data:
-                if "BP" in entry:
-                    if any(i.lower() in entry.lower() for i in ["No BP", "Closed Choke", "Open Choke"]):
-                        return Value(0, "kPa")
-                    elif " to " in entry:
-                        values = entry.replace("kPa BP", "").split(" to ")
-                        start = Value(float(values[0]), "kPA")
-                        end = Value(float(values[1]), "kPA")
-                        return Range(start, end)
-            return None
-        except:
-            return None
+        return self.static_bp
         
-class Logger:
+class SheetIndex:
     """
-    This class represents the logger for the program.
-    This is a simply utility class to handle output.
-    It is not meant to be used all the time, but makes it easier to output certain messages.
+    This class represents the sheets with dates of a workbook, sorted by their date.
+    The date of each sheet is parsed once, and dates and date ranges are found by binary search.
+    It can be used like the list of sheet names in calendar order, even if the sheets are out of order in the workbook.
     """
 
-    def error(text: str) -> None:
+    def __init__(self, names: list):
+        entries = []
+        for position, name in enumerate(names):
+            try:
+                entries.append((datetime.strptime(name, SHEET_DATE_FORMAT).date(), position, name))
+            except ValueError:
+                continue
+        entries.sort()
+        self.dates = [date for date, _, _ in entries]
+        self.sheets = [name for _, _, name in entries]
+        self.positions = {name: index for index, name in enumerate(self.sheets)}
+
+    def __len__(self) -> int:
+        return len(self.sheets)
+
+    def __iter__(self):
+        return iter(self.sheets)
+
+    def __getitem__(self, index):
+        return self.sheets[index]
+
+    def __contains__(self, sheet: str) -> bool:
+        return sheet in self.positions
+
+    def __repr__(self) -> str:
+        return f"SheetIndex({self.sheets!r})"
+
+    def index(self, sheet: str) -> int:
         """
-        Print an error message based on the error code.
+        Get the position of a sheet in calendar order.
 
         Parameters:
-            code (int): The error code to print the message for.
+            sheet (str): The name of the sheet.
 
         Returns:
-            None
+            int: The position of the sheet.
+
+        Raises:
+            ValueError: If the sheet is not in the index.
         """
 
-        fprint(f"{Colors.RED}Error: {text}")
+        if sheet not in self.positions:
+            raise ValueError(f"{sheet!r} is not a sheet with a date.")
+        return self.positions[sheet]
 
-    def warn(text: str) -> None:
+    def parse(text: str):
         """
-        Print a warning message.
+        Parse a date given either as a sheet name (example: "2024 Dec-18") or in the format "YYYY-MM-DD".
 
         Parameters:
-            text (str): The warning message to print.
+            text (str): The date to parse.
 
         Returns:
-            None
+            date | None: The date, or None if the text is not a date.
         """
 
-        fprint(f"{Colors.YELLOW}Warning: {text}")
-
+        for date_format in [SHEET_DATE_FORMAT, "%Y-%m-%d"]:
+            try:
+                return datetime.strptime(text.strip(), date_format).date()
+            except ValueError:
+                continue
+        return None
 
-# UTILITY FUNCTIONS
+    def find(self, text: str) -> str | None:
+        """
+        Find the sheet for a date, given either as a sheet name or in the format "YYYY-MM-DD".
 
-def fprint(*args, end: str = "\n") -> None:
-    """
-    Print function with built-in color reset for convenience.
-    This is to be used instead of the built-in print function because of its automatic color reset.
+        Parameters:
+            text (str): The date to find.
 
-    Parameters:
-        *args (any): Any number of arguments to print, can be any type.
+        Returns:
+            str | None: The name of the sheet, or None if there is no sheet for the date.
+        """
 
-    Returns:
-        None
-    """
+        if text in self.positions:
+            return text
+        date = SheetIndex.parse(text)
+        if date == None:
+            return None
+        index = bisect_left(self.dates, date)
+        if index < len(self.dates) and self.dates[index] == date:
+            return self.sheets[index]
+        return None
 
-    # Altered print statement to include color reset.
-    print(str(*args) + Colors.RESET, end=end)
+    def range(self, text: str) -> tuple:
+        """
+        Find the first and last sheet within a date range (example: "2024-12-01..2024-12-31").
+        Either date can be left out to start at the first day or end at the last day, and the dates do not need a sheet of their own.
 
-def clear() -> None:
-    """
-    Clears the terminal screen using an ANSI escape code.
+        Parameters:
+            text (str): The date range, as two dates separated by "..".
 
-    Parameters:
-        None
-    
-    Returns:
-        None
-    """
+        Returns:
+            tuple: The names of the first and last sheet within the range.
 
-    # ANSI escape code to clear the screen.
-    print("\033[H\033[J", end='')
+        Raises:
+            ValueError: If the range is invalid, or there is no sheet within it.
+        """
 
-def pause(newlines: int = 1) -> None:
-    """
-    Pause the program until the user presses Enter.
+        if ".." not in text:
+            raise ValueError(f"Invalid date range '{text}'. Please give it as two dates separated by '..', for example 2024-12-01..2024-12-31.")
+        start_text, end_text = text.split("..", 1)
+        start = SheetIndex.parse(start_text) if start_text.strip() != "" else None
+        end = SheetIndex.parse(end_text) if end_text.strip() != "" else None
+        if (start == None and start_text.strip() != "") or (end == None and end_text.strip() != ""):
+            raise ValueError(f"Invalid date range '{text}'. Dates must be sheet names (2024 Dec-18) or in the format YYYY-MM-DD.")
 
-    Parameters:
-        newlines (int): The number of newlines to print before the prompt. Default is 1.
+        first = bisect_left(self.dates, start) if start != None else 0
+        last = bisect_right(self.dates, end) - 1 if end != None else len(self.dates) - 1
+        if first > last:
+            raise ValueError(f"No DORs found between {start_text.strip() or 'the first day'} and {end_text.strip() or 'the last day'}.")
+        return self.sheets[first], self.sheets[last]
 
-    Returns:
-        None
+class SheetCache:
+    """
+    This class represents the on-disk cache of parsed sheets.
+    Entries are keyed by the hash of the workbook contents and the sheet name, so a changed workbook never returns stale data.
+    Once the cache grows past its size limit, the least recently used entries are evicted.
     """
 
-    # Print newlines and prompt the user to press the enter key.
-    fprint(("\n" * newlines) + Colors.BOLD + "Press ENTER to continue.", end="")
-    input()
+    def __init__(self, directory: str = CACHE_DIRECTORY, size_limit: int = CACHE_SIZE_LIMIT):
+        self.directory = directory
+        self.size_limit = size_limit
+        self.hashes = {}
 
-def convert_time(time_object: str | float) -> str | float:
-    """
-    Converts time from float to string or vice versa.
-    Time can be represented as a float between 0 to 1 or a string in the format "HH:MM".
+    def identify(self, filename: str) -> str:
+        """
+        Get the key of a workbook in the cache, which is the hash of its contents.
+        The hash is remembered while the file is unchanged, so a report loading its days a chunk at a time only reads the file once.
 
-    Parameters:
-        time_object (str | float): The time in either format.
+        Parameters:
+            filename (str): The path of the Excel file.
 
-    Returns:
-        str | float: The time in the other format.
-    """
+        Returns:
+            str: The hash of the workbook contents.
 
-    if type(time_object) == str:
-        hour = int(time_object.split(":")[0])
-        minute = int(time_object.split(":")[1])
-        return float((hour * 60 + minute) / 1440)
-    elif type(time_object) == float:
-        hour = int(time_object * 1440 / 60)
-        minute = int(time_object * 1440 % 60)
-        return f"{hour}:{minute:02d}"
-    else:
-        return None
-    
-def validate_time(timestring: str) -> bool:
-    """
-    Validate a time string in the format "HH:MM" in 24 hour time.
-    This function will check if the time string is valid and return a boolean.
+        Raises:
+            OSError: If the file cannot be read.
+        """
 
-    Parameters:
-        timestring (str): The time string to validate.
+        status = os.stat(filename)
+        key = (os.path.abspath(filename), status.st_mtime_ns, status.st_size)
+        if key not in self.hashes:
+            self.hashes[key] = hash_file(filename)
+        return self.hashes[key]
 
-    Returns:
-        bool: True if the time string is valid, False otherwise.
-    """
+    def path(self, file_hash: str, sheet: str) -> str:
+        key = hashlib.sha256(f"{CACHE_VERSION}:{file_hash}:{sheet}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key}.pkl")
 
-    try:
-        hour = int(timestring.split(":")[0])
-        minute = int(timestring.split(":")[1])
-        if hour < 0 or hour > 23:
-            return False
-        if minute < 0 or minute > 59:
-            return False
-        return True
-    except:
-        return False
+    def get(self, file_hash: str, sheet: str) -> list | None:
+        """
+        Get the operations of a sheet from the cache.
 
+        Parameters:
+            file_hash (str): The hash of the workbook contents.
+            sheet (str): The name of the sheet.
 
-def parse_sheet(data: pd.DataFrame) -> list:
-    """
-    Parse the data from a sheet in the Excel file.
-    This function will parse the data from the sheet and return a list of operations.
+        Returns:
+            list | None: The list of operations, or None if the sheet is not cached.
+        """
 
-    Parameters:
-        data (pd.DataFrame): The data from the sheet to parse.
+        path = self.path(file_hash, sheet)
+        try:
+            with open(path, "rb") as file:
+                entries = pickle.load(file)
+            # Mark the entry as recently used for eviction.
+            os.utime(path)
+        except Exception:
+            return None
 
-    Returns:
-        list: A list of operations parsed from the data.
-    """
+        types = {Drilling.__name__: Drilling, Connection.__name__: Connection}
+        return [types[kind](data) for kind, data in entries]
 
-    # Convert the data to a list of lists.
-    data_list = data.values.tolist()
+    def put(self, file_hash: str, sheet: str, operations: list) -> None:
+        """
+        Store the operations of a sheet in the cache.
+        The cache is best effort, so failing to write an entry is not an error.
 
-    # Initialize a new list to store the parsed data.
-    new = []
+        Parameters:
+            file_hash (str): The hash of the workbook contents.
+            sheet (str): The name of the sheet.
+            operations (list): The list of operations parsed from the sheet.
 
-    # Iterate over the data and parse the operations.
-    for index, row in enumerate(data_list):
-        if index < 21:
-            continue
-        sub = [j for j in row if type(j) != float]
-        new.append(sub)
+        Returns:
+            None
+        """
 
-    # Validate the parsed data.
-    operations = []
-    for index, row in enumerate(new):
-        if len(row) <= 1:
-            break
+        path = self.path(file_hash, sheet)
+        entries = [(type(operation).__name__, operation.data) for operation in operations]
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write to a temporary file first so a partially written entry is never read.
+            with open(path + ".tmp", "wb") as file:
+                pickle.dump(entries, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(path + ".tmp", path)
+        except OSError:
+            pass
 
-        if len(row) < 5:
-            continue
-        
-        # Ensure time is in 0-1 float format.
-        # Checking for HH:MM(:SS) format and converting to float.
-        start = str(row[0])
-        end = str(row[1])
-        if len(start) == 8:
-            start = start[0:5]
-        if len(end) == 8:
-            end = end[0:5]
-        if validate_time(start):
-            row[0] = str(convert_time(start))
-            if row[0] == "0.0":
-                row[0] = "0"
-            if row[0] == "1.0":
-                row[0] = "1"
-        if validate_time(end):
-            row[1] = str(convert_time(end))
-            if row[0] == "0.0":
-                row[0] = "0"
-            if row[0] == "1.0":
-                row[0] = "1"
+    def evict(self) -> None:
+        """
+        Remove the least recently used entries until the cache fits in its size limit.
 
-        # Checking for end time being "1900-01-01 00:00:00" (strange occurrence).
-        if row[1] == "1900-01-01 00:00:00":
-            row[1] = "1"
+        Parameters:
+            None
 
-        if index == 0 and row[0] != "0":
-            Logger.error("Operation summary is malformed, please check the Excel file and try again.")
-            Logger.error("This is most likely because the first operation does not start at 0:00.")
-            return
+        Returns:
+            None
+        """
 
         try:
-            connection = int(row[3])
-            if connection > 0:
-                operations.append(Connection(row))
+            entries = []
+            for name in os.listdir(self.directory):
+                if name.endswith(".pkl"):
+                    path = os.path.join(self.directory, name)
+                    status = os.stat(path)
+                    entries.append((status.st_mtime, status.st_size, path))
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.size_limit:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
                 continue
-        except ValueError:
+
+class WorkbookCache:
+    """
+    This class represents the in-memory cache of the report service, keeping recently used workbooks open along with their parsed sheets.
+    Entries are keyed by the path of the workbook and the time and size it was last modified with, so a changed workbook is opened and parsed again.
+    Once the estimated memory use grows past the size limit, the least recently used workbooks are closed and evicted.
+    It can be used in place of SheetCache to load the days of a workbook.
+    """
+
+    def __init__(self, size_limit: int = SERVICE_CACHE_SIZE_LIMIT):
+        self.size_limit = size_limit
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def identify(self, filename: str) -> str:
+        """
+        Get the key of a workbook in the cache, from its path and the time and size it was last modified with.
+        Unlike SheetCache, the contents are not hashed, so this is cheap enough to do on every request.
+
+        Parameters:
+            filename (str): The path of the Excel file.
+
+        Returns:
+            str: The key of the workbook.
+
+        Raises:
+            OSError: If the file does not exist.
+        """
+
+        status = os.stat(filename)
+        return f"{os.path.abspath(filename)}:{status.st_mtime_ns}:{status.st_size}"
+
+    def open(self, filename: str) -> tuple:
+        """
+        Get an open workbook and its sheets with dates, opening it if it is not cached or has changed.
+
+        Parameters:
+            filename (str): The path of the Excel file.
+
+        Returns:
+            tuple: The pd.ExcelFile and the index of its sheets with dates, as returned by get_date_sheets.
+
+        Raises:
+            OSError: If the file does not exist.
+        """
+
+        key = self.identify(filename)
+        entry = self.entries.get(key)
+        if entry != None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry["data"], entry["sheets"]
+        self.misses += 1
+
+        # Drop the entries of older versions of the workbook.
+        path = os.path.abspath(filename)
+        for stale in [stale for stale in self.entries if stale.rsplit(":", 2)[0] == path]:
+            self.remove(stale)
+
+        data = pd.ExcelFile(path)
+        sheets = get_date_sheets(data)
+        self.entries[key] = {"data": data, "sheets": sheets, "days": {}, "statistics": None, "size": os.path.getsize(path)}
+        self.evict()
+        return data, sheets
+
+    def get(self, file_hash: str, sheet: str) -> list | None:
+        """
+        Get the operations of a sheet from the cache.
+
+        Parameters:
+            file_hash (str): The key of the workbook, as returned by identify.
+            sheet (str): The name of the sheet.
+
+        Returns:
+            list | None: The list of operations, or None if the sheet is not cached.
+        """
+
+        entry = self.entries.get(file_hash)
+        if entry == None or sheet not in entry["days"]:
+            return None
+        # The report filters the list it is given, so the cached list is copied.
+        return list(entry["days"][sheet])
+
+    def put(self, file_hash: str, sheet: str, operations: list) -> None:
+        """
+        Store the operations of a sheet in the cache, if its workbook is open in the cache.
+        The memory used by the operations is estimated from the size of their data when pickled.
+
+        Parameters:
+            file_hash (str): The key of the workbook, as returned by identify.
+            sheet (str): The name of the sheet.
+            operations (list): The list of operations parsed from the sheet.
+
+        Returns:
+            None
+        """
+
+        entry = self.entries.get(file_hash)
+        if entry == None or sheet in entry["days"]:
+            return
+        entry["days"][sheet] = operations
+        entry["size"] += len(pickle.dumps([operation.data for operation in operations], protocol=pickle.HIGHEST_PROTOCOL))
+
+    def statistics(self, filename: str, workers: int = WORKERS) -> RangeStatistics:
+        """
+        Get the statistics of every day of a workbook, calculating them the first time they are needed.
+        They are calculated with a store of day summaries, so only the days that changed since they were last stored are parsed.
+
+        Parameters:
+            filename (str): The path of the Excel file.
+            workers (int): The maximum number of worker processes used to parse sheets. Default is the number of CPUs.
+
+        Returns:
+            RangeStatistics: The statistics of the days, in the order of the sheets with dates.
+
+        Raises:
+            OSError: If the file does not exist.
+            ValueError: If the workbook has no DORs, a sheet is malformed or no depth is reported.
+        """
+
+        data, sheets = self.open(filename)
+        entry = self.entries[self.identify(filename)]
+        if entry["statistics"] == None:
+            if len(sheets) == 0:
+                raise ValueError("No DORs found. Please check the Excel file and try again.")
+            try:
+                report = create_report(data, sheets, sheets[0], "00:00", sheets[-1], "23:59", workers=workers, cache=self, store=DayStore(data))
+            finally:
+                Diagnostics.collect()
+            entry["statistics"] = RangeStatistics(report.statistics)
+        return entry["statistics"]
+
+    def size(self) -> int:
+        return sum(entry["size"] for entry in self.entries.values())
+
+    def remove(self, key: str) -> None:
+        entry = self.entries.pop(key)
+        try:
+            entry["data"].close()
+        except Exception:
+            pass
+
+    def evict(self) -> None:
+        """
+        Close and remove the least recently used workbooks until the cache fits in its size limit.
+        The most recently used workbook is always kept, even if it is larger than the limit on its own.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+
+        while len(self.entries) > 1 and self.size() > self.size_limit:
+            self.remove(next(iter(self.entries)))
+
+    def status(self) -> dict:
+        """
+        Get the state of the cache, for the status page of the report service.
+
+        Parameters:
+            None
+
+        Returns:
+            dict: The cached workbooks with their number of parsed sheets, the estimated memory use and the hit and miss counts.
+        """
+
+        return {
+            "workbooks": [{"workbook": key.rsplit(":", 2)[0], "sheets": len(entry["days"])} for key, entry in self.entries.items()],
+            "size": self.size(),
+            "size_limit": self.size_limit,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+class WorkbookWatcher:
+    """
+    This class watches a directory for Excel files that were added or changed, by polling the time and size they were last modified with.
+    A file is only reported once it has stopped changing for the debounce time, so a workbook being saved or copied is not read half written.
+    """
+
+    def __init__(self, directory: str, debounce: float = WATCH_DEBOUNCE):
+        self.directory = directory
+        self.debounce = debounce
+        self.pending = {}
+        self.done = {}
+
+    def stamp(self, filename: str) -> tuple | None:
+        try:
+            status = os.stat(filename)
+        except OSError:
+            return None
+        return status.st_mtime_ns, status.st_size
+
+    def skip(self, filename: str) -> None:
+        """
+        Mark an Excel file as up to date, so it is only reported once it changes.
+
+        Parameters:
+            filename (str): The path of the Excel file.
+
+        Returns:
+            None
+        """
+
+        stamp = self.stamp(filename)
+        if stamp != None:
+            self.done[filename] = stamp
+
+    def poll(self, now: float) -> list:
+        """
+        Check the directory for changes.
+
+        Parameters:
+            now (float): The current time, in seconds.
+
+        Returns:
+            list: The paths of the Excel files that changed and have since been unchanged for the debounce time, sorted by name.
+
+        Raises:
+            OSError: If the directory cannot be read.
+        """
+
+        workbooks = find_workbooks(self.directory)
+
+        # Forget the files that were removed.
+        for filename in [i for i in self.done if i not in workbooks]:
+            del self.done[filename]
+        for filename in [i for i in self.pending if i not in workbooks]:
+            del self.pending[filename]
+
+        ready = []
+        for filename in workbooks:
+            stamp = self.stamp(filename)
+            if stamp == None or stamp == self.done.get(filename):
+                self.pending.pop(filename, None)
+                continue
+            # The time is reset every time the file changes again.
+            if filename not in self.pending or self.pending[filename][0] != stamp:
+                self.pending[filename] = (stamp, now)
+            elif now - self.pending[filename][1] >= self.debounce:
+                del self.pending[filename]
+                self.done[filename] = stamp
+                ready.append(filename)
+        return ready
+
+class OperationIndex:
+    """
+    This class represents an interval index over the operations of consecutive days.
+    Operations are placed on a continuous time axis, where the first day spans 0 to 1, the second 1 to 2, and so on.
+    They are sorted by start time, so the operations in any time window are found with a binary search, across day boundaries.
+    Operations without valid times are treated as spanning their whole day.
+    """
+
+    def __init__(self, days: list):
+        entries = []
+        for day, operations in enumerate(days):
+            if operations == None:
+                continue
+            for position, operation in enumerate(operations):
+                start = to_number(operation.data[0])
+                end = to_number(operation.data[1])
+                if math.isnan(start) or math.isnan(end):
+                    start, end = 0, 1
+                entries.append((day + start, day + end, day, position, operation))
+        entries.sort(key=lambda entry: (entry[0], entry[2], entry[3]))
+
+        self.entries = entries
+        self.starts = [entry[0] for entry in entries]
+        # The latest end time of the operations up to each entry, so overlapping operations can be found by binary search too.
+        self.reaches = []
+        reach = -math.inf
+        for entry in entries:
+            reach = max(reach, entry[1])
+            self.reaches.append(reach)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def within(self, start: float, end: float) -> list:
+        """
+        Get the operations that start and end within a time window.
+
+        Parameters:
+            start (float): The start of the window, in days from the start of the first day.
+            end (float): The end of the window, in days from the start of the first day.
+
+        Returns:
+            list: The operations within the window, sorted by start time.
+        """
+
+        lower = bisect_left(self.starts, start)
+        upper = bisect_right(self.starts, end)
+        return [entry[4] for entry in self.entries[lower:upper] if entry[1] <= end]
+
+    def overlapping(self, start: float, end: float) -> list:
+        """
+        Get the operations that overlap a time window, including the ones only partly in it.
+
+        Parameters:
+            start (float): The start of the window, in days from the start of the first day.
+            end (float): The end of the window, in days from the start of the first day.
+
+        Returns:
+            list: The operations overlapping the window, sorted by start time.
+        """
+
+        lower = bisect_right(self.reaches, start)
+        upper = bisect_left(self.starts, end)
+        return [entry[4] for entry in self.entries[lower:upper] if entry[1] > start]
+
+class RangeStatistics:
+    """
+    This class represents the statistics of consecutive days, for answering questions about any range of them in constant time.
+    The minimums and maximums are kept in sparse tables, and the sums and counts as prefix sums, so no range query looks at the days one by one.
+    """
+
+    def __init__(self, days: list):
+        values = np.array([[math.nan if i == None else i for i in day] for day in days], dtype=np.float64).reshape(len(days), len(DAY_STATISTICS))
+        self.count = len(days)
+        self.tables = {}
+        self.sums = {}
+
+        for column, name in enumerate(DAY_STATISTICS):
+            if name.endswith("_minimum") or name.endswith("_maximum"):
+                # Each level of the sparse table holds the result for the 2 ** level days starting at each day, ignoring NaN.
+                combine = np.fmin if name.endswith("_minimum") else np.fmax
+                levels = [values[:, column]]
+                while 2 ** len(levels) <= self.count:
+                    half = 2 ** (len(levels) - 1)
+                    levels.append(combine(levels[-1][:-half], levels[-1][half:]))
+                self.tables[name] = levels
+            else:
+                self.sums[name] = np.concatenate([[0.0], np.cumsum(np.nan_to_num(values[:, column]))])
+
+    def __len__(self) -> int:
+        return self.count
+
+    def extreme(self, name: str, first: int, last: int) -> float | None:
+        """
+        Get a minimum or maximum statistic over a range of days, from two overlapping entries of its sparse table.
+
+        Parameters:
+            name (str): The name of the statistic, one of the minimums or maximums in DAY_STATISTICS.
+            first (int): The position of the first day of the range.
+            last (int): The position of the last day of the range.
+
+        Returns:
+            float | None: The minimum or maximum, or None if it is not reported in the range.
+        """
+
+        level = (last - first + 1).bit_length() - 1
+        levels = self.tables[name]
+        combine = np.fmin if name.endswith("_minimum") else np.fmax
+        value = combine(levels[level][first], levels[level][last - 2 ** level + 1])
+        return None if math.isnan(value) else float(value)
+
+    def total(self, name: str, first: int, last: int) -> float:
+        """
+        Get a sum or count statistic over a range of days, from its prefix sums.
+
+        Parameters:
+            name (str): The name of the statistic, one of the sums or counts in DAY_STATISTICS.
+            first (int): The position of the first day of the range.
+            last (int): The position of the last day of the range.
+
+        Returns:
+            float: The sum or count.
+        """
+
+        return float(self.sums[name][last + 1] - self.sums[name][first])
+
+    def query(self, first: int, last: int) -> dict:
+        """
+        Get the minimum, maximum and mean of every reported value over a range of days.
+
+        Parameters:
+            first (int): The position of the first day of the range.
+            last (int): The position of the last day of the range.
+
+        Returns:
+            dict: The statistics of each value in STATISTIC_VALUES, with its unit. Statistics that are not reported are None, and values without a mean have none.
+
+        Raises:
+            IndexError: If the range is empty or out of bounds.
+        """
+
+        if first < 0 or last >= self.count or first > last:
+            raise IndexError(f"Invalid range of days {first} to {last}.")
+
+        results = {}
+        for name, (_, unit) in STATISTIC_VALUES.items():
+            result = {"unit": unit}
+            for statistic in ["minimum", "maximum"]:
+                if f"{name}_{statistic}" in self.tables:
+                    result[statistic] = self.extreme(f"{name}_{statistic}", first, last)
+            if f"{name}_sum" in self.sums:
+                count = self.total(f"{name}_count", first, last)
+                result["mean"] = self.total(f"{name}_sum", first, last) / count if count > 0 else None
+            results[name] = result
+        return results
+
+class DayStore:
+    """
+    This class represents the on-disk store of day summaries for a workbook, used to update reports incrementally.
+    Each summary is saved with the fingerprint of its sheet, and is only reused while the sheet is unchanged.
+    """
+
+    def __init__(self, data: pd.ExcelFile, directory: str = STORE_DIRECTORY):
+        self.data = data
+        self.path = None
+        self.entries = {}
+        self.parts = None
+        self.strings = None
+        self.prefixes = {}
+
+        # Summaries can only be stored for an Excel file opened from a path.
+        if type(data.io) != str:
+            return
+        key = hashlib.sha256(os.path.abspath(data.io).encode("utf-8")).hexdigest()
+        self.path = os.path.join(directory, f"{key}.json")
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                stored = json.load(file)
+            if stored.get("version") == STORE_VERSION:
+                self.entries = stored["sheets"]
+        except (OSError, ValueError, KeyError):
+            self.entries = {}
+
+    def fingerprint(self, sheet: str, count: int | None = None) -> str | None:
+        """
+        Get the fingerprint of a sheet, without reading it.
+        The fingerprint is made of the CRC and size of the sheet in the Excel archive, and the hash of the first shared strings.
+        Text cells only store the index of their shared string, so the strings a sheet can refer to must be unchanged too.
+
+        Parameters:
+            sheet (str): The name of the sheet.
+            count (int | None): The number of shared strings to include. Default is None, meaning all of them.
+
+        Returns:
+            str | None: The fingerprint, or None if the sheet cannot be fingerprinted.
+        """
+
+        if self.parts == None:
+            self.parts = get_sheet_parts(self.data)
+            self.strings = get_shared_strings(self.data)
+        if sheet not in self.parts or self.strings == None:
+            return None
+
+        count = len(self.strings) if count == None else count
+        if count > len(self.strings):
+            return None
+        if count not in self.prefixes:
+            self.prefixes[count] = hash_strings(self.strings[:count])
+        return f"{self.parts[sheet]}:{count}:{self.prefixes[count]}"
+
+    def get(self, sheet: str, line_restriction_maximum: int) -> list | None:
+        """
+        Get the stored summary of a day, if its sheet is unchanged.
+
+        Parameters:
+            sheet (str): The name of the sheet.
+            line_restriction_maximum (int): The line restriction threshold the summary must have been calculated with.
+
+        Returns:
+            list | None: The summary of the day, or None if there is no summary for the sheet as it is now.
+        """
+
+        entry = self.entries.get(sheet)
+        if entry == None or entry["threshold"] != line_restriction_maximum:
+            return None
+        fingerprint = self.fingerprint(sheet, entry["strings"])
+        if fingerprint == None or fingerprint != entry["fingerprint"]:
+            return None
+        return entry["summary"]
+
+    def get_statistics(self, sheet: str) -> list | None:
+        """
+        Get the stored statistics of a day, after its summary was found with get.
+
+        Parameters:
+            sheet (str): The name of the sheet.
+
+        Returns:
+            list | None: The statistics of the day, in the order of DAY_STATISTICS, or None if the sheet is not stored.
+        """
+
+        entry = self.entries.get(sheet)
+        return entry["statistics"] if entry != None else None
+
+    def put(self, sheet: str, line_restriction_maximum: int, summary: list, statistics: list) -> None:
+        """
+        Store the summary and statistics of a day.
+
+        Parameters:
+            sheet (str): The name of the sheet.
+            line_restriction_maximum (int): The line restriction threshold the summary was calculated with.
+            summary (list): The summary of the day, as returned by summarize_days.
+            statistics (list): The statistics of the day, as returned by get_day_statistics.
+
+        Returns:
+            None
+        """
+
+        fingerprint = self.fingerprint(sheet)
+        if fingerprint == None:
+            return
+        self.entries[sheet] = {
+            "fingerprint": fingerprint,
+            "strings": len(self.strings),
+            "threshold": line_restriction_maximum,
+            "summary": summary,
+            "statistics": statistics
+        }
+
+    def save(self) -> None:
+        """
+        Save the store to disk.
+        The store is best effort, so failing to save it is not an error.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+
+        if self.path == None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path + ".tmp", "w", encoding="utf-8") as file:
+                json.dump({"version": STORE_VERSION, "sheets": self.entries}, file)
+            os.replace(self.path + ".tmp", self.path)
+        except OSError:
             pass
 
-        if row[3] == "C":
-            operations.append(Connection(row))
-        elif row[3] == "D":
-            operations.append(Drilling(row))
+class Report:
+    """
+    This class represents a generated report, before it is rendered to a document.
+    The warnings found while generating it are kept with it, see Diagnostics, along with the statistics of each day, see RangeStatistics.
+    Reports of the same range at other levels (tours, weeks or the whole well) are kept in its levels, with a label for each of their rows.
+    The duration-weighted statistics of each day are kept in weighted when they are calculated, see weigh_days.
+    """
+
+    def __init__(self, sheets: list, rows: list, date_range: str, maximum_depth: Value, diagnostics: list | None = None, statistics: list | None = None, labels: list | None = None):
+        self.sheets = sheets
+        self.rows = rows
+        self.date_range = date_range
+        self.maximum_depth = maximum_depth
+        self.diagnostics = diagnostics if diagnostics != None else []
+        self.statistics = statistics if statistics != None else []
+        self.labels = labels
+        self.levels = {}
+        self.weighted = None
+
+class TableWriter:
+    """
+    This class represents a CSV, JSON Lines or Parquet file that tables are written to one at a time, chosen by the file extension.
+    Only the table being written is held in memory, so tables can be written as they are generated.
+    Parquet files need the pyarrow module, which is only imported when used.
+    """
+
+    def __init__(self, filename: str, columns: list):
+        """
+        Open the file to write to.
+
+        Parameters:
+            filename (str): The path of the file to write.
+            columns (list): The columns of the tables, used when no table is written.
+
+        Raises:
+            ValueError: If the file extension is not supported, or pyarrow is missing for a Parquet file.
+            OSError: If the file cannot be opened.
+        """
+
+        self.filename = filename
+        self.columns = columns
+        self.extension = os.path.splitext(filename)[1].lower()
+        self.file = None
+        self.writer = None
+        self.written = False
+        if self.extension not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format '{self.extension}'. Please use one of {', '.join(EXPORT_FORMATS)}.")
+
+        if self.extension == ".parquet":
+            try:
+                import pyarrow
+                import pyarrow.parquet
+            except ImportError:
+                raise ValueError("Parquet exports need the pyarrow module. Please install it by running: pip install pyarrow")
+            self.pyarrow = pyarrow
+        else:
+            self.file = open(filename, "w", newline="" if self.extension == ".csv" else None, encoding="utf-8")
+
+    def __enter__(self) -> TableWriter:
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.close()
+
+    def write(self, frame: pd.DataFrame) -> None:
+        """
+        Write a table to the end of the file.
+
+        Parameters:
+            frame (pd.DataFrame): The table to write, with the columns of the file.
+
+        Returns:
+            None
+        """
+
+        if self.extension == ".csv":
+            frame.to_csv(self.file, header=not self.written, index=False)
+
+        elif self.extension == ".jsonl":
+            for record in frame.to_dict("records"):
+                record = {key: None if type(value) == float and math.isnan(value) else value for key, value in record.items()}
+                self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        elif self.extension == ".parquet":
+            # The schema is fixed by the first table, so columns without any values in a later table keep their type.
+            if self.writer == None:
+                self.schema = self.pyarrow.schema([
+                    (column, self.pyarrow.float64() if pd.api.types.is_float_dtype(frame[column]) else self.pyarrow.string())
+                    for column in frame.columns
+                ])
+                self.writer = self.pyarrow.parquet.ParquetWriter(self.filename, self.schema)
+            self.writer.write_table(self.pyarrow.Table.from_pandas(frame, schema=self.schema, preserve_index=False))
+        self.written = True
+
+    def close(self) -> None:
+        """
+        Finish writing the file. A file without any tables still has the columns, where the format stores them.
+
+        Returns:
+            None
+        """
+
+        if self.extension == ".csv" and not self.written and self.file != None:
+            pd.DataFrame(columns=self.columns).to_csv(self.file, index=False)
+            self.written = True
+        if self.file != None:
+            self.file.close()
+            self.file = None
+
+        if self.extension == ".parquet":
+            if self.writer != None:
+                self.writer.close()
+                self.writer = None
+            elif not self.written:
+                schema = self.pyarrow.schema([(column, self.pyarrow.string()) for column in self.columns])
+                self.pyarrow.parquet.write_table(self.pyarrow.Table.from_pylist([], schema=schema), self.filename)
+                self.written = True
+
+class Logger:
+    """
+    This class represents the logger for the program.
+    This is a simply utility class to handle output.
+    It is not meant to be used all the time, but makes it easier to output certain messages.
+    """
+
+    def error(text: str) -> None:
+        """
+        Print an error message based on the error code.
+
+        Parameters:
+            code (int): The error code to print the message for.
+
+        Returns:
+            None
+        """
+
+        Profiler.count("errors")
+        fprint(f"{Colors.RED}Error: {text}")
+
+    def warn(text: str) -> None:
+        """
+        Print a warning message.
+
+        Parameters:
+            text (str): The warning message to print.
+
+        Returns:
+            None
+        """
+
+        fprint(f"{Colors.YELLOW}Warning: {text}")
+
+class Profiler:
+    """
+    This class represents the profiler for the program, timing each stage of a report and counting what was processed.
+    Like the logger, it is used through the class itself, and it only times stages once enabled (see --profile).
+    Stages can be nested, so the time of a stage is reported both in total and without the stages inside it.
+    """
+
+    enabled = False
+    timers = {}
+    counters = {}
+    events = []
+    stack = []
+    origin = perf_counter()
+
+    def record(name: str, start: float, duration: float, children: float) -> None:
+        """
+        Record a timed stage.
+
+        Parameters:
+            name (str): The name of the stage.
+            start (float): When the stage started, from perf_counter.
+            duration (float): The time spent in the stage, in seconds.
+            children (float): The time spent in stages inside it, in seconds.
+
+        Returns:
+            None
+        """
+
+        timer = Profiler.timers.setdefault(name, [0, 0.0, 0.0])
+        timer[0] += 1
+        timer[1] += duration
+        timer[2] += duration - children
+        if len(Profiler.stack) > 0:
+            Profiler.stack[-1] += duration
+        Profiler.events.append((name, start - Profiler.origin, duration))
+
+    @contextmanager
+    def stage(name: str):
+        """
+        Time a stage, used as a context manager.
+
+        Parameters:
+            name (str): The name of the stage.
+        """
+
+        if not Profiler.enabled:
+            yield
+            return
+        start = perf_counter()
+        Profiler.stack.append(0.0)
+        try:
+            yield
+        finally:
+            duration = perf_counter() - start
+            Profiler.record(name, start, duration, Profiler.stack.pop())
+
+    def iterate(name: str, iterable):
+        """
+        Time the iteration of an iterable as a stage, without the time spent by the code using the items.
+        This separates reading the rows of a sheet from parsing them, even though they are streamed together.
+        The stage is recorded when the iteration ends or the generator is closed.
+
+        Parameters:
+            name (str): The name of the stage.
+            iterable (iterable): The iterable to time.
+
+        Yields:
+            any: The items of the iterable.
+        """
+
+        if not Profiler.enabled:
+            yield from iterable
+            return
+        iterator = iter(iterable)
+        start = perf_counter()
+        duration = 0.0
+        try:
+            while True:
+                before = perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    duration += perf_counter() - before
+                yield item
+        finally:
+            Profiler.record(name, start, duration, 0.0)
+
+    def count(name: str, amount: int = 1) -> None:
+        """
+        Add to a counter.
+
+        Parameters:
+            name (str): The name of the counter.
+            amount (int): The amount to add. Default is 1.
+
+        Returns:
+            None
+        """
+
+        Profiler.counters[name] = Profiler.counters.get(name, 0) + amount
+
+    def summary() -> None:
+        """
+        Print a table of the time spent in each stage, followed by the counters.
+
+        Returns:
+            None
+        """
+
+        fprint(f"\n{Colors.BOLD}{'Stage':<12}{'Calls':>8}{'Total (s)':>12}{'Self (s)':>12}")
+        for name, (calls, total, own) in Profiler.timers.items():
+            fprint(f"{name:<12}{calls:>8}{total:>12.3f}{own:>12.3f}")
+        if len(Profiler.counters) > 0:
+            fprint(f"\n{Colors.BOLD}{'Counter':<24}{'Count':>8}")
+            for name, value in Profiler.counters.items():
+                fprint(f"{name:<24}{value:>8}")
+
+    def save(filename: str) -> None:
+        """
+        Save the timed stages as a JSON trace, in the Trace Event Format read by chrome://tracing and Perfetto.
+        The counters and the summary of each stage are included as metadata.
+
+        Parameters:
+            filename (str): The path of the trace file.
+
+        Returns:
+            None
+        """
+
+        events = [
+            {"name": name, "ph": "X", "ts": round(start * 1e6), "dur": round(duration * 1e6), "pid": os.getpid(), "tid": 0}
+            for name, start, duration in Profiler.events
+        ]
+        trace = {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "timers": {name: {"calls": calls, "total": total, "self": own} for name, (calls, total, own) in Profiler.timers.items()},
+                "counters": Profiler.counters
+            }
+        }
+        with open(filename, "w", encoding="utf-8") as file:
+            json.dump(trace, file, indent=4)
+
+class Diagnostic:
+    """
+    This class represents a warning found while generating a report, with where it was found.
+    """
+
+    __slots__ = ("message", "day", "operation", "metric")
+
+    def __init__(self, message: str, day: int | None = None, operation: int | None = None, metric: str | None = None):
+        self.message = message
+        self.day = day
+        self.operation = operation
+        self.metric = metric
+
+    def __str__(self) -> str:
+        location = []
+        if self.day != None:
+            location.append(f"Day #{self.day}")
+        if self.operation != None:
+            location.append(f"operation #{self.operation}")
+        return f"{self.message} ({', '.join(location)})." if len(location) > 0 else f"{self.message}."
+
+    def __repr__(self) -> str:
+        return str(self)
+
+    def key(self) -> tuple:
+        return (self.message, self.day, self.operation, self.metric)
+
+class Diagnostics:
+    """
+    This class collects the warnings found while generating a report, instead of printing each one as it is found.
+    Like the logger, it is used through the class itself.
+    Repeated warnings are only kept once, and they are either printed together as a summary or returned to the caller.
+    """
+
+    records = {}
+
+    def warn(message: str, day: int | None = None, operation: int | None = None, metric: str | None = None) -> None:
+        """
+        Record a warning.
+
+        Parameters:
+            message (str): The warning, without the day or operation.
+            day (int | None): The number of the day it was found on. Default is None.
+            operation (int | None): The number of the operation in its day. Default is None.
+            metric (str | None): The value the warning is about, for example "depth". Default is None.
+
+        Returns:
+            None
+        """
+
+        # Only the first of repeated warnings is kept and counted.
+        diagnostic = Diagnostic(message, day, operation, metric)
+        if diagnostic.key() not in Diagnostics.records:
+            Diagnostics.records[diagnostic.key()] = diagnostic
+            Profiler.count("warnings")
+
+    def collect() -> list:
+        """
+        Get the recorded warnings, and clear them.
+
+        Returns:
+            list: The warnings, in the order they were first found.
+        """
+
+        diagnostics = list(Diagnostics.records.values())
+        Diagnostics.records.clear()
+        return diagnostics
+
+    def describe(diagnostics: list) -> list:
+        """
+        Describe a list of warnings, with one line for each message, listing the days it was found on.
+
+        Parameters:
+            diagnostics (list): The warnings, as returned by collect.
+
+        Returns:
+            list: The lines of the summary.
+        """
+
+        groups = {}
+        for diagnostic in diagnostics:
+            groups.setdefault(diagnostic.message, []).append(diagnostic)
+
+        lines = []
+        for message, group in groups.items():
+            days = sorted({i.day for i in group if i.day != None})
+            operations = sum(1 for i in group if i.operation != None)
+            text = message
+            if len(days) > 0:
+                text += f": Day #{days[0]}" if len(days) == 1 else f": Day #{', #'.join(str(i) for i in days[:-1])} and #{days[-1]}"
+            if operations > 1:
+                text += f" ({operations} operations)"
+            lines.append(f"{text}.")
+        return lines
+
+    def summary(diagnostics: list) -> None:
+        """
+        Print a summary of warnings, with one line for each message, listing the days it was found on.
+
+        Parameters:
+            diagnostics (list): The warnings, as returned by collect.
+
+        Returns:
+            None
+        """
+
+        for line in Diagnostics.describe(diagnostics):
+            Logger.warn(line)
+
+    def flush() -> None:
+        """
+        Print a summary of the recorded warnings, and clear them.
+
+        Returns:
+            None
+        """
+
+        Diagnostics.summary(Diagnostics.collect())
+
+class ReportService(ThreadingHTTPServer):
+    """
+    This class represents the local report service, an HTTP server generating reports on request.
+    Workbooks stay open in a WorkbookCache between requests, so repeated reports on the same workbook skip opening and parsing it.
+    Reports are generated one at a time, as the warnings and timings are recorded globally.
+    """
+
+    def __init__(self, address: tuple, cache: WorkbookCache, workers: int = WORKERS):
+        super().__init__(address, ReportHandler)
+        self.cache = cache
+        self.workers = workers
+        self.lock = threading.Lock()
+
+class ReportHandler(BaseHTTPRequestHandler):
+    """
+    This class handles the requests of the report service.
+    GET /report takes the parameters in the query string and POST /report in a JSON object.
+    GET /statistics returns the statistics of a range of days, and GET /status the state of the caches.
+    """
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        if url.path == "/report":
+            self.report({key: values[-1] for key, values in parse_qs(url.query).items()})
+        elif url.path == "/statistics":
+            self.statistics({key: values[-1] for key, values in parse_qs(url.query).items()})
+        elif url.path == "/status":
+            with self.server.lock:
+                status = self.server.cache.status()
+            hits, misses = get_description_counts()
+            status["descriptions"] = {"hits": hits, "misses": misses, "size": parse_description.cache_info().currsize, "size_limit": DESCRIPTION_CACHE_SIZE}
+            self.respond(200, json.dumps(status).encode("utf-8"), SERVICE_FORMATS["json"])
+        else:
+            self.fail(404, "Not found. Use /report, /statistics or /status.")
+
+    def do_POST(self) -> None:
+        if urlparse(self.path).path != "/report":
+            self.fail(404, "Not found. Use /report, /statistics or /status.")
+            return
+        try:
+            parameters = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        except ValueError:
+            self.fail(400, "The request body must be a JSON object.")
+            return
+        if type(parameters) != dict:
+            self.fail(400, "The request body must be a JSON object.")
+            return
+        self.report(parameters)
+
+    def report(self, parameters: dict) -> None:
+        """
+        Generate a report and send it as the response, or send the error that prevented it.
+
+        Parameters:
+            parameters (dict): The parameters of the report, see service_report.
+
+        Returns:
+            None
+        """
+
+        try:
+            with self.server.lock:
+                body, content_type, warnings = service_report(self.server.cache, parameters, self.server.workers)
+        except FileNotFoundError as e:
+            self.fail(404, f"Workbook not found: {e.filename}")
+            return
+        except ValueError as e:
+            self.fail(400, str(e))
+            return
+        except Exception as e:
+            self.fail(500, f"An error occurred while generating the report: {e}")
+            return
+
+        headers = {"X-Report-Warnings": str(warnings)}
+        if content_type == SERVICE_FORMATS["docx"]:
+            headers["Content-Disposition"] = 'attachment; filename="report.docx"'
+        self.respond(200, body, content_type, headers)
+
+    def statistics(self, parameters: dict) -> None:
+        """
+        Send the statistics of a range of days as the response, or the error that prevented it.
+
+        Parameters:
+            parameters (dict): The workbook and date range, see service_statistics.
+
+        Returns:
+            None
+        """
+
+        try:
+            with self.server.lock:
+                body = service_statistics(self.server.cache, parameters, self.server.workers)
+        except FileNotFoundError as e:
+            self.fail(404, f"Workbook not found: {e.filename}")
+            return
+        except ValueError as e:
+            self.fail(400, str(e))
+            return
+        except Exception as e:
+            self.fail(500, f"An error occurred while calculating the statistics: {e}")
+            return
+        self.respond(200, body, SERVICE_FORMATS["json"])
+
+    def fail(self, status: int, message: str) -> None:
+        self.respond(status, json.dumps({"error": message}).encode("utf-8"), SERVICE_FORMATS["json"])
+
+    def respond(self, status: int, body: bytes, content_type: str, headers: dict | None = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+# UTILITY FUNCTIONS
+
+def fprint(*args, end: str = "\n") -> None:
+    """
+    Print function with built-in color reset for convenience.
+    This is to be used instead of the built-in print function because of its automatic color reset.
+
+    Parameters:
+        *args (any): Any number of arguments to print, can be any type.
+
+    Returns:
+        None
+    """
+
+    # Altered print statement to include color reset.
+    print(str(*args) + Colors.RESET, end=end)
+
+def clear() -> None:
+    """
+    Clears the terminal screen using an ANSI escape code.
+
+    Parameters:
+        None
+    
+    Returns:
+        None
+    """
+
+    # ANSI escape code to clear the screen.
+    print("\033[H\033[J", end='')
+
+def pause(newlines: int = 1) -> None:
+    """
+    Pause the program until the user presses Enter.
+
+    Parameters:
+        newlines (int): The number of newlines to print before the prompt. Default is 1.
+
+    Returns:
+        None
+    """
+
+    # Print newlines and prompt the user to press the enter key.
+    fprint(("\n" * newlines) + Colors.BOLD + "Press ENTER to continue.", end="")
+    input()
+
+def convert_time(time_object: str | float) -> str | float:
+    """
+    Converts time from float to string or vice versa.
+    Time can be represented as a float between 0 to 1 or a string in the format "HH:MM".
+
+    Parameters:
+        time_object (str | float): The time in either format.
+
+    Returns:
+        str | float: The time in the other format.
+    """
+
+    if type(time_object) == str:
+        hour = int(time_object.split(":")[0])
+        minute = int(time_object.split(":")[1])
+        return float((hour * 60 + minute) / 1440)
+    elif type(time_object) == float:
+        hour = int(time_object * 1440 / 60)
+        minute = int(time_object * 1440 % 60)
+        return f"{hour}:{minute:02d}"
+    else:
+        return None
+    
+def validate_time(timestring: str) -> bool:
+    """
+    Validate a time string in the format "HH:MM" in 24 hour time.
+    This function will check if the time string is valid and return a boolean.
+
+    Parameters:
+        timestring (str): The time string to validate.
+
+    Returns:
+        bool: True if the time string is valid, False otherwise.
+    """
+
+    try:
+        hour = int(timestring.split(":")[0])
+        minute = int(timestring.split(":")[1])
+        if hour < 0 or hour > 23:
+            return False
+        if minute < 0 or minute > 59:
+            return False
+        return True
+    except:
+        return False
+
+
+def to_number(value: str) -> float:
+    """
+    Convert a value to a number, without raising an error.
+
+    Parameters:
+        value (str): The value to convert.
+
+    Returns:
+        float: The number, or NaN if the value is not a number.
+    """
+
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+def to_value(entry: str, suffix: str, unit: str) -> Value | None:
+    """
+    Convert an entry of an operation description to a value, by removing its suffix.
+
+    Parameters:
+        entry (str): The entry to convert, for example "1200 kg/m³ MW".
+        suffix (str): The suffix to remove, for example "kg/m³ MW".
+        unit (str): The unit of the value.
+
+    Returns:
+        Value | None: The value, or None if the entry is not a number once the suffix is removed.
+    """
+
+    try:
+        return Value(float(entry.replace(suffix, "").strip()), unit)
+    except ValueError:
+        return None
+
+def tokenize_description(description: str, kind: str) -> tuple:
+    """
+    Extract the values reported in an operation description in a single pass.
+    Values are reported after the "@" as entries separated by ". ", and only the first entry reporting a value is used, even if it is malformed.
+
+    Parameters:
+        description (str): The description of the operation, for example "Drilling (to 1500m) @ 1200 kg/m³ MW. 2.5 m³/min".
+        kind (str): The kind of operation, either "Drilling" or "Connection", since each reports different values.
+
+    Returns:
+        tuple: The depth, mud weight, ECD, ESD, pump rate, dynamic BP, static BP and gas. Values that are not reported are None.
+    """
+
+    depth = mud_weight = ecd = esd = pump_rate = dynamic_bp = static_bp = gas = None
+    head, body = DESCRIPTION_PATTERN.match(description).groups()
+
+    # The depth of a drilling operation is reported before the "@".
+    if kind == "Drilling":
+        try:
+            depth = Value(float(head.replace("Drilling (to ", "").replace("m)", "")), "m")
+        except ValueError:
+            depth = None
+
+    if body == None:
+        return (depth, mud_weight, ecd, esd, pump_rate, dynamic_bp, static_bp, gas)
+    entries = body.split(". ")
+
+    # The depth of a connection is the first entry after the "@".
+    if kind == "Connection":
+        try:
+            depth = Value(float(entries[0].replace("m", "").strip()), "m")
+        except ValueError:
+            depth = None
+
+    found = set()
+    for entry in entries:
+        keywords = DESCRIPTION_KEYWORDS.findall(entry)
+        if len(keywords) == 0:
+            continue
+
+        if "MW" in keywords and "MW" not in found:
+            found.add("MW")
+            mud_weight = to_value(entry, "kg/m³ MW", "kg/m³")
+
+        if kind == "Drilling":
+            if "ECD" in keywords and "ECD" not in found:
+                found.add("ECD")
+                ecd = to_value(entry, "kg/m³ ECD", "kg/m³")
+            if "m³/min" in keywords and "m³/min" not in found:
+                found.add("m³/min")
+                pump_rate = to_value(entry, "m³/min", "m³/min")
+            # Any other entry in kPa is not a dynamic BP, but still ends the search.
+            if any(i.startswith("kPa") for i in keywords) and "kPa" not in found:
+                found.add("kPa")
+                if "kPa Line Restriction" in keywords:
+                    dynamic_bp = to_value(entry, "kPa Line Restriction", "kPa")
+                elif "kPa BP" in keywords:
+                    dynamic_bp = to_value(entry, "kPa BP", "kPa")
+
+        elif kind == "Connection":
+            if "ESD" in keywords and "ESD" not in found:
+                found.add("ESD")
+                esd = to_value(entry, "kg/m³ ESD", "kg/m³")
+            if "B/U" not in found and any(i in GAS_KEYWORDS for i in keywords):
+                found.add("B/U")
+                if "KSCM/Day B/U" in keywords:
+                    gas = to_value(entry, "KSCM/Day B/U", "KSCM/Day B/U")
+                elif "ShakerGas B/U" in keywords:
+                    gas = to_value(entry, "ShakerGas B/U", "ShakerGas B/U")
+                elif "No Gas to Report" in keywords:
+                    gas = Value(0, "KSCM/Day")
+                else:
+                    gas = Value(0, "Flame B/U")
+            # Static BP is only reported as no BP or as a range, other BP entries are skipped.
+            if ("BP" in keywords or "kPa BP" in keywords) and "BP" not in found:
+                if any(i.lower() in entry.lower() for i in ["No BP", "Closed Choke", "Open Choke"]):
+                    found.add("BP")
+                    static_bp = Value(0, "kPa")
+                elif " to " in entry:
+                    found.add("BP")
+                    try:
+                        values = entry.replace("kPa BP", "").split(" to ")
+                        static_bp = Range(Value(float(values[0]), "kPA"), Value(float(values[1]), "kPA"))
+                    except (ValueError, IndexError):
+                        static_bp = None
+
+    return (depth, mud_weight, ecd, esd, pump_rate, dynamic_bp, static_bp, gas)
+
+@lru_cache(maxsize=DESCRIPTION_CACHE_SIZE)
+def parse_description(description: str, kind: str) -> tuple:
+    """
+    Extract the values reported in an operation description, see tokenize_description.
+    The values of the most recently parsed descriptions are kept, since many descriptions repeat word for word within and across sheets.
+    The values are shared by every operation with the same description, so they must not be changed.
+    The number of descriptions found and not found among the kept ones is given by parse_description.cache_info(), see get_description_counts.
+
+    Parameters:
+        description (str): The description of the operation.
+        kind (str): The kind of operation, either "Drilling" or "Connection".
+
+    Returns:
+        tuple: The depth, mud weight, ECD, ESD, pump rate, dynamic BP, static BP and gas. Values that are not reported are None.
+    """
+
+    return tokenize_description(description, kind)
+
+def get_description_counts() -> tuple:
+    """
+    Get the number of descriptions found among the kept ones and the number parsed, since the program started.
+
+    Returns:
+        tuple: The number of descriptions found in the cache of parse_description, and the number that were not.
+    """
+
+    info = parse_description.cache_info()
+    return info.hits, info.misses
+
+def count_descriptions(hits: int, misses: int) -> None:
+    """
+    Add descriptions found in the description cache and parsed to the profiler counters.
+
+    Parameters:
+        hits (int): The number of descriptions found in the cache.
+        misses (int): The number of descriptions parsed.
+
+    Returns:
+        None
+    """
+
+    Profiler.count("descriptions from cache", hits)
+    Profiler.count("descriptions parsed", misses)
+
+def hash_file(filename: str) -> str:
+    """
+    Hash the contents of a file.
+
+    Parameters:
+        filename (str): The path of the file to hash.
+
+    Returns:
+        str: The SHA-256 hash of the file, as a hexadecimal string.
+    """
+
+    digest = hashlib.sha256()
+    with open(filename, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_strings(strings: list) -> str:
+    """
+    Hash a list of strings.
+
+    Parameters:
+        strings (list): The strings to hash.
+
+    Returns:
+        str: The SHA-256 hash of the strings, as a hexadecimal string.
+    """
+
+    digest = hashlib.sha256()
+    for string in strings:
+        digest.update(str(string).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def get_sheet_parts(data: pd.ExcelFile) -> dict:
+    """
+    Get the CRC and size of each sheet in the archive of an .xlsx, .xlsm or .xlsb file, without decompressing them.
+
+    Parameters:
+        data (pd.ExcelFile): The Excel file.
+
+    Returns:
+        dict: The CRC and size of each sheet, by sheet name. Empty if the file is not an archive.
+    """
+
+    if type(data.io) != str or not zipfile.is_zipfile(data.io):
+        return {}
+
+    # Find the path of each sheet in the archive.
+    paths = {}
+    try:
+        if data.engine == "openpyxl":
+            for sheet in data.sheet_names:
+                paths[sheet] = data.book[sheet]._worksheet_path
+        elif data.engine == "pyxlsb":
+            for sheet, target in data.book._sheets:
+                paths[sheet] = "xl/" + target.lstrip("/").removeprefix("xl/")
+    except (AttributeError, KeyError):
+        return {}
+
+    with zipfile.ZipFile(data.io) as archive:
+        infos = {info.filename: info for info in archive.infolist()}
+    parts = {}
+    for sheet, path in paths.items():
+        info = infos.get(path.lstrip("/"))
+        if info != None:
+            parts[sheet] = f"{info.CRC:08x}-{info.file_size}"
+    return parts
+
+def get_shared_strings(data: pd.ExcelFile) -> list | None:
+    """
+    Get the shared strings of an Excel file.
+    For .xlsx and .xlsm files, each string is the XML of its entry, read from the archive, since openpyxl does not keep the table once the workbook is loaded.
+    For .xlsb files, they are the strings loaded by pyxlsb.
+
+    Parameters:
+        data (pd.ExcelFile): The Excel file.
+
+    Returns:
+        list | None: The shared strings in order, or None if they are not available.
+    """
+
+    try:
+        if data.engine == "openpyxl":
+            if type(data.io) != str or not zipfile.is_zipfile(data.io):
+                return None
+            with zipfile.ZipFile(data.io) as archive:
+                # Workbooks without text cells, or with only inline strings, have no shared strings part.
+                relationship = SHARED_STRINGS_RELATIONSHIP.search(archive.read("xl/_rels/workbook.xml.rels"))
+                if relationship == None:
+                    return []
+                target = SHARED_STRINGS_TARGET.search(relationship.group(0)).group(1).decode("utf-8")
+                path = target.lstrip("/") if target.startswith("/") else os.path.normpath(os.path.join("xl", target)).replace(os.sep, "/")
+                return [entry.decode("utf-8") for entry in SHARED_STRINGS_ENTRY.findall(archive.read(path))]
+        if data.engine == "pyxlsb":
+            table = data.book.stringtable
+            return [] if table == None else table._strings
+    except (AttributeError, KeyError, OSError, zipfile.BadZipFile, UnicodeDecodeError):
+        return None
+    return None
+
+def convert_cell(value) -> str | None:
+    """
+    Convert the value of a cell to text, the same way pandas does when reading a sheet with dtype=str.
+    Whole numbers lose their decimal point, and empty cells, errors and values pandas treats as missing become None.
+
+    Parameters:
+        value (any): The value of the cell, as returned by the Excel engine.
+
+    Returns:
+        str | None: The value as text, or None if the cell is empty.
+    """
+
+    if value is None:
+        return None
+    if type(value) == float:
+        if math.isnan(value):
+            return None
+        if value.is_integer():
+            return str(int(value))
+        return str(value)
+    text = str(value)
+    if text in MISSING_VALUES:
+        return None
+    return text
+
+def compact_row(values) -> list:
+    """
+    Convert the values of a row to text and keep only the non-empty values of the operation columns.
+
+    Parameters:
+        values (iterable): The values of the cells in the row.
+
+    Returns:
+        list: The non-empty values of the row as text, at most OPERATION_COLUMNS of them.
+    """
+
+    row = []
+    for value in values:
+        value = convert_cell(value)
+        if value != None:
+            row.append(value)
+            if len(row) == OPERATION_COLUMNS:
+                break
+    return row
+
+def stream_openpyxl_rows(book, sheet: str):
+    """
+    Stream the rows of the operations table from an .xlsx or .xlsm file opened by openpyxl in read-only mode.
+
+    Parameters:
+        book (openpyxl.Workbook): The workbook, opened in read-only mode.
+        sheet (str): The name of the sheet to read.
+
+    Yields:
+        list: The rows of the operations table, each containing only the non-empty values of the operation columns.
+    """
+
+    worksheet = book[sheet]
+    # The dimensions saved in the file are not always correct, so the rows are read as they are.
+    worksheet.reset_dimensions()
+    for row in worksheet.iter_rows(min_row=OPERATIONS_FIRST_ROW + 1, values_only=True):
+        yield compact_row(row)
+
+def stream_pyxlsb_rows(book, sheet: str):
+    """
+    Stream the rows of the operations table from an .xlsb file opened by pyxlsb.
+    Rows without any cells are not stored in the file, so they are detected by a gap in the row numbers.
+
+    Parameters:
+        book (pyxlsb.Workbook): The workbook.
+        sheet (str): The name of the sheet to read.
+
+    Yields:
+        list: The rows of the operations table, each containing only the non-empty values of the operation columns.
+    """
+
+    with book.get_sheet(sheet) as worksheet:
+        previous = OPERATIONS_FIRST_ROW - 1
+        for row in worksheet.rows(sparse=True):
+            if len(row) == 0 or row[0].r < OPERATIONS_FIRST_ROW:
+                continue
+            if row[0].r > previous + 1:
+                yield []
+            previous = row[0].r
+            yield compact_row(cell.v for cell in row)
+
+def read_operations(data: pd.ExcelFile, sheet: str):
+    """
+    Read the operations table from a sheet in the Excel file.
+    For .xlsx, .xlsm and .xlsb files, the rows are streamed straight from the Excel engine, so reading stops as soon as the table ends.
+    Other formats are read through pandas.
+
+    Parameters:
+        data (pd.ExcelFile): The Excel file to read from.
+        sheet (str): The name of the sheet to read.
+
+    Returns:
+        iterable: The rows of the operations table, each containing only the non-empty values of the operation columns.
+    """
+
+    if data.engine == "openpyxl":
+        return stream_openpyxl_rows(data.book, sheet)
+    if data.engine == "pyxlsb":
+        return stream_pyxlsb_rows(data.book, sheet)
+    return read_operations_block(data, sheet)
+
+def read_operations_block(data: pd.ExcelFile, sheet: str) -> list:
+    """
+    Read the operations table from a sheet in the Excel file through pandas.
+    Only the rows of the table are read, the header rows above it and everything after the first empty row are skipped.
+    The end of the table is not known in advance, so the sheet is read in growing blocks until it is found.
+
+    Parameters:
+        data (pd.ExcelFile): The Excel file to read from.
+        sheet (str): The name of the sheet to read.
+
+    Returns:
+        list: The rows of the operations table, each containing only the non-empty values of the operation columns.
+    """
+
+    nrows = OPERATIONS_READ_ROWS
+    while True:
+        block = data.parse(sheet, header=None, skiprows=OPERATIONS_FIRST_ROW, nrows=nrows, dtype=str)
+
+        rows = []
+        for row in block.values.tolist():
+            sub = [j for j in row if type(j) != float][:OPERATION_COLUMNS]
+            rows.append(sub)
+            # A row with at most one value marks the end of the table.
+            if len(sub) <= 1:
+                return rows
+
+        # Fewer rows than requested means the end of the sheet was reached.
+        if len(rows) < nrows:
+            return rows
+        nrows *= 4
+
+def parse_sheet(data) -> list:
+    """
+    Parse the operations table from a sheet in the Excel file.
+    This function will parse the rows of the table and return a list of operations.
+
+    Parameters:
+        data (iterable): The rows of the operations table, as returned by read_operations. Reading stops at the first empty row.
+
+    Returns:
+        list: A list of operations parsed from the data.
+    """
+
+    # Validate the parsed data.
+    operations = []
+    for index, row in enumerate(data):
+        if len(row) <= 1:
+            break
+
+        if len(row) < 5:
+            continue
+        
+        # Ensure time is in 0-1 float format.
+        # Checking for HH:MM(:SS) format and converting to float.
+        start = str(row[0])
+        end = str(row[1])
+        if len(start) == 8:
+            start = start[0:5]
+        if len(end) == 8:
+            end = end[0:5]
+        if validate_time(start):
+            row[0] = str(convert_time(start))
+            if row[0] == "0.0":
+                row[0] = "0"
+            if row[0] == "1.0":
+                row[0] = "1"
+        if validate_time(end):
+            row[1] = str(convert_time(end))
+            if row[0] == "0.0":
+                row[0] = "0"
+            if row[0] == "1.0":
+                row[0] = "1"
+
+        # Checking for end time being "1900-01-01 00:00:00" (strange occurrence).
+        if row[1] == "1900-01-01 00:00:00":
+            row[1] = "1"
+
+        if index == 0 and row[0] != "0":
+            Logger.error("Operation summary is malformed, please check the Excel file and try again.")
+            Logger.error("This is most likely because the first operation does not start at 0:00.")
+            return
+
+        try:
+            connection = int(row[3])
+            if connection > 0:
+                operations.append(Connection(row))
+                continue
+        except ValueError:
+            pass
+
+        if row[3] == "C":
+            operations.append(Connection(row))
+        elif row[3] == "D":
+            operations.append(Drilling(row))
+
+    # Return the parsed data.
+    return operations
+
+def parse_sheets(filename: str, sheets: list) -> list:
+    """
+    Parse a group of sheets from an Excel file.
+    This is run in a worker process, so the Excel file is opened again from its path.
+
+    Parameters:
+        filename (str): The path of the Excel file.
+        sheets (list): The names of the sheets to parse, in order.
+
+    Returns:
+        tuple: A list of days, each containing a list of operations, and the number of descriptions found in the description cache and parsed.
+    """
+
+    hits, misses = get_description_counts()
+    with pd.ExcelFile(filename) as data:
+        days = [parse_sheet(read_operations(data, sheet)) for sheet in sheets]
+    after = get_description_counts()
+    return days, after[0] - hits, after[1] - misses
+
+def parse_sheets_parallel(filename: str, sheets: list, workers: int) -> list:
+    """
+    Parse sheets from an Excel file across a pool of worker processes.
+    The sheets are split into one contiguous group per worker, so each worker only opens the Excel file once.
+
+    Parameters:
+        filename (str): The path of the Excel file.
+        sheets (list): The names of the sheets to parse, in order.
+        workers (int): The maximum number of worker processes.
+
+    Returns:
+        list: A list of days in the same order as the sheets, each containing a list of operations.
+    """
+
+    size = math.ceil(len(sheets) / min(workers, len(sheets)))
+    groups = [sheets[i:i + size] for i in range(0, len(sheets), size)]
+
+    with ProcessPoolExecutor(max_workers=len(groups)) as executor:
+        results = list(executor.map(parse_sheets, [filename] * len(groups), groups))
+
+    # Each worker has its own description cache, so their counts are added here.
+    for _, hits, misses in results:
+        count_descriptions(hits, misses)
+    return [day for days, _, _ in results for day in days]
+
+def load_days(data: pd.ExcelFile, sheets: list, cache: SheetCache | WorkbookCache | None = None, workers: int = WORKERS) -> list:
+    """
+    Load the operations of each sheet from the Excel file.
+    Sheets found in the cache are not parsed again, and newly parsed sheets are added to it.
+    When enough sheets need parsing, they are parsed in parallel by worker processes.
+
+    Parameters:
+        data (pd.ExcelFile): The Excel file to load the sheets from.
+        sheets (list): The names of the sheets to load, in order.
+        cache (SheetCache | WorkbookCache | None): The cache to use. Default is None, meaning nothing is cached.
+        workers (int): The maximum number of worker processes. Default is the number of CPUs.
+
+    Returns:
+        list: A list of days, each containing a list of operations.
+    """
+
+    # The cache and the worker processes can only be used if the Excel file was opened from a path.
+    filename = data.io if type(data.io) == str else None
+    file_hash = None
+    if cache != None and filename != None:
+        try:
+            file_hash = cache.identify(filename)
+        except OSError:
+            file_hash = None
+
+    # Get the sheets that are already cached.
+    days = [None] * len(sheets)
+    missing = []
+    with Profiler.stage("cache"):
+        for index, sheet in enumerate(sheets):
+            if file_hash != None:
+                days[index] = cache.get(file_hash, sheet)
+            if days[index] == None:
+                missing.append(index)
+    Profiler.count("sheets from cache", len(sheets) - len(missing))
+
+    # Parse the remaining sheets.
+    names = [sheets[i] for i in missing]
+    parsed = None
+    if filename != None and workers > 1 and len(names) >= PARALLEL_MINIMUM_SHEETS:
+        try:
+            # Sheets are read and parsed together in the worker processes.
+            with Profiler.stage("parallel"):
+                parsed = parse_sheets_parallel(filename, names, workers)
+        except (BrokenProcessPool, OSError) as e:
+            Diagnostics.warn(f"Could not parse sheets in parallel, parsing them one at a time instead: {e}")
+    if parsed == None:
+        parsed = []
+        hits, misses = get_description_counts()
+        for sheet in names:
+            with Profiler.stage("parse"):
+                rows = Profiler.iterate("read", read_operations(data, sheet))
+                parsed.append(parse_sheet(rows))
+                rows.close()
+        after = get_description_counts()
+        count_descriptions(after[0] - hits, after[1] - misses)
+    Profiler.count("sheets parsed", len(names))
+    Profiler.count("parse failures", parsed.count(None))
+
+    with Profiler.stage("cache"):
+        for index, operations in zip(missing, parsed):
+            days[index] = operations
+            # Malformed sheets are not cached, so the error is reported on every run.
+            if file_hash != None and operations != None:
+                cache.put(file_hash, sheets[index], operations)
+
+        if file_hash != None:
+            cache.evict()
+
+    return days
+
+def build_operation_table(days: list, numbers: list | None = None) -> pd.DataFrame:
+    """
+    Build a columnar table of the operations from a list of days.
+    Each row of the table is an operation, with its day, type, times, duration in hours and one column per reported value.
+    Values that are not reported are NaN, and a static BP range is split into its start and end.
+
+    Parameters:
+        days (list): The 2D list of operations. This is a list of days, each containing a list of operations.
+        numbers (list | None): The number of each day. Default is None, meaning days are numbered from 1.
+
+    Returns:
+        pd.DataFrame: The table of operations.
+    """
+
+    if numbers == None:
+        numbers = range(1, len(days) + 1)
+
+    records = []
+    for index, day in zip(numbers, days):
+        for position, operation in enumerate(day, start=1):
+            # The depth is read directly, so a missing depth is reported with the day and operation it is missing from.
+            if operation.depth == None:
+                Diagnostics.warn("No depth reported for an operation", index, position, "depth")
+
+            # Only the values reported by each type of operation are read, the rest stay NaN.
+            values = [operation.depth, operation.get_mud_weight(), None, None, None, None, None, None, None]
+            if type(operation) == Drilling:
+                values[2] = operation.get_pump_rate()
+                values[3] = operation.get_dynamic_bp()
+                values[6] = operation.get_ecd()
+            elif type(operation) == Connection:
+                static_bp = operation.get_static_bp()
+                if type(static_bp) == Value:
+                    values[4] = static_bp
+                elif type(static_bp) == Range:
+                    values[4] = static_bp.start
+                    values[5] = static_bp.end
+                values[7] = operation.get_esd()
+                values[8] = operation.get_gas()
+
+            # The duration is in hours, and is taken from the times if it cannot be read.
+            start = to_number(operation.data[0])
+            end = to_number(operation.data[1])
+            duration = to_number(operation.get_duration())
+            if math.isnan(duration) and end >= start:
+                duration = (end - start) * 24
+
+            records.append((index, type(operation).__name__, start, end, duration, *values))
+
+    # Columns with a fixed unit are checked to be in that unit, the static BP and gas are taken as they are.
+    columns = dict(zip(OPERATION_TABLE_COLUMNS[:-1], zip(*records))) if len(records) > 0 else {}
+    table = {}
+    for name in OPERATION_TABLE_COLUMNS[:-1]:
+        column = columns.get(name, ())
+        if name in OPERATION_TABLE_UNITS:
+            table[name] = ValueArray.from_values(column, OPERATION_TABLE_UNITS[name]).values
+        elif name in ["static_bp_start", "static_bp_end", "gas"]:
+            table[name] = np.array([i.value if i != None else math.nan for i in column], dtype=np.float64)
+        else:
+            table[name] = list(column)
+    table["gas_unit"] = [i.unit if i != None else None for i in columns.get("gas", ())]
+
+    return pd.DataFrame(table, columns=OPERATION_TABLE_COLUMNS)
+
+def aggregate_days(table: pd.DataFrame, numbers: list, line_restriction_maximum: int, key: str = "day") -> pd.DataFrame:
+    """
+    Aggregate the statistics of each day from the table of operations, in a single pass over the table.
+
+    Parameters:
+        table (pd.DataFrame): The table of operations, as returned by build_operation_table.
+        numbers (list): The numbers of the days to aggregate, including days without any operations.
+        line_restriction_maximum (int): The dynamic BP at or below which Line Restriction is reported.
+        key (str): The column of the table to group the operations by. Default is "day", other keys group parts of days, for example tours.
+
+    Returns:
+        pd.DataFrame: The statistics of each day, indexed by the number of the day. Statistics that are not reported are NaN, and counts are zero.
+    """
+
+    # Add the columns needed for the conditional statistics.
+    table = table.assign(
+        drilling=table["type"] == "Drilling",
+        connection=table["type"] == "Connection",
+        restricted_dynamic_bp=table["dynamic_bp"].where(table["dynamic_bp"] > line_restriction_maximum),
+        nonzero_static_bp_start=table["static_bp_start"].where(table["static_bp_start"] != 0),
+        nonzero_static_bp_end=table["static_bp_end"].where(table["static_bp_end"] != 0),
+        kscm_gas=table["gas"].where(table["gas_unit"] == "KSCM/Day B/U"),
+        shaker_gas=table["gas"].where(table["gas_unit"] == "ShakerGas B/U")
+    )
+
+    # Aggregate every statistic per day.
+    statistics = table.groupby(key).agg(
+        operations=("type", "size"),
+        drillings=("drilling", "sum"),
+        connections=("connection", "sum"),
+        depth_count=("depth", "count"),
+        depth_minimum=("depth", "min"),
+        depth_maximum=("depth", "max"),
+        mud_weight_count=("mud_weight", "count"),
+        mud_weight_minimum=("mud_weight", "min"),
+        mud_weight_maximum=("mud_weight", "max"),
+        pump_rate_count=("pump_rate", "count"),
+        pump_rate_minimum=("pump_rate", "min"),
+        pump_rate_maximum=("pump_rate", "max"),
+        dynamic_bp_count=("dynamic_bp", "count"),
+        dynamic_bp_minimum=("dynamic_bp", "min"),
+        dynamic_bp_maximum=("dynamic_bp", "max"),
+        restricted_dynamic_bp_count=("restricted_dynamic_bp", "count"),
+        restricted_dynamic_bp_minimum=("restricted_dynamic_bp", "min"),
+        restricted_dynamic_bp_maximum=("restricted_dynamic_bp", "max"),
+        static_bp_start_count=("static_bp_start", "count"),
+        static_bp_start_minimum=("static_bp_start", "min"),
+        static_bp_start_maximum=("static_bp_start", "max"),
+        static_bp_end_minimum=("static_bp_end", "min"),
+        static_bp_end_maximum=("static_bp_end", "max"),
+        nonzero_static_bp_start_minimum=("nonzero_static_bp_start", "min"),
+        nonzero_static_bp_end_minimum=("nonzero_static_bp_end", "min"),
+        ecd_count=("ecd", "count"),
+        ecd_sum=("ecd", "sum"),
+        esd_count=("esd", "count"),
+        esd_sum=("esd", "sum"),
+        gas_count=("gas", "count"),
+        kscm_gas_count=("kscm_gas", "count"),
+        kscm_gas_maximum=("kscm_gas", "max"),
+        shaker_gas_count=("shaker_gas", "count"),
+        shaker_gas_maximum=("shaker_gas", "max")
+    ).reindex(numbers)
+
+    # Days without operations are missing from the groups, so their counts are filled in as zero.
+    counts = [i for i in statistics.columns if i.endswith("count") or i in ["operations", "drillings", "connections"]]
+    statistics[counts] = statistics[counts].fillna(0)
+
+    # A static BP range contributes both its start and its end.
+    statistics["static_bp_minimum"] = statistics[["static_bp_start_minimum", "static_bp_end_minimum"]].min(axis=1)
+    statistics["static_bp_maximum"] = statistics[["static_bp_start_maximum", "static_bp_end_maximum"]].max(axis=1)
+    statistics["nonzero_static_bp_minimum"] = statistics[["nonzero_static_bp_start_minimum", "nonzero_static_bp_end_minimum"]].min(axis=1)
+
+    return statistics
+
+def combine_statistics(statistics: pd.DataFrame, groups: list) -> pd.DataFrame:
+    """
+    Combine the statistics of days into the statistics of groups of days, for example weeks.
+    Minimums and maximums are combined as they are, and counts and sums are added, so the result is the same as aggregating the operations of each group.
+
+    Parameters:
+        statistics (pd.DataFrame): The statistics of the days, as returned by aggregate_days.
+        groups (list): The group of each day, in the same order. Consecutive days should be in the same group.
+
+    Returns:
+        pd.DataFrame: The statistics of each group, indexed by the group, in order of their first day.
+    """
+
+    functions = {}
+    for column in statistics.columns:
+        if column.endswith("minimum"):
+            functions[column] = "min"
+        elif column.endswith("maximum"):
+            functions[column] = "max"
+        else:
+            functions[column] = "sum"
+    # Groups are numbered in order, since pandas would take tuples as column names.
+    order = {}
+    codes = np.array([order.setdefault(group, len(order)) for group in groups])
+    combined = statistics.groupby(codes).agg(functions)
+    combined.index = list(order)
+    return combined
+
+def weigh_days(table: pd.DataFrame, numbers: list, key: str = "day") -> pd.DataFrame:
+    """
+    Calculate the duration-weighted mean and percentiles of the values in WEIGHTED_VALUES for each day, so a long operation counts for more than a short one.
+    Every day is calculated at once: the values are sorted by day and value, and each percentile is the first value whose running total of duration reaches its share of the day.
+    Operations without a value or a positive duration are left out.
+
+    Parameters:
+        table (pd.DataFrame): The table of operations, as returned by build_operation_table.
+        numbers (list): The numbers of the days, including days without any operations.
+        key (str): The column of the table to group the operations by. Default is "day".
+
+    Returns:
+        pd.DataFrame: The statistics of each day, indexed by the number of the day, with a "_mean" column and one "_p" column per percentile for each value. Statistics that are not reported are NaN.
+    """
+
+    groups = pd.Index(numbers).get_indexer(table[key])
+    weights = table["duration"].to_numpy(dtype=np.float64)
+
+    columns = {}
+    for name in WEIGHTED_VALUES:
+        values = table[name].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(values) & (weights > 0) & (groups >= 0)
+        order = np.lexsort((values[valid], groups[valid]))
+        value = values[valid][order]
+        weight = weights[valid][order]
+        group = groups[valid][order]
+
+        totals = np.bincount(group, weights=weight, minlength=len(numbers))
+        reported = totals > 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            columns[f"{name}_mean"] = np.where(reported, np.bincount(group, weights=value * weight, minlength=len(numbers)) / totals, math.nan)
+
+        # The running total of duration before the first value of each day.
+        running = np.cumsum(weight)
+        starts = np.searchsorted(group, np.arange(len(numbers)))
+        before = np.where(starts > 0, running[np.maximum(starts - 1, 0)] if len(running) > 0 else 0, 0)
+        for percentile in PERCENTILES:
+            positions = np.searchsorted(running, before + totals * percentile / 100)
+            positions = np.minimum(positions, len(value) - 1)
+            columns[f"{name}_p{percentile}"] = np.where(reported, value[positions] if len(value) > 0 else math.nan, math.nan)
+
+    return pd.DataFrame(columns, index=numbers)
+
+def get_day_statistics(statistics: pd.DataFrame) -> list:
+    """
+    Get the statistics of each day that are kept with its summary, see DAY_STATISTICS.
+
+    Parameters:
+        statistics (pd.DataFrame): The statistics of the days, as returned by aggregate_days.
+
+    Returns:
+        list: A list of statistics, one per day, in the order of DAY_STATISTICS. Statistics that are not reported are None.
+    """
+
+    values = statistics[DAY_STATISTICS].to_numpy(dtype=np.float64)
+    return [[None if math.isnan(value) else value for value in day] for day in values.tolist()]
+
+def summarize_days(table: pd.DataFrame, numbers: list, line_restriction_maximum: int) -> list:
+    """
+    Calculate the summary of each day from the table of operations.
+    All statistics are aggregated per day in a single pass over the table, and then formatted day by day.
+    The depth is left unformatted, since it depends on the previous day, see build_rows.
+
+    Parameters:
+        table (pd.DataFrame): The table of operations, as returned by build_operation_table.
+        numbers (list): The numbers of the days to summarize, including days without any operations.
+        line_restriction_maximum (int): The dynamic BP at or below which Line Restriction is reported.
+
+    Returns:
+        list: A list of summaries, one per day, each containing the minimum and maximum depth (None if not reported) and the formatted values of the other report columns.
+    """
+
+    return summarize_statistics(aggregate_days(table, numbers, line_restriction_maximum))
+
+def summarize_statistics(statistics: pd.DataFrame, diagnose: bool = True) -> list:
+    """
+    Format the summary of each day from its statistics, see summarize_days.
+
+    Parameters:
+        statistics (pd.DataFrame): The statistics of the days, as returned by aggregate_days.
+        diagnose (bool): Whether to record warnings for missing data. Default is True.
+
+    Returns:
+        list: A list of summaries, one per day.
+    """
+
+    warn = Diagnostics.warn if diagnose else lambda *arguments, **keywords: None
+    summaries = []
+    for index, day in zip(statistics.index, statistics.itertuples()):
+        # Calculate minimum and maximum values for depth.
+        if day.depth_count < day.operations:
+            warn("Depths data incomplete", index, metric="depth")
+        if day.depth_count > 0:
+            depth_minimum = float(day.depth_minimum)
+            depth_maximum = float(day.depth_maximum)
+        else:
+            warn("No depth reported", index, metric="depth")
+            depth_minimum = None
+            depth_maximum = None
+
+        # Calculate minimum and maximum values for mud weight.
+        if day.mud_weight_count < day.operations:
+            warn("Mud weight data incomplete", index, metric="mud_weight")
+        if day.mud_weight_count > 0:
+            mud_weight = f"{day.mud_weight_minimum:.0f} – {day.mud_weight_maximum:.0f}"
+            if day.mud_weight_minimum == day.mud_weight_maximum:
+                mud_weight = f"{day.mud_weight_minimum:.0f}"
+        else:
+            warn("No mud weight reported", index, metric="mud_weight")
+            mud_weight = "No mud weight reported"
+
+        # Calculate minimum and maximum values for pump rate.
+        if day.pump_rate_count < day.drillings:
+            warn("Pump rate data incomplete", index, metric="pump_rate")
+        if day.pump_rate_count > 0:
+            pump_rate_minimum = round(float(day.pump_rate_minimum), 2)
+            pump_rate_maximum = round(float(day.pump_rate_maximum), 2)
+            pump_rate = f"{pump_rate_minimum} – {pump_rate_maximum}"
+            if day.pump_rate_minimum == day.pump_rate_maximum:
+                pump_rate = f"{pump_rate_minimum}"
+        else:
+            warn("No pump rate reported", index, metric="pump_rate")
+            pump_rate = "No pump rate reported"
+
+        # Calculate minimum and maximum values for dynamic BP.
+        # If no values are reported, Line Restriction will be used.
+        # If no value is above the maximum threshold, Line Restriction will be used.
+        if day.dynamic_bp_count < day.drillings:
+            warn("Dynamic BP data incomplete", index, metric="dynamic_bp")
+        if day.restricted_dynamic_bp_count > 0:
+            dynamic_bp = f"{day.restricted_dynamic_bp_minimum:.0f} – {day.restricted_dynamic_bp_maximum:.0f}"
+            if day.restricted_dynamic_bp_minimum == day.restricted_dynamic_bp_maximum:
+                dynamic_bp = f"{day.restricted_dynamic_bp_minimum:.0f}"
+        else:
+            dynamic_bp = "Line Restriction"
+
+        # Calculate minimum and maximum values for static BP.
+        if day.static_bp_start_count > 0:
+            static_bp_minimum = day.static_bp_minimum
+            static_bp_maximum = day.static_bp_maximum
+
+            if static_bp_minimum == 0 and static_bp_maximum != 0:
+                static_bp_minimum = day.nonzero_static_bp_minimum
+
+            static_bp = f"{static_bp_minimum:.0f} – {static_bp_maximum:.0f}"
+            if static_bp_minimum == 0 and static_bp_maximum == 0:
+                static_bp = "No BP"
+            elif static_bp_minimum == static_bp_maximum:
+                static_bp = f"{static_bp_minimum:.0f}"
+        else:
+            warn("No static BP reported", index, metric="static_bp")
+            static_bp = "No static BP reported"
+
+        # Calculate average ECD and ESD.
+        if day.ecd_count < day.drillings:
+            warn("ECD data incomplete", index, metric="ecd")
+        if day.esd_count < day.connections:
+            warn("ESD data incomplete", index, metric="esd")
+        ecd_average = round(float(day.ecd_sum) / day.ecd_count) if day.ecd_count > 0 else "--"
+        esd_average = round(float(day.esd_sum) / day.esd_count) if day.esd_count > 0 else "--"
+        ecd_esd_average = f"{ecd_average}/{esd_average}"
+
+        # Calculate maximum value for gas.
+        # Gas is unit sensitive, so maximum is calculated differently.
+        if day.connections == 0:
+            gas = "No B/U gas reported"
+        elif day.gas_count < day.connections or day.kscm_gas_count + day.shaker_gas_count == 0:
+            warn("No gas reported", index, metric="gas")
+            gas = "No B/U gas reported"
+        else:
+            if day.kscm_gas_count > 0:
+                unit = "KSCM/Day B/U"
+                gas_maximum = day.kscm_gas_maximum
+            else:
+                unit = "ShakerGas B/U"
+                gas_maximum = day.shaker_gas_maximum
+
+            if gas_maximum == 0:
+                gas = "No B/U gas reported"
+            else:
+                gas = f"Max {gas_maximum:.1f} {unit} reported"
+
+        summary = [depth_minimum, depth_maximum, mud_weight, pump_rate, dynamic_bp, static_bp, ecd_esd_average, gas]
+        summaries.append(summary)
+
+    return summaries
+
+def build_row(summary: list, last_depth: float | None = None) -> tuple:
+    """
+    Build the report row of a day from its summary.
+    The minimum depth of the day is carried over from the maximum depth of the previous day.
+
+    Parameters:
+        summary (list): The summary of the day, as returned by summarize_days.
+        last_depth (float | None): The maximum depth of the last previous day with a depth. Default is None, meaning there is none.
+
+    Returns:
+        tuple: The row, containing the formatted values of the report columns, and the depth to carry over to the next day.
+    """
+
+    depth_minimum, depth_maximum, *values = summary
+    if depth_maximum == None:
+        return ["No depth reported", *values], last_depth
+
+    if last_depth != None:
+        depth_minimum = last_depth
+    depth = f"{depth_minimum:.0f} – {depth_maximum:.0f}"
+    if depth_minimum == depth_maximum:
+        depth = f"{depth_minimum:.0f}"
+    return [depth, *values], depth_maximum
+
+def build_rows(summaries: list) -> list:
+    """
+    Build the report rows from the summaries of consecutive days, see build_row.
+
+    Parameters:
+        summaries (list): The summaries of the days, in order, as returned by summarize_days.
+
+    Returns:
+        list: A list of rows, one per day, each containing the formatted values of the report columns.
+    """
+
+    rows = []
+    last_depth = None
+    for summary in summaries:
+        row, last_depth = build_row(summary, last_depth)
+        rows.append(row)
+    return rows
+
+def get_date_sheets(data: pd.ExcelFile) -> SheetIndex:
+    """
+    Get the sheets with dates matching the format (example: "2024 Dec-18"), sorted by their date.
+
+    Parameters:
+        data (pd.ExcelFile): The Excel file to get the sheets from.
+
+    Returns:
+        SheetIndex: The index of the sheets with dates, in calendar order.
+    """
+
+    return SheetIndex(data.sheet_names)
+
+def get_sheet_listing(sheets: SheetIndex) -> list:
+    """
+    Get the days to list when asking for a date in the interactive mode.
+    Long workbooks only list their first and last days, with None in between.
+
+    Parameters:
+        sheets (SheetIndex): The index of the sheets with dates.
+
+    Returns:
+        list: The number and name of each day to list, or None where days are left out.
+    """
+
+    numbered = list(enumerate(sheets, 1))
+    if len(numbered) <= SHEET_LIST_MAXIMUM:
+        return numbered
+    return [*numbered[:SHEET_LIST_EDGE], None, *numbered[-SHEET_LIST_EDGE:]]
+
+def choose_sheet(sheets: SheetIndex, option: str) -> str:
+    """
+    Get the sheet chosen in the interactive mode, by its number in the list or by its date.
+
+    Parameters:
+        sheets (SheetIndex): The index of the sheets with dates.
+        option (str): The number of the day, or its date as a sheet name or in the format "YYYY-MM-DD".
+
+    Returns:
+        str: The name of the sheet.
+
+    Raises:
+        ValueError: If there is no such day.
+    """
+
+    sheet = sheets.find(option)
+    if sheet != None:
+        return sheet
+    number = int(option)
+    if number < 1 or number > len(sheets):
+        raise ValueError
+    return sheets[number - 1]
+
+def trim_days(days: list, start_time: str, end_time: str, offset: int = 0, count: int | None = None) -> None:
+    """
+    Remove the operations before the start time on the first day, and after the end time on the last day.
+    The days are modified in place, and days that were not loaded (None) are skipped.
+    The days can be a part of a longer range, in which case only the operations of the first and last day of the whole range are trimmed.
+
+    Parameters:
+        days (list): The 2D list of operations. This is a list of days, each containing a list of operations.
+        start_time (str): The start time on the first day, in the format "HH:MM".
+        end_time (str): The end time on the last day, in the format "HH:MM". "23:59" means the end of the day.
+        offset (int): The position of the first of the days in the whole range. Default is 0.
+        count (int | None): The number of days in the whole range. Default is None, meaning the days are the whole range.
+
+    Returns:
+        None
+    """
+
+    start_time = convert_time(start_time)
+    if end_time == "23:59":
+        end_time = 1
+    else:
+        end_time = convert_time(end_time)
+    if end_time == 0:
+        end_time = 1
+    if count == None:
+        count = len(days)
+
+    # Keep only the operations within the window, in their original order.
+    index = OperationIndex(days)
+    kept = {id(operation) for operation in index.within(start_time - offset, count - 1 - offset + end_time)}
+    for i, day in enumerate(days):
+        if day != None:
+            days[i] = [operation for operation in day if id(operation) in kept]
+
+def format_date_range(start_sheet: str, end_sheet: str) -> str:
+    """
+    Format the date range of a report for its title, leaving out the parts both dates share.
+
+    Parameters:
+        start_sheet (str): The name of the first sheet of the range.
+        end_sheet (str): The name of the last sheet of the range.
+
+    Returns:
+        str: The formatted date range (example: "Dec 18 - 24, 2024").
+    """
+
+    start_date = datetime.strptime(start_sheet, SHEET_DATE_FORMAT)
+    end_date = datetime.strptime(end_sheet, SHEET_DATE_FORMAT)
+    if start_date == end_date:
+        return f"{start_date.strftime('%b')} {start_date.day}, {start_date.year}"
+    elif start_date.month == end_date.month and start_date.year == end_date.year:
+        return f"{start_date.strftime('%b')} {start_date.day} - {end_date.day}, {start_date.year}"
+    elif start_date.year == end_date.year:
+        return f"{start_date.strftime('%b')} {start_date.day} - {end_date.strftime('%b')} {end_date.day}, {start_date.year}"
+    else:
+        return f"{start_date.strftime('%b')} {start_date.day}, {start_date.year} - {end_date.strftime('%b')} {end_date.day}, {end_date.year}"
+
+def create_report(data: pd.ExcelFile, sheets: SheetIndex, start_sheet: str, start_time: str, end_sheet: str, end_time: str, line_restriction_maximum: int = LINE_RESTRICTION_MAXIMUM, workers: int = WORKERS, cache: SheetCache | WorkbookCache | None = None, store: DayStore | None = None, operations: TableWriter | None = None, levels: list | None = None, weighted: bool = False) -> Report:
+    """
+    Create a report for a date range, without any user interaction.
+    With a store of day summaries, only the sheets that are new or changed since they were stored are parsed.
+    The days are read, parsed and summarized a chunk at a time, and their operations are dropped once summarized, so long ranges use little memory.
+
+    Parameters:
+        data (pd.ExcelFile): The Excel file to read the DORs from.
+        sheets (SheetIndex): The index of the sheets with dates, as returned by get_date_sheets.
+        start_sheet (str): The name of the first sheet of the range.
+        start_time (str): The start time on the first day, in the format "HH:MM".
+        end_sheet (str): The name of the last sheet of the range.
+        end_time (str): The end time on the last day, in the format "HH:MM".
+        line_restriction_maximum (int): The dynamic BP at or below which Line Restriction is reported. Default is infinite.
+        workers (int): The maximum number of worker processes used to parse sheets. Default is the number of CPUs.
+        cache (SheetCache | WorkbookCache | None): The cache of parsed sheets to use. Default is None, meaning nothing is cached.
+        store (DayStore | None): The store of day summaries to use. Default is None, meaning every day is summarized again.
+        operations (TableWriter | None): The file to export the operations of every day to, with the columns in OPERATION_EXPORT_COLUMNS. They are written as each chunk of days is parsed, and cannot be used with a store. Default is None.
+        levels (list | None): The other levels to make the report at too, from REPORT_LEVELS, see build_levels. They are built from the same parse, and cannot be used with a store. Default is None.
+        weighted (bool): Whether to calculate the duration-weighted statistics of each day too, see weigh_days. They cannot be used with a store. Default is False.
+
+    Returns:
+        Report: The generated report.
+
+    Raises:
+        ValueError: If a sheet is malformed, no depth is reported in the range, or a store is used with exported operations, levels or weighted statistics.
+        OSError: If the operations cannot be written.
+    """
+
+    # Days reused from the store are not parsed, so nothing that needs their operations can be calculated for them.
+    if store != None and (operations != None or levels or weighted):
+        raise ValueError("Exported operations, other levels and weighted statistics cannot be used with a store of day summaries.")
+
+    start_index = sheets.index(start_sheet)
+    end_index = sheets.index(end_sheet)
+    selected = sheets[start_index:end_index + 1]
+
+    # Get the stored summaries of whole days. The first and last day are only whole if the range starts and ends at midnight.
+    whole = [True] * len(selected)
+    whole[0] = start_time == "00:00"
+    whole[-1] = whole[-1] and end_time in ["23:59", "00:00"]
+    summaries = [None] * len(selected)
+    statistics = [None] * len(selected)
+    if store != None:
+        with Profiler.stage("store"):
+            for index, sheet in enumerate(selected):
+                if whole[index]:
+                    summaries[index] = store.get(sheet, line_restriction_maximum)
+                    statistics[index] = store.get_statistics(sheet)
+    missing = [index for index, summary in enumerate(summaries) if summary == None]
+    Profiler.count("days reused", len(selected) - len(missing))
+
+    # Summarize the remaining days a chunk at a time.
+    day_aggregates = []
+    tour_aggregates = []
+    weighted_statistics = []
+    for start in range(0, len(missing), STREAM_CHUNK_DAYS):
+        chunk = missing[start:start + STREAM_CHUNK_DAYS]
+
+        # The operations of the chunk are placed by day, between the first and last day of the chunk.
+        window = [None] * (chunk[-1] - chunk[0] + 1)
+        for index, day in zip(chunk, load_days(data, [selected[i] for i in chunk], cache, workers)):
+            if day == None:
+                raise ValueError(f"The DOR for {selected[index]} is malformed.")
+            window[index - chunk[0]] = day
+            if Profiler.enabled:
+                for operation in day:
+                    Profiler.count(f"{type(operation).__name__} operations")
+
+        # Filter the data based on the start and end times.
+        with Profiler.stage("trim"):
+            trim_days(window, start_time, end_time, chunk[0], len(selected))
+
+        # Get the calculated data.
+        numbers = [index + 1 for index in chunk]
+        with Profiler.stage("table"):
+            table = build_operation_table([window[index - chunk[0]] for index in chunk], numbers)
+        with Profiler.stage("summarize"):
+            aggregates = aggregate_days(table, numbers, line_restriction_maximum)
+            for index, summary, day in zip(chunk, summarize_statistics(aggregates), get_day_statistics(aggregates)):
+                summaries[index] = summary
+                statistics[index] = day
+            if weighted:
+                weighted_statistics.append(weigh_days(table, numbers))
+
+            # Keep the statistics of the days for the other levels, and aggregate the tours while the operations are loaded.
+            if levels:
+                day_aggregates.append(aggregates)
+                if "tour" in levels:
+                    tours = table.assign(tour=table["day"] * 2 + (table["from"] >= TOUR_START))
+                    tour_aggregates.append(aggregate_days(tours, [number * 2 + tour for number in numbers for tour in [0, 1]], line_restriction_maximum, "tour"))
+        if operations != None:
+            with Profiler.stage("export"):
+                operations.write(build_operation_export(table, {index + 1: format_sheet_date(selected[index]) for index in chunk}))
+        if store != None:
+            with Profiler.stage("store"):
+                for index in chunk:
+                    if whole[index]:
+                        store.put(selected[index], line_restriction_maximum, summaries[index], statistics[index])
+    if store != None:
+        with Profiler.stage("store"):
+            store.save()
+
+    # Build the rows, carrying the depth over from day to day, and fetch maximum depth for the range.
+    rows = []
+    last_depth = None
+    maximum_depth = None
+    for summary in summaries:
+        row, last_depth = build_row(summary, last_depth)
+        rows.append(row)
+        if summary[1] != None:
+            maximum_depth = summary[1] if maximum_depth == None else max(maximum_depth, summary[1])
+    if maximum_depth == None:
+        raise ValueError("No depth reported in the selected range.")
+
+    report = Report(selected, rows, format_date_range(start_sheet, end_sheet), Value(maximum_depth, "m"), Diagnostics.collect(), statistics)
+    if weighted:
+        report.weighted = pd.concat(weighted_statistics)
+    if levels:
+        with Profiler.stage("levels"):
+            report.levels = build_levels(report, pd.concat(day_aggregates), pd.concat(tour_aggregates) if len(tour_aggregates) > 0 else None, start_time, end_time, levels)
+    return report
+
+def format_statistics(statistics: dict) -> list:
+    """
+    Format the statistics of a range of days for printing, one line for each value.
+
+    Parameters:
+        statistics (dict): The statistics, as returned by RangeStatistics.query.
+
+    Returns:
+        list: The lines, for the values that are reported in the range.
+    """
+
+    lines = []
+    for name, result in statistics.items():
+        label, unit = STATISTIC_VALUES[name]
+        parts = []
+        if result.get("minimum") != None:
+            parts.append(f"minimum {result['minimum']:g}")
+        if result.get("maximum") != None:
+            parts.append(f"maximum {result['maximum']:g}")
+        if result.get("mean") != None:
+            parts.append(f"mean {result['mean']:.0f}")
+        if len(parts) > 0:
+            lines.append(f"{label}: {', '.join(parts)} {unit}")
+    return lines
+
+def build_levels(report: Report, day_statistics: pd.DataFrame, tour_statistics: pd.DataFrame | None, start_time: str, end_time: str, levels: list) -> dict:
+    """
+    Build the reports of the same range at other levels, from the statistics of its days and tours.
+    Tours are the 12-hour halves of each day, and operations are in the tour they start in. Weeks are calendar weeks from Monday, and the well level has a single row for the whole range.
+    Like days, the minimum depth of each row is carried over from the maximum depth of the previous one.
+
+    Parameters:
+        report (Report): The report of the days.
+        day_statistics (pd.DataFrame): The statistics of every day of the report, as returned by aggregate_days.
+        tour_statistics (pd.DataFrame | None): The statistics of every tour, grouped by day number * 2 + tour, or None if tours are not needed.
+        start_time (str): The start time on the first day, in the format "HH:MM".
+        end_time (str): The end time on the last day, in the format "HH:MM".
+        levels (list): The levels to build, from REPORT_LEVELS.
+
+    Returns:
+        dict: The report of each level, with a label for each row.
+    """
+
+    dates = [format_sheet_date(sheet) for sheet in report.sheets]
+    day_statistics = day_statistics.reindex(range(1, len(dates) + 1))
+    groups = {}
+    if "tour" in levels:
+        # Leave out the tours outside of the time range on the first and last day.
+        keys = list(tour_statistics.index)
+        if convert_time(start_time) >= TOUR_START:
+            keys.remove(2)
+        if end_time != "23:59" and 0 < convert_time(end_time) <= TOUR_START:
+            keys.remove(len(dates) * 2 + 1)
+
+        # The first and last tour are labelled with the start and end time when they fall within them, like the days they are built from.
+        labels = []
+        for key in keys:
+            start, end = ("00:00", "12:00") if key % 2 == 0 else ("12:00", "24:00")
+            if key // 2 == 1 and convert_time(start_time) > convert_time(start):
+                start = start_time
+            if key // 2 == len(dates) and end_time not in ["23:59", "00:00"] and convert_time(end_time) < (TOUR_START if key % 2 == 0 else 1):
+                end = end_time
+            labels.append(f"{dates[key // 2 - 1]} {start} – {end}")
+        groups["tour"] = (tour_statistics.loc[keys], labels)
+    if "week" in levels:
+        weeks = [datetime.strptime(sheet, SHEET_DATE_FORMAT).isocalendar()[:2] for sheet in report.sheets]
+        statistics = combine_statistics(day_statistics, weeks)
+        labels = []
+        for week in statistics.index:
+            positions = [i for i, day in enumerate(weeks) if day == week]
+            labels.append(dates[positions[0]] if len(positions) == 1 else f"{dates[positions[0]]} – {dates[positions[-1]]}")
+        groups["week"] = (statistics, labels)
+    if "well" in levels:
+        labels = [dates[0] if len(dates) == 1 else f"{dates[0]} – {dates[-1]}"]
+        groups["well"] = (combine_statistics(day_statistics, [0] * len(dates)), labels)
+
+    reports = {}
+    for level, (statistics, labels) in groups.items():
+        rows = []
+        last_depth = None
+        # The missing data was already reported for the days.
+        for summary in summarize_statistics(statistics, False):
+            row, last_depth = build_row(summary, last_depth)
+            rows.append(row)
+        reports[level] = Report(report.sheets, rows, report.date_range, report.maximum_depth, labels=labels)
+    return reports
+
+def to_twips(centimetres: float) -> int:
+    """
+    Convert a length to twips (twentieths of a point), the unit of lengths in Word documents.
+
+    Parameters:
+        centimetres (float): The length in centimetres.
+
+    Returns:
+        int: The length in twips.
+    """
+
+    return round(centimetres / 2.54 * 1440)
+
+def run_xml(text: str, properties: str) -> str:
+    """
+    Build the XML of a run of text, the same way python-docx does.
+    Tabs become tab elements, line breaks become break elements, and text with surrounding whitespace is preserved.
+
+    Parameters:
+        text (str): The text of the run.
+        properties (str): The XML of the run properties.
+
+    Returns:
+        str: The XML of the run.
+    """
+
+    content = []
+    for i, part in enumerate(re.split(r"(\t|\r|\n)", text)):
+        if i % 2 == 1:
+            content.append("<w:tab/>" if part == "\t" else "<w:br/>")
+        elif part != "":
+            space = ' xml:space="preserve"' if len(part.strip()) < len(part) else ""
+            content.append(f"<w:t{space}>{escape(part)}</w:t>")
+    return f"<w:r>{properties}{''.join(content)}</w:r>"
+
+@lru_cache(maxsize=None)
+def get_document_template() -> str:
+    """
+    Find the document template of python-docx, which the Word documents are based on.
+    It is only looked up when the first document is written, so starting the program does not search for python-docx.
+
+    Returns:
+        str: The path of the template.
+
+    Raises:
+        ImportError: If python-docx is not installed.
+    """
+
+    spec = importlib.util.find_spec("docx")
+    if spec == None:
+        raise ImportError("python-docx is needed for the document template. Please install the required modules by running the setup.bat file.")
+    return os.path.join(spec.submodule_search_locations[0], "templates", "default.docx")
+
+def write_document(report: Report, filename) -> None:
+    """
+    Write the Word document for a report directly, without building it with python-docx.
+    The parts of the python-docx template are copied as they are, and the document part is written to the zip file row by row, so long tables are fast and use little memory.
+
+    Parameters:
+        report (Report): The report to write the document for.
+        filename (str | file): The path or file to write the document to.
+
+    Returns:
+        None
+    """
+
+    margin = to_twips(REPORT_MARGIN)
+    grid_width = round((DOCUMENT_PAGE_WIDTH - 2 * margin) / len(REPORT_HEADERS))
+    title_properties = '<w:rPr><w:rFonts w:ascii="Clear Sans" w:hAnsi="Clear Sans"/><w:sz w:val="18"/></w:rPr>'
+    header_properties = '<w:rPr><w:rFonts w:ascii="Oswald" w:hAnsi="Oswald"/><w:color w:val="FFFFFF"/><w:sz w:val="20"/></w:rPr>'
+    grid_column = f'<w:gridCol w:w="{grid_width}"/>'
+    borders = "".join(f'<w:{side} w:val="single" w:sz="4" w:space="0" w:color="999999"/>' for side in ["top", "left", "bottom", "right", "insideH", "insideV"])
+
+    def cell(text: str, width: int, fill: str, properties: str) -> str:
+        return (
+            f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width}"/><w:vAlign w:val="center"/><w:shd w:fill="{fill}"/></w:tcPr>'
+            f'<w:p><w:pPr><w:jc w:val="center"/></w:pPr>{run_xml(text, properties)}</w:p></w:tc>'
+        )
+
+    with zipfile.ZipFile(get_document_template()) as template, zipfile.ZipFile(filename, "w", zipfile.ZIP_DEFLATED) as archive:
+        # Keep the root element of the template, with all of its namespace declarations.
+        template_document = template.read(DOCUMENT_PART).decode("utf-8")
+        head = template_document[:template_document.index("<w:body>")].rstrip()
+
+        for item in template.infolist():
+            if item.filename == DOCUMENT_PART:
+                with archive.open(DOCUMENT_PART, "w") as part:
+                    part.write(f"{head}<w:body>".encode("utf-8"))
+
+                    # Write the title.
+                    title = f"{report.date_range} | Drilling to {report.maximum_depth.value:.0f} {report.maximum_depth.unit}MD"
+                    part.write(f"<w:p>{run_xml(title, title_properties)}</w:p>".encode("utf-8"))
+
+                    # Write the table properties and the header row.
+                    part.write((
+                        '<w:tbl><w:tblPr><w:tblW w:type="auto" w:w="0"/>'
+                        '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" w:noHBand="0" w:noVBand="1" w:val="04A0"/></w:tblPr>'
+                        f'<w:tblBorders>{borders}</w:tblBorders>'
+                        f'<w:tblGrid>{grid_column * len(REPORT_HEADERS)}</w:tblGrid>'
+                        f'<w:tr>{"".join(cell(header, grid_width, "2D2F3E", header_properties) for header in REPORT_HEADERS)}</w:tr>'
+                    ).encode("utf-8"))
+
+                    # Write the rows one at a time, alternating the fill colour.
+                    for i, row in enumerate(report.rows, start=1):
+                        fill = "CCCCCC" if i % 2 == 0 else "FFFFFF"
+                        cells = "".join(cell(value, to_twips(REPORT_COLUMN_WIDTHS[j]), fill, title_properties) for j, value in enumerate(row))
+                        part.write(f"<w:tr>{cells}</w:tr>".encode("utf-8"))
+
+                    part.write((
+                        '</w:tbl><w:sectPr w:rsidR="00FC693F" w:rsidRPr="0006063C" w:rsidSect="00034616">'
+                        f'<w:pgSz w:w="{DOCUMENT_PAGE_WIDTH}" w:h="15840"/>'
+                        f'<w:pgMar w:top="{margin}" w:right="{margin}" w:bottom="{margin}" w:left="{margin}" w:header="720" w:footer="720" w:gutter="0"/>'
+                        '<w:cols w:space="720"/><w:docGrid w:linePitch="360"/></w:sectPr></w:body></w:document>'
+                    ).encode("utf-8"))
+            else:
+                archive.writestr(item.filename, template.read(item.filename), zipfile.ZIP_DEFLATED)
+
+def format_sheet_date(sheet: str) -> str:
+    """
+    Format the date of a sheet in the format "YYYY-MM-DD".
+
+    Parameters:
+        sheet (str): The name of the sheet (example: "2024 Dec-18").
+
+    Returns:
+        str: The date of the sheet.
+    """
+
+    return datetime.strptime(sheet, SHEET_DATE_FORMAT).strftime('%Y-%m-%d')
+
+def write_table(frames, columns: list, filename: str) -> None:
+    """
+    Write tables to a CSV, JSON Lines or Parquet file, chosen by the file extension, see TableWriter.
+
+    Parameters:
+        frames (iterable): The tables to write, each with the given columns.
+        columns (list): The columns of the tables, used when there are no tables to write.
+        filename (str): The path of the file to write.
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: If the file extension is not supported, or pyarrow is missing for a Parquet file.
+    """
+
+    with TableWriter(filename, columns) as writer:
+        for frame in frames:
+            writer.write(frame)
+
+def build_row_table(report: Report) -> pd.DataFrame:
+    """
+    Build a table of the rows of a report, with the date of each day, or the label of each row of a report of another level.
+    The duration-weighted statistics of each day are added after the report columns when they were calculated.
+
+    Parameters:
+        report (Report): The report to build the table for.
+
+    Returns:
+        pd.DataFrame: The table of rows, with the columns in ROW_EXPORT_COLUMNS, followed by WEIGHTED_EXPORT_COLUMNS if they were calculated.
+    """
+
+    labels = report.labels if report.labels != None else [format_sheet_date(sheet) for sheet in report.sheets]
+    records = [[label, *row] for label, row in zip(labels, report.rows)]
+    table = pd.DataFrame(records, columns=ROW_EXPORT_COLUMNS)
+    if report.weighted is None:
+        return table
+
+    # Add the duration-weighted statistics by the number of their day, in the order of their exported columns.
+    names = [f"{name}_{statistic}" for name in WEIGHTED_VALUES for statistic in ["mean", *[f"p{percentile}" for percentile in PERCENTILES]]]
+    weighted = pd.DataFrame(report.weighted.reindex(range(1, len(report.rows) + 1))[names].to_numpy(), columns=WEIGHTED_EXPORT_COLUMNS)
+    return pd.concat([table, weighted], axis=1)
+
+def export_rows(report: Report, filename: str) -> None:
+    """
+    Export the daily rows of a report, with the date of each day.
+
+    Parameters:
+        report (Report): The report to export.
+        filename (str): The path of the file, ending in .csv, .jsonl or .parquet.
+
+    Returns:
+        None
+    """
+
+    write_table([build_row_table(report)], ROW_EXPORT_COLUMNS, filename)
+
+def build_operation_export(table: pd.DataFrame, dates: dict) -> pd.DataFrame:
+    """
+    Convert a table of operations to the exported columns, with the date of each day.
+    The times are in the format "HH:MM", and values that are not reported are empty.
+
+    Parameters:
+        table (pd.DataFrame): The table of operations, as returned by build_operation_table.
+        dates (dict): The date of each day, by the number of the day in the table.
+
+    Returns:
+        pd.DataFrame: The operations, with the columns in OPERATION_EXPORT_COLUMNS.
+    """
+
+    table = table.copy()
+    table["day"] = [dates[number] for number in table["day"]]
+    for column in ["from", "to"]:
+        table[column] = [None if math.isnan(time) else convert_time(time) for time in table[column]]
+    table.columns = OPERATION_EXPORT_COLUMNS
+    return table.astype({column: float for column in OPERATION_EXPORT_COLUMNS[4:-1]})
+
+def resolve_range(sheets: SheetIndex, start_date: str | None, start_time: str, end_date: str | None, end_time: str, dates: str | None = None) -> tuple:
+    """
+    Find the first and last sheet of a date range, and check that the range is valid.
+    If no end date is given, the last day is used, and if no start date is given, the range covers only the end date.
+
+    Parameters:
+        sheets (SheetIndex): The index of the sheets with dates, as returned by get_date_sheets.
+        start_date (str | None): The first day, as a sheet name or in the format "YYYY-MM-DD".
+        start_time (str): The start time on the first day, in the format "HH:MM".
+        end_date (str | None): The last day, as a sheet name or in the format "YYYY-MM-DD".
+        end_time (str): The end time on the last day, in the format "HH:MM".
+        dates (str | None): The date range instead of the start and end date (example: "2024-12-01..2024-12-31"), see SheetIndex.range. Default is None.
+
+    Returns:
+        tuple: The names of the first and last sheet of the range.
+
+    Raises:
+        ValueError: If a date has no sheet, or the range ends before it starts.
+    """
+
+    if dates != None:
+        start_sheet, end_sheet = sheets.range(dates)
+    else:
+        end_sheet = sheets.find(end_date) if end_date != None else sheets[-1]
+        start_sheet = sheets.find(start_date) if start_date != None else end_sheet
+    if start_sheet == None or end_sheet == None:
+        raise ValueError("No DOR found for the given date. Dates must be sheet names (2024 Dec-18) or in the format YYYY-MM-DD.")
+    if sheets.index(start_sheet) > sheets.index(end_sheet):
+        raise ValueError("Invalid date range. Please select an end date after the start date.")
+    if start_sheet == end_sheet and convert_time(start_time) > convert_time(end_time):
+        raise ValueError("Invalid time range. Please select an end time after the start time.")
+    return start_sheet, end_sheet
+
+def find_workbooks(directory: str) -> list:
+    """
+    Find the Excel files in a directory, ignoring the lock files Excel creates for open files.
 
-    # Return the parsed data.
-    return operations
+    Parameters:
+        directory (str): The directory to search.
+
+    Returns:
+        list: The paths of the Excel files, sorted by name.
+    """
+
+    workbooks = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if name.startswith("~$") or not os.path.isfile(path):
+            continue
+        if os.path.splitext(name)[1].lower() in WORKBOOK_EXTENSIONS:
+            workbooks.append(path)
+    return workbooks
+
+def get_report_filename(workbook: str, output_directory: str) -> str:
+    """
+    Get the path of the report of a workbook in batch and watch mode, which is named after the workbook.
+
+    Parameters:
+        workbook (str): The path of the Excel file.
+        output_directory (str): The directory the reports are saved in.
+
+    Returns:
+        str: The path of the report.
+    """
+
+    return os.path.join(output_directory, os.path.splitext(os.path.basename(workbook))[0] + ".docx")
+
+def batch_report(workbook: str, output_directory: str, start_date: str | None, start_time: str, end_date: str | None, end_time: str, line_restriction_maximum: int, use_cache: bool, incremental: bool = False, dates: str | None = None) -> tuple:
+    """
+    Generate and save the report of a single workbook in batch mode.
+    This is run in a worker process, so errors are returned instead of raised.
+
+    Parameters:
+        workbook (str): The path of the Excel file.
+        output_directory (str): The directory to save the report in, named after the Excel file.
+        start_date (str | None): The first day, as a sheet name or in the format "YYYY-MM-DD".
+        start_time (str): The start time on the first day, in the format "HH:MM".
+        end_date (str | None): The last day, as a sheet name or in the format "YYYY-MM-DD".
+        end_time (str): The end time on the last day, in the format "HH:MM".
+        line_restriction_maximum (int): The dynamic BP at or below which Line Restriction is reported.
+        use_cache (bool): Whether to use the cache of parsed sheets.
+        incremental (bool): Whether to reuse the stored summaries of unchanged days. Default is False.
+        dates (str | None): The date range instead of the start and end date, see resolve_range. Default is None.
+
+    Returns:
+        tuple: The path of the Excel file, the path of the saved report or None, the error message or None, and the warnings.
+    """
+
+    try:
+        with pd.ExcelFile(workbook) as data:
+            sheets = get_date_sheets(data)
+            if len(sheets) == 0:
+                raise ValueError("No DORs found.")
+            start_sheet, end_sheet = resolve_range(sheets, start_date, start_time, end_date, end_time, dates)
+            # Files are already processed in parallel, so the sheets of each file are parsed in this process.
+            report = create_report(
+                data, sheets, start_sheet, start_time, end_sheet, end_time,
+                line_restriction_maximum, 1, SheetCache() if use_cache else None,
+                DayStore(data) if incremental else None
+            )
+
+        filename = get_report_filename(workbook, output_directory)
+        write_document(report, filename)
+        return workbook, filename, None, report.diagnostics
+    except Exception as e:
+        return workbook, None, str(e) or type(e).__name__, Diagnostics.collect()
+
+def run_batch(directory: str, output_directory: str, options: argparse.Namespace) -> int:
+    """
+    Generate the reports of every workbook in a directory, across a pool of worker processes.
+    A summary of the files that succeeded and failed is printed at the end.
+
+    Parameters:
+        directory (str): The directory containing the Excel files.
+        output_directory (str): The directory to save the reports in, created if it does not exist.
+        options (argparse.Namespace): The command-line options for the date range, threshold, workers and cache.
+
+    Returns:
+        int: The exit code, EXIT_SUCCESS if every report was saved.
+    """
+
+    try:
+        workbooks = find_workbooks(directory)
+        os.makedirs(output_directory, exist_ok=True)
+    except OSError as e:
+        Logger.error(f"An error occurred while reading the directory: {e}")
+        return EXIT_FAILURE
+
+    if len(workbooks) == 0:
+        Logger.error(f"No Excel files found in '{directory}'.")
+        return EXIT_FAILURE
+
+    arguments = [
+        (workbook, output_directory, options.start_date, options.start_time, options.end_date, options.end_time, options.threshold, not options.no_cache, options.incremental, options.dates)
+        for workbook in workbooks
+    ]
+    if options.workers > 1 and len(workbooks) > 1:
+        with ProcessPoolExecutor(max_workers=min(options.workers, len(workbooks))) as executor:
+            results = list(executor.map(batch_report, *zip(*arguments)))
+    else:
+        results = [batch_report(*i) for i in arguments]
+
+    # Print the summary.
+    failures = 0
+    fprint(f"\n{Colors.BOLD}Batch summary:")
+    for workbook, filename, error, diagnostics in results:
+        warnings = f" ({len(diagnostics)} {'warning' if len(diagnostics) == 1 else 'warnings'})" if len(diagnostics) > 0 else ""
+        if error == None:
+            fprint(f"\t{Colors.GREEN}OK{Colors.RESET}      {workbook} -> {filename}{warnings}")
+        else:
+            failures += 1
+            fprint(f"\t{Colors.RED}FAILED{Colors.RESET}  {workbook}: {error}")
+    fprint(f"{len(results) - failures} of {len(results)} reports saved.")
+
+    return EXIT_SUCCESS if failures == 0 else EXIT_FAILURE
+
+def watch_report(workbook: str, output_directory: str, options: argparse.Namespace) -> tuple:
+    """
+    Generate and save the report of a changed workbook in watch mode.
+    The day summaries are always stored by the fingerprint of their sheet, so the days of unchanged sheets are reused and only the changed sheets are read.
+
+    Parameters:
+        workbook (str): The path of the Excel file.
+        output_directory (str): The directory to save the report in, named after the Excel file.
+        options (argparse.Namespace): The command-line options for the date range, threshold and cache.
+
+    Returns:
+        tuple: The path of the Excel file, the path of the saved report or None, the error message or None, and the warnings, see batch_report.
+    """
+
+    return batch_report(
+        workbook, output_directory, options.start_date, options.start_time, options.end_date, options.end_time,
+        options.threshold, not options.no_cache, True, options.dates
+    )
+
+def watch(directory: str, output_directory: str, options: argparse.Namespace) -> int:
+    """
+    Watch a directory and generate the report of each Excel file when it is added or changed, until interrupted.
+    Reports that are newer than their Excel file are not generated again on start.
+    Summaries of days are stored as in incremental mode, so only the sheets that changed are read again, see watch_report.
+
+    Parameters:
+        directory (str): The directory containing the Excel files.
+        output_directory (str): The directory to save the reports in, created if it does not exist.
+        options (argparse.Namespace): The command-line options for the date range, threshold, cache, interval and debounce time.
+
+    Returns:
+        int: The exit code, EXIT_FAILURE if the directories could not be read.
+    """
+
+    watcher = WorkbookWatcher(directory, options.debounce)
+    try:
+        os.makedirs(output_directory, exist_ok=True)
+        for workbook in find_workbooks(directory):
+            filename = get_report_filename(workbook, output_directory)
+            if os.path.isfile(filename) and os.path.getmtime(filename) >= os.path.getmtime(workbook):
+                watcher.skip(workbook)
+    except OSError as e:
+        Logger.error(f"An error occurred while reading the directory: {e}")
+        return EXIT_FAILURE
+
+    fprint(f"Watching '{directory}' for changes and saving the reports in '{output_directory}'. Press Ctrl+C to stop.")
+    try:
+        while True:
+            try:
+                ready = watcher.poll(monotonic())
+            except OSError as e:
+                # The directory may be on a network drive that is briefly unavailable, so keep watching.
+                Logger.error(f"An error occurred while reading the directory: {e}")
+                ready = []
+
+            for workbook in ready:
+                _, filename, error, diagnostics = watch_report(workbook, output_directory, options)
+                time = datetime.now().strftime("%H:%M:%S")
+                warnings = f" ({len(diagnostics)} {'warning' if len(diagnostics) == 1 else 'warnings'})" if len(diagnostics) > 0 else ""
+                if error == None:
+                    fprint(f"{time}\t{Colors.GREEN}OK{Colors.RESET}      {workbook} -> {filename}{warnings}")
+                else:
+                    fprint(f"{time}\t{Colors.RED}FAILED{Colors.RESET}  {workbook}: {error}")
+            sleep(options.interval)
+    except KeyboardInterrupt:
+        return EXIT_SUCCESS
+
+def cli(arguments: list) -> int:
+    """
+    Generate a report from the command line, without any prompts.
+    This is used when the program is run with arguments, for example from a scheduled task.
+
+    Parameters:
+        arguments (list): The command-line arguments, without the program name.
+
+    Returns:
+        int: The exit code, EXIT_SUCCESS if the report was saved.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Generate a drilling report from a DOR Excel file without any prompts. Run without arguments for the interactive mode."
+    )
+    parser.add_argument("workbook", nargs="?", help="the Drilling Operations Report Excel file")
+    parser.add_argument("--batch", metavar="DIRECTORY", help="generate a report for every Excel file in a directory instead, saving them in the output directory")
+    parser.add_argument("--watch", metavar="DIRECTORY", help="instead watch a directory, generating the report of each Excel file in the output directory whenever it changes")
+    parser.add_argument("--interval", type=float, default=WATCH_INTERVAL, help=f"the seconds between checks of the watched directory. Default is {WATCH_INTERVAL}")
+    parser.add_argument("--debounce", type=float, default=WATCH_DEBOUNCE, help=f"the seconds a changed Excel file must stay unchanged before its report is generated. Default is {WATCH_DEBOUNCE}")
+    parser.add_argument("--serve", metavar="PORT", type=int, help="instead run a local HTTP service generating reports on request, on the given port")
+    parser.add_argument("--host", default=SERVICE_HOST, help="the address the service listens on. Default is 127.0.0.1, only accepting requests from this computer")
+    parser.add_argument("--cache-size", metavar="MB", type=int, default=SERVICE_CACHE_SIZE_LIMIT // (1024 * 1024), help="the memory the service may use to keep workbooks open, in MB. Default is 512")
+    parser.add_argument("-o", "--output", help="the Word document to save the report as, or the output directory in batch mode")
+    parser.add_argument("--start-date", help="the first day, as a sheet name (2024 Dec-18) or YYYY-MM-DD. Default is the end date")
+    parser.add_argument("--start-time", default="00:00", help="the 24-hour start time (HH:MM). Default is 00:00")
+    parser.add_argument("--end-date", help="the last day, as a sheet name (2024 Dec-18) or YYYY-MM-DD. Default is the last day in the file")
+    parser.add_argument("--dates", metavar="RANGE", help="the days of the report as a range instead, for example 2024-12-01..2024-12-31. Either date can be left out, and the dates do not need a DOR of their own")
+    parser.add_argument("--end-time", default="23:59", help="the 24-hour end time (HH:MM). Default is 23:59")
+    parser.add_argument("--threshold", type=int, default=LINE_RESTRICTION_MAXIMUM, help="the maximum pressure for line restriction in kPa. Default is infinite")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="the number of worker processes used to parse sheets, or to process files in batch mode. Default is the number of CPUs")
+    parser.add_argument("--no-cache", action="store_true", help="do not use the cache of parsed sheets")
+    parser.add_argument("--incremental", action="store_true", help="reuse the summaries of days whose sheets have not changed since the last report. Ignored with --export-operations, --levels or --weighted, which need every day to be read")
+    parser.add_argument("--export-rows", metavar="FILE", help="also export the daily rows as CSV, JSON Lines or Parquet, by the file extension (.csv, .jsonl, .parquet)")
+    parser.add_argument("--export-operations", metavar="FILE", help="also export every parsed operation as CSV, JSON Lines or Parquet, by the file extension. All days are parsed, even with --incremental")
+    parser.add_argument("--levels", nargs="+", choices=REPORT_LEVELS, help="also save the report by 12-hour tour, by week and/or for the whole well, next to the output with the level added to the name. The sheets are only read once for every level")
+    parser.add_argument("--weighted", action="store_true", help="also export the duration-weighted mean and P10/P50/P90 of the ECD, ESD, mud weight, pump rate and dynamic BP of each day with the rows. Needs --export-rows")
+    parser.add_argument("--statistics", action="store_true", help="also print the minimum, maximum and mean of the reported values over the range")
+    parser.add_argument("--profile", action="store_true", help="print the time spent in each stage and counts of what was processed")
+    parser.add_argument("--trace", metavar="FILE", help="also save the timings as a JSON trace, viewable in chrome://tracing or Perfetto. Implies --profile")
+    options = parser.parse_args(arguments)
+
+    # Validate the arguments.
+    if [options.workbook, options.batch, options.watch, options.serve].count(None) != 3:
+        parser.print_usage()
+        Logger.error("Please give either an Excel file, a directory with --batch or --watch, or a port with --serve.")
+        return EXIT_USAGE
+    if options.serve != None:
+        if options.cache_size < 0:
+            Logger.error("The cache size must be a number greater than zero.")
+            return EXIT_USAGE
+        return serve(options.host, options.serve, options.cache_size * 1024 * 1024, options.workers)
+    if options.output == None:
+        parser.print_usage()
+        Logger.error("Please give the file or directory to save to with --output.")
+        return EXIT_USAGE
+    if options.threshold < 0:
+        Logger.error("Maximum pressure must be a number greater than zero.")
+        return EXIT_USAGE
+    if options.dates != None and (options.start_date != None or options.end_date != None):
+        Logger.error("Please give either --dates or --start-date and --end-date.")
+        return EXIT_USAGE
+    for time in [options.start_time, options.end_time]:
+        if not validate_time(time):
+            Logger.error(f"Invalid time '{time}'. Please enter the time in the 24-hour time format 'HH:MM'.")
+            return EXIT_USAGE
+
+    for export in [options.export_rows, options.export_operations]:
+        if export != None and os.path.splitext(export)[1].lower() not in EXPORT_FORMATS:
+            Logger.error(f"Unsupported export file '{export}'. Please use one of {', '.join(EXPORT_FORMATS)}.")
+            return EXIT_USAGE
+
+    if options.weighted and options.export_rows == None:
+        Logger.error("Weighted statistics are exported with the rows. Please also give --export-rows.")
+        return EXIT_USAGE
+
+    if options.batch != None or options.watch != None:
+        if options.export_rows != None or options.export_operations != None:
+            Logger.error("Exports are not available in batch or watch mode.")
+            return EXIT_USAGE
+        if options.profile or options.trace != None:
+            Logger.error("Profiling is not available in batch or watch mode.")
+            return EXIT_USAGE
+        if options.statistics or options.levels != None or options.weighted:
+            Logger.error("Statistics, levels and weighted statistics are not available in batch or watch mode.")
+            return EXIT_USAGE
+        if options.batch != None:
+            return run_batch(options.batch, options.output, options)
+        if options.interval <= 0 or options.debounce < 0:
+            Logger.error("The interval must be greater than zero, and the debounce time cannot be negative.")
+            return EXIT_USAGE
+        return watch(options.watch, options.output, options)
+
+    if not options.profile and options.trace == None:
+        return report_workbook(options)
+
+    # Profile the report, and show the results even if it failed.
+    Profiler.enabled = True
+    try:
+        with Profiler.stage("total"):
+            return report_workbook(options)
+    finally:
+        Profiler.summary()
+        if options.trace != None:
+            try:
+                Profiler.save(options.trace)
+                fprint(f"Trace saved as {options.trace}.")
+            except OSError as e:
+                Logger.error(f"An error occurred while saving the trace: {e}")
+
+def report_workbook(options: argparse.Namespace) -> int:
+    """
+    Generate the report of a single Excel file from the command-line options, and save it with its exports.
+
+    Parameters:
+        options (argparse.Namespace): The command-line options, as parsed by cli.
+
+    Returns:
+        int: The exit code, EXIT_SUCCESS if the report was saved.
+    """
+
+    # Load the Excel file, and close it once the report is saved, so it can be saved over again.
+    try:
+        with Profiler.stage("open"):
+            data = pd.ExcelFile(options.workbook)
+    except Exception as e:
+        Logger.error(f"An error occurred while loading the Excel file: {e}")
+        return EXIT_FAILURE
+
+    try:
+        return save_workbook_report(data, options)
+    finally:
+        data.close()
+
+def save_workbook_report(data: pd.ExcelFile, options: argparse.Namespace) -> int:
+    """
+    Generate the report of an open Excel file from the command-line options, and save it with its exports.
+
+    Parameters:
+        data (pd.ExcelFile): The Excel file.
+        options (argparse.Namespace): The command-line options, as parsed by cli.
+
+    Returns:
+        int: The exit code, EXIT_SUCCESS if the report was saved.
+    """
+
+    # Get the sheets with dates.
+    sheets = get_date_sheets(data)
+    if len(sheets) == 0:
+        Logger.error("No DORs found. Please check the Excel file and try again.")
+        return EXIT_FAILURE
+
+    # Find the sheets of the date range.
+    try:
+        start_sheet, end_sheet = resolve_range(sheets, options.start_date, options.start_time, options.end_date, options.end_time, options.dates)
+    except ValueError as e:
+        Logger.error(str(e))
+        return EXIT_USAGE
+
+    # Stored summaries do not have the operations, tours or weighted statistics of their days, so every day is read when they are needed.
+    incremental = options.incremental
+    if incremental:
+        needed = [option for option, value in [("--export-operations", options.export_operations != None), ("--levels", options.levels != None), ("--weighted", options.weighted)] if value]
+        if len(needed) > 0:
+            Logger.warn(f"--incremental is ignored with {' and '.join(needed)}, so every day is read.")
+            incremental = False
+
+    # The operations are written while the days are parsed, so the file is opened first.
+    operations = None
+    if options.export_operations != None:
+        try:
+            operations = TableWriter(options.export_operations, OPERATION_EXPORT_COLUMNS)
+        except (ValueError, OSError) as e:
+            Logger.error(f"An error occurred while exporting to {options.export_operations}: {e}")
+            return EXIT_FAILURE
+
+    # Create the report and save it.
+    try:
+        with Profiler.stage("report"):
+            report = create_report(
+                data, sheets, start_sheet, options.start_time, end_sheet, options.end_time,
+                options.threshold, options.workers, None if options.no_cache else SheetCache(),
+                DayStore(data) if incremental else None,
+                operations, options.levels, options.weighted
+            )
+        if operations != None:
+            operations.close()
+    except (ValueError, OSError) as e:
+        Diagnostics.flush()
+        Logger.error(f"An error occurred while generating the report: {e}")
+        # A partial export would look complete, so it is removed.
+        if operations != None:
+            operations.close()
+            os.remove(options.export_operations)
+        return EXIT_FAILURE
+    Diagnostics.summary(report.diagnostics)
+
+    filename = options.output
+    if not filename.endswith(".docx"):
+        filename += ".docx"
+    try:
+        with Profiler.stage("render"):
+            write_document(report, filename)
+    except Exception as e:
+        Logger.error(f"An error occurred while saving the report: {e}")
+        return EXIT_FAILURE
+
+    fprint(f"Report saved as {filename}.")
+
+    # Save the other levels of the report, with their rows if the rows are exported.
+    for level, level_report in report.levels.items():
+        level_filename = f"{os.path.splitext(filename)[0]}-{level}.docx"
+        try:
+            with Profiler.stage("render"):
+                write_document(level_report, level_filename)
+            if options.export_rows != None:
+                root, extension = os.path.splitext(options.export_rows)
+                with Profiler.stage("export"):
+                    export_rows(level_report, f"{root}-{level}{extension}")
+        except Exception as e:
+            Logger.error(f"An error occurred while saving the {level} report: {e}")
+            return EXIT_FAILURE
+        fprint(f"Report by {level} saved as {level_filename}.")
 
-def get_range_depth(data: list) -> Range:
+    # Print the statistics of the whole range.
+    if options.statistics and len(report.statistics) > 0:
+        fprint(f"\n{Colors.BOLD}Statistics for {report.date_range}:")
+        for line in format_statistics(RangeStatistics(report.statistics).query(0, len(report.statistics) - 1)):
+            fprint(f"\t{line}")
+
+    # Export the rows, if requested. The operations were already exported with the report.
+    if options.export_rows != None:
+        try:
+            with Profiler.stage("export"):
+                export_rows(report, options.export_rows)
+        except Exception as e:
+            Logger.error(f"An error occurred while exporting to {options.export_rows}: {e}")
+            return EXIT_FAILURE
+        fprint(f"Exported to {options.export_rows}.")
+    if options.export_operations != None:
+        fprint(f"Exported to {options.export_operations}.")
+
+    return EXIT_SUCCESS
+
+def service_report(cache: WorkbookCache, parameters: dict, workers: int = WORKERS) -> tuple:
+    """
+    Generate a report for a request to the report service.
+    The workbook and its parsed sheets are taken from the cache when possible, and added to it otherwise.
+
+    Parameters:
+        cache (WorkbookCache): The cache of open workbooks.
+        parameters (dict): The parameters of the request. "workbook" is the path of the Excel file, and is required.
+            "start_date", "start_time", "end_date", "end_time", "dates" and "threshold" are the same as the command-line options.
+            "format" is one of "docx" (default), "json" or "csv", and "level" one of "day" (default), "tour", "week" or "well".
+            "weighted" adds the duration-weighted statistics of each day to the rows of a daily json or csv report when true.
+        workers (int): The maximum number of worker processes used to parse sheets. Default is the number of CPUs.
+
+    Returns:
+        tuple: The body of the response, its content type and the number of warnings.
+
+    Raises:
+        FileNotFoundError: If the workbook does not exist.
+        ValueError: If a parameter is invalid, or the report cannot be generated.
+    """
+
+    # Validate the parameters.
+    workbook = parameters.get("workbook")
+    if workbook in [None, ""]:
+        raise ValueError("Please give the path of the Excel file as 'workbook'.")
+    output_format = str(parameters.get("format", "docx")).lower()
+    if output_format not in SERVICE_FORMATS:
+        raise ValueError(f"Unsupported format '{output_format}'. Please use one of {', '.join(SERVICE_FORMATS)}.")
+    level = str(parameters.get("level", "day")).lower()
+    if level != "day" and level not in REPORT_LEVELS:
+        raise ValueError(f"Unsupported level '{level}'. Please use one of day, {', '.join(REPORT_LEVELS)}.")
+    weighted = str(parameters.get("weighted", "false")).lower() in ["true", "1", "yes"]
+    if weighted and (level != "day" or output_format == "docx"):
+        raise ValueError("Weighted statistics are only available for the daily rows, as json or csv.")
+    start_time = str(parameters.get("start_time", "00:00"))
+    end_time = str(parameters.get("end_time", "23:59"))
+    for time in [start_time, end_time]:
+        if not validate_time(time):
+            raise ValueError(f"Invalid time '{time}'. Please enter the time in the 24-hour time format 'HH:MM'.")
+    try:
+        threshold = int(parameters.get("threshold", LINE_RESTRICTION_MAXIMUM))
+    except (TypeError, ValueError):
+        raise ValueError("Maximum pressure must be a number greater than zero.")
+    if threshold < 0:
+        raise ValueError("Maximum pressure must be a number greater than zero.")
+
+    # Open the workbook, unless it is already open, and create the report.
+    workbook = str(workbook)
+    if not os.path.isfile(workbook):
+        raise FileNotFoundError(2, "No such file", workbook)
+    data, sheets = cache.open(workbook)
+    if len(sheets) == 0:
+        raise ValueError("No DORs found. Please check the Excel file and try again.")
+    start_date = parameters.get("start_date")
+    end_date = parameters.get("end_date")
+    dates = parameters.get("dates")
+    start_sheet, end_sheet = resolve_range(
+        sheets, None if start_date == None else str(start_date), start_time,
+        None if end_date == None else str(end_date), end_time, None if dates == None else str(dates)
+    )
+    try:
+        report = create_report(data, sheets, start_sheet, start_time, end_sheet, end_time, threshold, workers, cache, levels=None if level == "day" else [level], weighted=weighted)
+    except ValueError:
+        Diagnostics.collect()
+        raise
+    warnings = Diagnostics.describe(report.diagnostics)
+    if level != "day":
+        report = report.levels[level]
+
+    # Render the report in the requested format.
+    if output_format == "json":
+        table = build_row_table(report)
+        body = json.dumps({
+            "date_range": report.date_range,
+            "maximum_depth": {"value": report.maximum_depth.value, "unit": report.maximum_depth.unit},
+            "columns": list(table.columns),
+            "rows": [[None if type(value) == float and math.isnan(value) else value for value in row] for row in table.values.tolist()],
+            "warnings": warnings
+        }).encode("utf-8")
+    elif output_format == "csv":
+        body = build_row_table(report).to_csv(index=False).encode("utf-8")
+    else:
+        file = BytesIO()
+        write_document(report, file)
+        body = file.getvalue()
+    return body, SERVICE_FORMATS[output_format], len(warnings)
+
+def service_statistics(cache: WorkbookCache, parameters: dict, workers: int = WORKERS) -> bytes:
     """
-    Get the range of depths from a list of a list of operations.
+    Get the statistics of a range of days for a request to the report service.
+    The statistics of every day are calculated once per workbook, so any range is answered without reading its operations again.
 
     Parameters:
-        data (list): The 2D list of operations to get the range from. This is a list of days, each containing a list of operations.
+        cache (WorkbookCache): The cache of open workbooks.
+        parameters (dict): The parameters of the request. "workbook" is the path of the Excel file, and is required.
+            "start_date", "end_date" and "dates" are the same as the command-line options.
+        workers (int): The maximum number of worker processes used to parse sheets. Default is the number of CPUs.
 
     Returns:
-        Range: The range of depths.
+        bytes: The body of the response, a JSON object with the first and last day, the number of days and the statistics.
+
+    Raises:
+        FileNotFoundError: If the workbook does not exist.
+        ValueError: If a parameter is invalid, or the statistics cannot be calculated.
+    """
+
+    workbook = parameters.get("workbook")
+    if workbook in [None, ""]:
+        raise ValueError("Please give the path of the Excel file as 'workbook'.")
+    workbook = str(workbook)
+    if not os.path.isfile(workbook):
+        raise FileNotFoundError(2, "No such file", workbook)
+
+    statistics = cache.statistics(workbook, workers)
+    _, sheets = cache.open(workbook)
+    start_date = parameters.get("start_date")
+    end_date = parameters.get("end_date")
+    dates = parameters.get("dates")
+    start_sheet, end_sheet = resolve_range(
+        sheets, None if start_date == None else str(start_date), "00:00",
+        None if end_date == None else str(end_date), "23:59", None if dates == None else str(dates)
+    )
+    first = sheets.index(start_sheet)
+    last = sheets.index(end_sheet)
+    return json.dumps({
+        "first": format_sheet_date(start_sheet),
+        "last": format_sheet_date(end_sheet),
+        "days": last - first + 1,
+        "statistics": statistics.query(first, last)
+    }).encode("utf-8")
+
+def serve(host: str, port: int, cache_size: int, workers: int = WORKERS) -> int:
     """
+    Run the report service until it is interrupted.
 
-    # Initialize the depth list.
-    depths = []
+    Parameters:
+        host (str): The address to listen on.
+        port (int): The port to listen on.
+        cache_size (int): The maximum memory the cache of open workbooks may use, in bytes.
+        workers (int): The maximum number of worker processes used to parse sheets. Default is the number of CPUs.
 
-    # Iterate over the operations and extract the depths.
-    for day in data:
-            for operation in day:
-                if operation.get_depth() != None and type(operation.get_depth()) == Value:
-                    depths.append(operation.get_depth().value)
+    Returns:
+        int: The exit code, EXIT_FAILURE if the service could not be started.
+    """
 
-    # Calculate the minimum and maximum depths.
-    depth_minimum = min(depths)
-    depth_maximum = max(depths)
+    try:
+        server = ReportService((host, port), WorkbookCache(cache_size), workers)
+    except OSError as e:
+        Logger.error(f"Could not start the report service: {e}")
+        return EXIT_FAILURE
 
-    # Return the range of depths.
-    return Range(Value(depth_minimum, "m"), Value(depth_maximum, "m"))
+    fprint(f"Serving reports on http://{host}:{server.server_address[1]}/report. Press Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return EXIT_SUCCESS
 
 
 # MAIN FUNCTION
@@ -593,6 +4087,13 @@ def main() -> None:
     # Open a file dialog to select the Excel file.
     fprint("Opening file dialog to select the Drilling Operations Report Excel file...")
     fprint("Any messages printed after this are for debugging purposes and can be ignored.\n")
+    try:
+        import tkinter as tk
+        from tkinter import filedialog
+    except ImportError:
+        Logger.error("The file dialogs need tkinter, which is not installed. Please reinstall Python with tcl/tk included, or use the command line mode.")
+        pause()
+        quit()
     root = tk.Tk()
     root.withdraw()
     filename = filedialog.askopenfilename(
@@ -621,16 +4122,11 @@ def main() -> None:
     generate(data)
 
 def generate(data: pd.ExcelFile) -> None:
-    # Get sheet names, and filter only the sheets with dates matching the format (example: "2024 Dec-18").
-    sheet_names = data.sheet_names
-    sheets = []
-    for i in sheet_names:
-        try:
-            datetime.strptime(i, '%Y %b-%d')
-            sheets.append(i)
-        except ValueError:
-            continue
-        
+    from tkinter import filedialog
+
+    # Get the sheets with dates matching the format (example: "2024 Dec-18").
+    sheets = get_date_sheets(data)
+
     # Check if there are any sheets with dates.
     if len(sheets) == 0:
         # Print error message and return if no sheets are found.
@@ -647,17 +4143,14 @@ def generate(data: pd.ExcelFile) -> None:
         # Get the start date.
         while True:
             clear()
-            fprint(f"{Colors.BOLD}Please input the number next to the day you'd like to start at:")
-            for index, sheet in enumerate(sheets):
-                fprint(f"\t{Colors.BOLD}{index + 1}. {Colors.RESET}{sheet}")
+            fprint(f"{Colors.BOLD}Please input the number next to the day you'd like to start at, or its date (YYYY-MM-DD):")
+            for entry in get_sheet_listing(sheets):
+                fprint(f"\t{Colors.BOLD}{entry[0]}. {Colors.RESET}{entry[1]}" if entry != None else "\t...")
             try:
-                option = int(input("> "))
-                if option < 1 or option > len(sheets):
-                    raise ValueError
-                start_sheet = sheets[option - 1]
+                start_sheet = choose_sheet(sheets, input("> "))
                 break
             except ValueError:
-                Logger.error("Invalid input. Please enter a valid number.")
+                Logger.error("Invalid input. Please enter a valid number or date.")
                 pause()
 
         # Get the start time.
@@ -681,17 +4174,14 @@ def generate(data: pd.ExcelFile) -> None:
             clear()
             fprint(f"{Colors.BOLD}Selected start date: {Colors.RESET}{start_sheet}")
             fprint(f"{Colors.BOLD}Selected start time: {Colors.RESET}{start_time}")
-            fprint(f"{Colors.BOLD}Please input the number next to the day you'd like to end at:")
-            for index, sheet in enumerate(sheets):
-                fprint(f"\t{index + 1}. {sheet}")
+            fprint(f"{Colors.BOLD}Please input the number next to the day you'd like to end at, or its date (YYYY-MM-DD):")
+            for entry in get_sheet_listing(sheets):
+                fprint(f"\t{entry[0]}. {entry[1]}" if entry != None else "\t...")
             try:
-                option = int(input("> "))
-                if option < 1 or option > len(sheets):
-                    raise ValueError
-                end_sheet = sheets[option - 1]
+                end_sheet = choose_sheet(sheets, input("> "))
                 break
             except ValueError:
-                Logger.error("Invalid input. Please enter a valid number.")
+                Logger.error("Invalid input. Please enter a valid number or date.")
                 pause()
 
         # Get the end time.
@@ -737,38 +4227,12 @@ def generate(data: pd.ExcelFile) -> None:
     fprint(f"{Colors.BOLD}Selected end time: {Colors.RESET}{end_time}")
     fprint()
 
-    # Get the data from the selected sheets.
-    start_index = sheets.index(start_sheet)
-    end_index = sheets.index(end_sheet)
-    days = []
-    for i in range(start_index, end_index + 1):
-        days.append(parse_sheet(data.parse(sheets[i], dtype=str)))
-
-    # Filter the data based on the start and end times.
-    start_time = convert_time(start_time)
-    if end_time == "23:59":
-        end_time = 1
-    else:
-        end_time = convert_time(end_time)
-    if end_time == 0:
-        end_time = 1
-
-    for operation in days[0].copy():
-        if operation.get_from() < start_time:
-            days[0].remove(operation)
-
-    for operation in days[-1].copy():
-        if operation.get_to() > end_time:
-            days[-1].remove(operation)
-
-
     # Ask for line restriction threshold.
-    
     while True:
         try:
             line_restriction_maximum_input = input("Define maximum pressure for line restriction (leave blank for infinite, meaning it will always say Line Restriction): ")
             if line_restriction_maximum_input == "":
-                line_restriction_maximum = 999999999
+                line_restriction_maximum = LINE_RESTRICTION_MAXIMUM
                 break
             line_restriction_maximum = int(line_restriction_maximum_input)
             if line_restriction_maximum < 0:
@@ -778,262 +4242,19 @@ def generate(data: pd.ExcelFile) -> None:
             Logger.error("Maximum pressure must be a number greater than zero.")
             pause()
 
+    # Create the report.
+    try:
+        report = create_report(data, sheets, start_sheet, start_time, end_sheet, end_time, line_restriction_maximum, cache=SheetCache())
+    except ValueError as e:
+        Diagnostics.flush()
+        Logger.error(f"An error occurred while generating the report: {e}")
+        pause()
+        return
 
-    # Get the calculated data.
-    rows = []
-    last_depth = None
-    for index, day in enumerate(days, start=1):
-        # Initialize the data lists.
-        depths = []
-        mud_weights = []
-        pump_rates = []
-        dynamic_bps = []
-        static_bps = []
-        ecds = []
-        esds = []
-        gases = []
-
-        # Iterate over the operations and extract the data.
-        for operation in day:
-            depths.append(operation.get_depth())
-            mud_weights.append(operation.get_mud_weight())
-            if type(operation) == Drilling:
-                pump_rates.append(operation.get_pump_rate())
-                ecds.append(operation.get_ecd())
-                dynamic_bps.append(operation.get_dynamic_bp())
-            elif type(operation) == Connection:
-                esds.append(operation.get_esd())
-                gases.append(operation.get_gas())
-                static_bp = operation.get_static_bp()
-                if type(static_bp) == Value:
-                    static_bps.append(static_bp)
-                elif type(static_bp) == Range:
-                    static_bps.append(static_bp.start)
-                    static_bps.append(static_bp.end)
-
-        # Calcualte minimum and maximum values for depth.
-        try:
-            clean_depths = [i.value for i in depths if i != None]
-            if len(clean_depths) < len(depths):
-                Logger.warn(f"Depths data incomplete for Day #{index}.")
-            depth_minimum = min(clean_depths) if last_depth == None else last_depth
-            depth_maximum = max(clean_depths)
-            depth = f"{depth_minimum:.0f} – {depth_maximum:.0f}"
-            if depth_minimum == depth_maximum:
-                depth = f"{depth_minimum:.0f}"
-            last_depth = depth_maximum
-        except:
-            Logger.warn(f"No depth reported for Day #{index}.")
-            depth = "No depth reported"
-
-        # Calculate minimum and maximum values for mud weight.
-        try:
-            clean_mud_weights = [i.value for i in mud_weights if i != None]
-            if len(clean_mud_weights) < len(mud_weights):
-                Logger.warn(f"Mud weight data incomplete for Day #{index}.")
-            mud_weight_minimum = min(clean_mud_weights)
-            mud_weight_maximum = max(clean_mud_weights)
-            mud_weight = f"{mud_weight_minimum:.0f} – {mud_weight_maximum:.0f}"
-            if mud_weight_minimum == mud_weight_maximum:
-                mud_weight = f"{mud_weight_minimum:.0f}"
-        except:
-            Logger.warn(f"No mud weight reported for Day #{index}.")
-            mud_weight = "No mud weight reported"
-
-        # Calculate minimum and maximum values for pump rate.
-        try:
-            clean_pump_rates = [i.value for i in pump_rates if i != None]
-            if len(clean_pump_rates) < len(pump_rates):
-                Logger.warn(f"Pump rate data incomplete for Day #{index}.")
-            pump_rate_minimum = min(clean_pump_rates)
-            pump_rate_maximum = max(clean_pump_rates)
-            pump_rate = f"{round(pump_rate_minimum, 2)} – {round(pump_rate_maximum, 2)}"
-            if pump_rate_minimum == pump_rate_maximum:
-                pump_rate = f"{round(pump_rate_minimum, 2)}"
-        except:
-            Logger.warn(f"No pump rate reported for Day #{index}.")
-            pump_rate = "No pump rate reported"
-
-        # Calculate minimum and maximum values for dynamic BP.
-        # If no values are reported, Line Restriction will be used.
-        # If no value is above the maximum threshold, Line Restriction will be used.
-        try:
-            clean_dynamic_bps = [i.value for i in dynamic_bps if i != None]
-            if len(clean_dynamic_bps) < len(dynamic_bps):
-                Logger.warn(f"Dynamic BP data incomplete for Day #{index}.")
-            if len(clean_dynamic_bps) == 0:
-                dynamic_bp = "Line Restriction"
-            else:
-                dynamic_bp_minimum = min(clean_dynamic_bps)
-                dynamic_bp_maximum = max(clean_dynamic_bps)
-                if dynamic_bp_maximum > line_restriction_maximum:
-                    dynamic_bp_minimum = min([i for i in clean_dynamic_bps if i > line_restriction_maximum])
-                    dynamic_bp_maximum = max([i for i in clean_dynamic_bps if i > line_restriction_maximum])
-
-                    dynamic_bp = f"{dynamic_bp_minimum:.0f} – {dynamic_bp_maximum:.0f}"
-                    if dynamic_bp_minimum == dynamic_bp_maximum:
-                        dynamic_bp = f"{dynamic_bp_minimum:.0f}"
-                else:
-                    dynamic_bp = "Line Restriction"
-        except:
-            Logger.warn(f"No dynamic BP reported for Day #{index}.")
-            dynamic_bp = "Line Restriction"
-
-        # Calculate minimum and maximum values for static BP.
-        try:
-            clean_static_bps = [i.value for i in static_bps if i != None]
-            if len(clean_static_bps) < len(static_bps):
-                Logger.warn(f"Static BP data incomplete for Day #{index}.")
-            static_bp_minimum = min(clean_static_bps)
-            static_bp_maximum = max(clean_static_bps)
-
-            if static_bp_minimum == 0 and static_bp_maximum != 0:
-                static_bp_minimum = min([i for i in clean_static_bps if i != 0])
-
-            static_bp = f"{static_bp_minimum:.0f} – {static_bp_maximum:.0f}"
-            if static_bp_minimum == 0 and static_bp_maximum == 0:
-                static_bp = "No BP"
-            elif static_bp_minimum == static_bp_maximum:
-                static_bp = f"{static_bp_minimum:.0f}"
-        except:
-            Logger.warn(f"No static BP reported for Day #{index}.")
-            static_bp = "No static BP reported"
-        
-        # Calculate average ECD and ESD.
-        try:
-            clean_ecds = [i.value for i in ecds if i != None]
-            clean_esds = [i.value for i in esds if i != None]
-            if len(clean_ecds) < len(ecds):
-                Logger.warn(f"ECD data incomplete for Day #{index}.")
-            if len(clean_esds) < len(esds):
-                Logger.warn(f"ESD data incomplete for Day #{index}.")
-            ecd_average = round(sum(clean_ecds) / len(clean_ecds)) if len(clean_ecds) > 0 else "--" 
-            esd_average = round(sum(clean_esds) / len(clean_esds)) if len(clean_esds) > 0 else "--"
-            ecd_esd_average = f"{ecd_average}/{esd_average}"
-        except:
-            Logger.warn(f"No ESD/ECD reported for Day #{index}.")
-            ecd_esd_average = "No ESD/ECD reported"
-
-        # Calculate maximum value for gas.
-        # Gas is unit sensitive, so maximum is calculated differently.
-        try:
-            if len(gases) > 0:
-                gas_units = {}
-                for gas in gases:
-                    if gas.unit not in gas_units:
-                        gas_units[gas.unit] = []
-                    gas_units[gas.unit].append(gas.value)
-                
-                unit = ""
-                if any("KSCM/Day B/U" == i.unit for i in gases):
-                    unit = "KSCM/Day B/U"
-                elif any("ShakerGas B/U" == i.unit for i in gases):
-                    unit = "ShakerGas B/U"
-                else:
-                    unit = "(unit not recognized)"
-
-                gas_maximum = max(gas_units[unit])
-                if gas_maximum == 0:
-                    gas = "No B/U gas reported"
-                else:
-                    gas = f"Max {gas_maximum:.1f} {unit} reported"
-            else:
-                gas = "No B/U gas reported"
-        except Exception as e:
-            Logger.warn(f"No gas reported for Day #{index}.")
-            gas = "No B/U gas reported"
-
-        row = [depth, mud_weight, pump_rate, dynamic_bp, static_bp, ecd_esd_average, gas]
-        rows.append(row)
-
-        
+    Diagnostics.summary(report.diagnostics)
     fprint(f"\n{Colors.BOLD}If you see any warnings, you may ignore them if the data is not reported in the DOR.")
     pause()
 
-    # Format the date range.
-    start_date = datetime.strptime(start_sheet, '%Y %b-%d')
-    end_date = datetime.strptime(end_sheet, '%Y %b-%d')
-    if start_date == end_date:
-        date_range = f"{start_date.strftime('%b')} {start_date.day}, {start_date.year}"
-    elif start_date.month == end_date.month and start_date.year == end_date.year:
-        date_range = f"{start_date.strftime('%b')} {start_date.day} - {end_date.day}, {start_date.year}"
-    elif start_date.year == end_date.year:
-        date_range = f"{start_date.strftime('%b')} {start_date.day} - {end_date.strftime('%b')} {end_date.day}, {start_date.year}"
-    else:
-        date_range = f"{start_date.strftime('%b')} {start_date.day}, {start_date.year} - {end_date.strftime('%b')} {end_date.day}, {end_date.year}"
-    
-    # Fetch maximum depth for the range.
-    maximum_depth = get_range_depth(days).end
-
-    # Create a Word document to write the report to.
-    document = Document()
-    document.sections[0].left_margin = Cm(1.27)
-    document.sections[0].right_margin = Cm(1.27)
-    document.sections[0].top_margin = Cm(1.27)
-    document.sections[0].bottom_margin = Cm(1.27)
-    date_range_paragraph = document.add_paragraph(f"{date_range} | Drilling to {maximum_depth.value:.0f} {maximum_depth.unit}MD")
-    run = date_range_paragraph.runs[0]
-    run.font.size = Pt(9)
-    run.font.name = 'Clear Sans'
-    table = document.add_table(rows=1 + len(days), cols=7)
-    
-    table_style = """
-    <w:tblBorders xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
-        <w:top w:val="single" w:sz="4" w:space="0" w:color="999999"/>
-        <w:left w:val="single" w:sz="4" w:space="0" w:color="999999"/>
-        <w:bottom w:val="single" w:sz="4" w:space="0" w:color="999999"/>
-        <w:right w:val="single" w:sz="4" w:space="0" w:color="999999"/>
-        <w:insideH w:val="single" w:sz="4" w:space="0" w:color="999999"/>
-        <w:insideV w:val="single" w:sz="4" w:space="0" w:color="999999"/>
-    </w:tblBorders>
-    """
-
-    # Apply border style to the table.
-    table_borders = parse_xml(table_style)
-    table._tblPr.addnext(table_borders)
-
-
-    header_cells = table.rows[0].cells
-    headers = [
-        "Drilling Interval (mMD)",
-        "Mud Weight (kg/m³)",
-        "Pump Rate (m³/min)",
-        "Dynamic BP (kPa)",
-        "Static BP (kPa)",
-        "Avg ECD/ESD (kg/m³)",
-        "Comments"
-    ]
-
-    for index, header in enumerate(header_cells):
-        header_paragraph = header.paragraphs[0]
-        header_paragraph.text = headers[index]
-        header_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-        header.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-        header_paragraph.runs[0].font.size = Pt(10)
-        header_paragraph.runs[0].font.name = 'Oswald'
-        header_paragraph.runs[0].font.color.rgb = RGBColor(0xFF, 0xFF, 0xFF)
-        element = parse_xml(r'<w:shd {} w:fill="2D2F3E"/>'.format(nsdecls('w')))
-        header._tc.get_or_add_tcPr().append(element)
-
-    # Set row data.
-    column_widths = [2.72, 2.22, 2, 2.25, 2.25, 2.5, 5.11]
-    for i, row in enumerate(rows, start=1):
-        cells = table.rows[i].cells
-        for j, value in enumerate(row):
-            row_paragraph = cells[j].paragraphs[0]
-            row_paragraph.text = value
-            row_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-            cells[j].vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            row_paragraph.runs[0].font.size = Pt(9)
-            row_paragraph.runs[0].font.name = 'Clear Sans'
-            cells[j].width = Cm(column_widths[j])
-            if i % 2 == 0:
-                element = parse_xml(r'<w:shd {} w:fill="CCCCCC"/>'.format(nsdecls('w')))
-                cells[j]._tc.get_or_add_tcPr().append(element)  
-            else:
-                element = parse_xml(r'<w:shd {} w:fill="FFFFFF"/>'.format(nsdecls('w')))
-                cells[j]._tc.get_or_add_tcPr().append(element)
-
     # Print success message and open the file dialog to save the report.
     while True:
         try:
@@ -1058,7 +4279,7 @@ def generate(data: pd.ExcelFile) -> None:
             if not filename.endswith(".docx"):
                 filename += ".docx"
 
-            document.save(filename)
+            write_document(report, filename)
 
             # Print success message and exit the program.
             fprint(f"\n{Colors.BOLD}Report saved successfully!")
@@ -1091,4 +4312,6 @@ def generate(data: pd.ExcelFile) -> None:
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(cli(sys.argv[1:]))
     main()
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""
+Shared fixtures for the tests of the drilling report parser.
+The tests use synthetic workbooks generated by benchmark.py, in temporary directories.
+"""
+
+
+# IMPORTS
+import os
+import re
+import sys
+import tempfile
+import zipfile
+import pytest
+
+# The caches and stores are kept under the home directory, so it is replaced before main is imported, and the tests never touch the user's.
+HOME = tempfile.mkdtemp(prefix="drilling_report_parser_tests_")
+os.environ["HOME"] = HOME
+os.environ["USERPROFILE"] = HOME
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import benchmark
+
+
+# CONSTANTS
+
+INLINE_STRING_CELL = re.compile(r'<c ([^>]*?)t="inlineStr"([^>]*)><is><t([^>]*)>(.*?)</t></is></c>', re.DOTALL)
+SHARED_STRINGS_RELATIONSHIP = '<Relationship Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" Target="sharedStrings.xml" Id="rIdSharedStrings"/>'
+SHARED_STRINGS_OVERRIDE = '<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+
+
+# UTILITY FUNCTIONS
+
+def rewrite_archive(filename: str, function) -> None:
+    """
+    Rewrite the parts of a workbook archive, keeping the bytes of the parts that are not changed.
+
+    Parameters:
+        filename (str): The path of the workbook.
+        function (function): Called with a dictionary of the parts by path, and changes it in place.
+
+    Returns:
+        None
+    """
+
+    with zipfile.ZipFile(filename) as archive:
+        parts = {info.filename: archive.read(info.filename) for info in archive.infolist()}
+    function(parts)
+    with zipfile.ZipFile(filename, "w", zipfile.ZIP_DEFLATED) as archive:
+        for path, content in parts.items():
+            archive.writestr(path, content)
+
+def share_strings(parts: dict) -> None:
+    """
+    Move the inline strings of every sheet into a shared strings part, the way Excel saves text cells.
+    openpyxl only writes inline strings, so this is needed to test workbooks saved by Excel.
+
+    Parameters:
+        parts (dict): The parts of the archive by path, changed in place.
+
+    Returns:
+        None
+    """
+
+    strings = []
+    def share(match):
+        strings.append(f"<si><t{match.group(3)}>{match.group(4)}</t></si>")
+        return f'<c {match.group(1)}t="s"{match.group(2)}><v>{len(strings) - 1}</v></c>'
+
+    for path in sorted(parts):
+        if path.startswith("xl/worksheets/"):
+            parts[path] = INLINE_STRING_CELL.sub(share, parts[path].decode("utf-8")).encode("utf-8")
+    parts["xl/sharedStrings.xml"] = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" count="{len(strings)}" uniqueCount="{len(strings)}">'
+        + "".join(strings) + "</sst>"
+    ).encode("utf-8")
+    parts["xl/_rels/workbook.xml.rels"] = parts["xl/_rels/workbook.xml.rels"].replace(b"</Relationships>", SHARED_STRINGS_RELATIONSHIP.encode("utf-8") + b"</Relationships>")
+    parts["[Content_Types].xml"] = parts["[Content_Types].xml"].replace(b"</Types>", SHARED_STRINGS_OVERRIDE.encode("utf-8") + b"</Types>")
+
+
+# FIXTURES
+
+@pytest.fixture
+def workbook(tmp_path) -> str:
+    """
+    A synthetic workbook of 8 days with 20 operations each.
+    """
+
+    filename = str(tmp_path / "workbook.xlsx")
+    benchmark.generate_workbook(filename, 8, 20)
+    return filename
+
+@pytest.fixture
+def shared_workbook(workbook) -> str:
+    """
+    The synthetic workbook, with its text in a shared strings part.
+    """
+
+    rewrite_archive(workbook, share_strings)
+    return workbook
+
+@pytest.fixture
+def edit_shared_string():
+    """
+    A function that replaces the first shared string matching a pattern, leaving every sheet of the workbook byte for byte the same.
+    It returns the string that was replaced.
+    """
+
+    def edit(filename: str, pattern: str, replacement: str) -> str:
+        replaced = []
+        def change(parts):
+            strings = parts["xl/sharedStrings.xml"].decode("utf-8")
+            match = re.search(pattern, strings)
+            replaced.append(match.group(0))
+            parts["xl/sharedStrings.xml"] = (strings[:match.start()] + replacement + strings[match.end():]).encode("utf-8")
+        rewrite_archive(filename, change)
+        return replaced[0]
+    return edit
+
+@pytest.fixture
+def edit_sheet():
+    """
+    A function that replaces the first text matching a pattern in one sheet of a workbook, leaving every other sheet byte for byte the same.
+    The sheet is given by its part, for example "xl/worksheets/sheet3.xml".
+    """
+
+    def edit(filename: str, path: str, pattern: str, replacement: str) -> None:
+        def change(parts):
+            parts[path] = re.sub(pattern, replacement, parts[path].decode("utf-8"), count=1).encode("utf-8")
+        rewrite_archive(filename, change)
+    return edit
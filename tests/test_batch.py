@@ -0,0 +1,78 @@
+"""
+Tests of batch mode, which generates the report of every workbook in a directory.
+"""
+
+
+# IMPORTS
+import os
+import shutil
+import zipfile
+import benchmark
+import main
+
+
+# UTILITY FUNCTIONS
+
+def create_directory(directory: str) -> list:
+    """
+    Create a directory of two workbooks with different days, and the files batch mode should ignore.
+    """
+
+    os.makedirs(directory)
+    workbooks = [os.path.join(directory, name) for name in ["east.xlsx", "west.xlsx"]]
+    for seed, workbook in enumerate(workbooks, start=1):
+        benchmark.generate_workbook(workbook, 4, 10, seed)
+    shutil.copy(workbooks[0], os.path.join(directory, "~$east.xlsx"))
+    with open(os.path.join(directory, "notes.txt"), "w") as file:
+        file.write("Not a workbook.")
+    return workbooks
+
+def run_batch(directory: str, output: str, workers: int) -> int:
+    """
+    Run batch mode from the command line, for every day of the workbooks.
+    """
+
+    status = main.cli(["--batch", directory, "-o", output, "--start-date", "2024-01-01", "--workers", str(workers), "--no-cache"])
+    main.Diagnostics.collect()
+    return status
+
+def read_document(filename: str) -> str:
+    """
+    Read the document part of a saved report.
+    """
+
+    with zipfile.ZipFile(filename) as archive:
+        return archive.read(main.DOCUMENT_PART).decode("utf-8")
+
+
+# TESTS
+
+def test_batch_reports_every_workbook(tmp_path):
+    directory = str(tmp_path / "workbooks")
+    assert [os.path.basename(i) for i in create_directory(directory)] == [os.path.basename(i) for i in main.find_workbooks(directory)]
+
+    documents = []
+    for workers in [1, 2]:
+        output = str(tmp_path / f"reports-{workers}")
+        assert run_batch(directory, output, workers) == main.EXIT_SUCCESS
+        assert sorted(os.listdir(output)) == ["east.docx", "west.docx"]
+        documents.append([read_document(os.path.join(output, name)) for name in ["east.docx", "west.docx"]])
+
+    # The reports are the same when the workbooks are processed in parallel.
+    assert documents[1] == documents[0]
+    assert documents[0][0] != documents[0][1]
+
+def test_failed_workbook_does_not_stop_batch(tmp_path, capsys):
+    directory = str(tmp_path / "workbooks")
+    create_directory(directory)
+    with open(os.path.join(directory, "broken.xlsx"), "wb") as file:
+        file.write(b"Not a zip file.")
+
+    output = str(tmp_path / "reports")
+    assert run_batch(directory, output, 1) == main.EXIT_FAILURE
+    assert sorted(os.listdir(output)) == ["east.docx", "west.docx"]
+    assert "2 of 3 reports saved." in capsys.readouterr().out
+
+def test_empty_directory_fails(tmp_path):
+    os.makedirs(tmp_path / "workbooks")
+    assert run_batch(str(tmp_path / "workbooks"), str(tmp_path / "reports"), 1) == main.EXIT_FAILURE
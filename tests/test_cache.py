@@ -0,0 +1,77 @@
+"""
+Tests of the on-disk cache of parsed sheets.
+"""
+
+
+# IMPORTS
+import os
+import pandas as pd
+import main
+
+
+# UTILITY FUNCTIONS
+
+def describe_days(days: list) -> list:
+    """
+    Describe the operations of each day by their kind and their row, so days can be compared.
+    """
+
+    return [[(type(operation).__name__, operation.data) for operation in day] for day in days]
+
+def load_all(filename: str, cache: main.SheetCache) -> list:
+    """
+    Load the operations of every day of a workbook with a cache, counting the sheets found in it.
+    """
+
+    main.Profiler.counters.clear()
+    with pd.ExcelFile(filename) as data:
+        days = main.load_days(data, main.get_date_sheets(data), cache, workers=1)
+    main.Diagnostics.collect()
+    return days
+
+
+# TESTS
+
+def test_cached_sheets_match_parsed(workbook, tmp_path):
+    cache = main.SheetCache(str(tmp_path / "cache"))
+    parsed = load_all(workbook, cache)
+    assert main.Profiler.counters["sheets parsed"] == len(parsed)
+
+    cached = load_all(workbook, main.SheetCache(str(tmp_path / "cache")))
+    assert main.Profiler.counters["sheets from cache"] == len(parsed)
+    assert main.Profiler.counters.get("sheets parsed", 0) == 0
+    assert describe_days(cached) == describe_days(parsed)
+
+def test_changed_workbook_is_parsed_again(workbook, edit_sheet, tmp_path):
+    cache = main.SheetCache(str(tmp_path / "cache"))
+    before = cache.identify(workbook)
+    assert cache.identify(workbook) == before
+    load_all(workbook, cache)
+
+    edit_sheet(workbook, "xl/worksheets/sheet3.xml", r"Drilling \(to [0-9.]+m\)", "Drilling (to 9999m)")
+    assert cache.identify(workbook) != before
+    load_all(workbook, cache)
+    assert main.Profiler.counters.get("sheets from cache", 0) == 0
+
+def test_missing_and_unreadable_entries(tmp_path):
+    cache = main.SheetCache(str(tmp_path / "cache"))
+    assert cache.get("hash", "2024 Jan-01") == None
+
+    os.makedirs(cache.directory)
+    with open(cache.path("hash", "2024 Jan-01"), "wb") as file:
+        file.write(b"not a pickle")
+    assert cache.get("hash", "2024 Jan-01") == None
+
+def test_evict_removes_least_recently_used(tmp_path):
+    cache = main.SheetCache(str(tmp_path / "cache"))
+    operation = main.Drilling([0.25, 0.5, 6, "DRLG", "Drilling (to 1500m) at 2.4m³/min"])
+    sheets = [f"2024 Jan-0{i}" for i in range(1, 5)]
+    for time, sheet in enumerate(sheets):
+        cache.put("hash", sheet, [operation] * 10)
+        os.utime(cache.path("hash", sheet), (time, time))
+    # Reading an entry marks it as the most recently used.
+    assert cache.get("hash", sheets[0]) != None
+
+    cache.size_limit = 2 * os.path.getsize(cache.path("hash", sheets[1]))
+    cache.evict()
+    assert [os.path.exists(cache.path("hash", sheet)) for sheet in sheets] == [True, False, False, True]
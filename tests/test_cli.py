@@ -0,0 +1,79 @@
+"""
+Tests of the command-line mode, which generates reports without any prompts.
+"""
+
+
+# IMPORTS
+import os
+import pytest
+import main
+
+
+# CONSTANTS
+
+# Arguments that are rejected as a usage error without saving a report, with "{workbook}" and "{output}" replaced by paths.
+USAGE_ERRORS = [
+    [],
+    ["{workbook}", "--batch", "{output}", "-o", "{output}"],
+    ["{workbook}"],
+    ["{workbook}", "-o", "{output}", "--threshold", "-1"],
+    ["{workbook}", "-o", "{output}", "--dates", "2024-01-01..", "--start-date", "2024-01-02"],
+    ["{workbook}", "-o", "{output}", "--start-time", "25:00"],
+    ["{workbook}", "-o", "{output}", "--export-rows", "rows.xlsx"],
+    ["{workbook}", "-o", "{output}", "--weighted"],
+    ["--batch", "{output}", "-o", "{output}", "--export-rows", "rows.csv"],
+    ["--batch", "{output}", "-o", "{output}", "--levels", "week"],
+    ["--watch", "{output}", "-o", "{output}", "--interval", "0"],
+    ["{workbook}", "-o", "{output}", "--start-date", "2023-12-01"],
+    ["{workbook}", "-o", "{output}", "--start-date", "2024-01-05", "--end-date", "2024-01-02"]
+]
+
+
+# UTILITY FUNCTIONS
+
+def run(arguments: list, workbook: str, output: str) -> int:
+    """
+    Run the command-line mode with the paths filled into the arguments.
+    """
+
+    status = main.cli([argument.format(workbook=workbook, output=output) for argument in arguments])
+    main.Diagnostics.collect()
+    return status
+
+def read_dates(filename: str) -> list:
+    """
+    Read the dates of the rows exported to a CSV file.
+    """
+
+    with open(filename, encoding="utf-8") as file:
+        return [line.split(",")[0] for line in file.read().splitlines()[1:]]
+
+
+# TESTS
+
+@pytest.mark.parametrize("arguments", USAGE_ERRORS)
+def test_usage_errors(workbook, tmp_path, arguments):
+    assert run(arguments, workbook, str(tmp_path / "report.docx")) == main.EXIT_USAGE
+    assert not os.path.exists(tmp_path / "report.docx")
+
+def test_invalid_number_exits_with_usage(workbook, tmp_path):
+    with pytest.raises(SystemExit) as exit:
+        main.cli([workbook, "-o", str(tmp_path / "report"), "--workers", "many"])
+    assert exit.value.code == main.EXIT_USAGE
+
+def test_missing_workbook_fails(tmp_path):
+    assert run(["{workbook}", "-o", "{output}"], str(tmp_path / "missing.xlsx"), str(tmp_path / "report")) == main.EXIT_FAILURE
+
+def test_report_of_date_range(workbook, tmp_path, capsys):
+    rows = str(tmp_path / "rows.csv")
+    status = run(["{workbook}", "-o", "{output}", "--dates", "2024-01-02..2024-01-04", "--workers", "1", "--statistics", "--export-rows", rows], workbook, str(tmp_path / "report"))
+
+    assert status == main.EXIT_SUCCESS
+    assert os.path.isfile(tmp_path / "report.docx")
+    assert read_dates(rows) == ["2024-01-02", "2024-01-03", "2024-01-04"]
+    assert "Statistics for Jan 2 - 4, 2024" in capsys.readouterr().out
+
+def test_default_range_is_last_day(workbook, tmp_path):
+    rows = str(tmp_path / "rows.csv")
+    assert run(["{workbook}", "-o", "{output}", "--workers", "1", "--export-rows", rows], workbook, str(tmp_path / "report.docx")) == main.EXIT_SUCCESS
+    assert read_dates(rows) == ["2024-01-08"]
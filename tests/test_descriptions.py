@@ -0,0 +1,121 @@
+"""
+Tests of the values extracted from the descriptions of operations.
+"""
+
+
+# IMPORTS
+import pandas as pd
+import pytest
+import main
+
+
+# CONSTANTS
+
+# Descriptions with the depth, mud weight, ECD, ESD, pump rate, dynamic BP, static BP and gas reported in them.
+DESCRIPTIONS = [
+    (
+        "Drilling (to 1500.5m) @ 1200 kg/m³ MW. 1262.5 kg/m³ ECD. 2.25 m³/min. 3000 kPa BP", "Drilling",
+        ((1500.5, "m"), (1200, "kg/m³"), (1262.5, "kg/m³"), None, (2.25, "m³/min"), (3000, "kPa"), None, None)
+    ),
+    (
+        "Drilling (to 1500m) @ 2.4 m³/min. 450 kPa Line Restriction. 1200 kg/m³ MW", "Drilling",
+        ((1500, "m"), (1200, "kg/m³"), None, None, (2.4, "m³/min"), (450, "kPa"), None, None)
+    ),
+    # Any other entry in kPa ends the search for the dynamic BP without a value.
+    (
+        "Drilling (to 1500m) @ 450 kPa. 3000 kPa BP", "Drilling",
+        ((1500, "m"), None, None, None, None, None, None, None)
+    ),
+    # Only the first entry reporting a value is used, even if it is malformed.
+    (
+        "Drilling (to 1500m) @ about 1200 kg/m³ MW. 1210 kg/m³ MW", "Drilling",
+        ((1500, "m"), None, None, None, None, None, None, None)
+    ),
+    ("Drilling (to 1500m)", "Drilling", ((1500, "m"), None, None, None, None, None, None, None)),
+    ("Drilling ahead", "Drilling", (None,) * 8),
+    # Values of the other kind of operation are not read.
+    (
+        "Drilling (to 1500m) @ 1230 kg/m³ ESD. No BP. Flame B/U", "Drilling",
+        ((1500, "m"), None, None, None, None, None, None, None)
+    ),
+    (
+        "Connection @ 1500.5m. 1200 kg/m³ MW. 1240.5 kg/m³ ESD. 1000 to 2500 kPa BP. 12.5 KSCM/Day B/U", "Connection",
+        ((1500.5, "m"), (1200, "kg/m³"), None, (1240.5, "kg/m³"), None, None, ((1000, "kPA"), (2500, "kPA")), (12.5, "KSCM/Day B/U"))
+    ),
+    (
+        "Connection @ 1500m. Closed Choke BP. 0.6 ShakerGas B/U", "Connection",
+        ((1500, "m"), None, None, None, None, None, (0, "kPa"), (0.6, "ShakerGas B/U"))
+    ),
+    (
+        "Connection @ 1500m. No BP. No Gas to Report", "Connection",
+        ((1500, "m"), None, None, None, None, None, (0, "kPa"), (0, "KSCM/Day"))
+    ),
+    (
+        "Connection @ 1500m. 500 kPa BP. Flame B/U", "Connection",
+        ((1500, "m"), None, None, None, None, None, None, (0, "Flame B/U"))
+    ),
+    ("Connection @ unknown. 1200 kg/m³ MW", "Connection", (None, (1200, "kg/m³"), None, None, None, None, None, None)),
+    ("Connection", "Connection", (None,) * 8)
+]
+
+
+# UTILITY FUNCTIONS
+
+def describe(values: tuple) -> tuple:
+    """
+    Describe the values extracted from a description by their numbers and units, so they can be compared.
+    """
+
+    def value(item):
+        if type(item) == main.Range:
+            return (value(item.start), value(item.end))
+        return None if item == None else (item.value, item.unit)
+    return tuple(value(item) for item in values)
+
+
+# TESTS
+
+@pytest.mark.parametrize("description, kind, expected", DESCRIPTIONS)
+def test_tokenize_description(description, kind, expected):
+    assert describe(main.tokenize_description(description, kind)) == expected
+
+@pytest.mark.parametrize("description, kind, expected", DESCRIPTIONS)
+def test_operation_values(description, kind, expected):
+    types = {"Drilling": main.Drilling, "Connection": main.Connection}
+    operation = types[kind]([0.25, 0.5, 6, "CODE", description])
+    values = (operation.depth, operation.mud_weight, operation.ecd, operation.esd, operation.pump_rate, operation.dynamic_bp, operation.static_bp, operation.gas)
+    assert describe(values) == expected
+
+def test_repeated_descriptions_are_parsed_once():
+    main.parse_description.cache_clear()
+    description = DESCRIPTIONS[0][0]
+    operations = [main.Drilling([0.25, 0.5, 6, "CODE", description]) for _ in range(3)]
+
+    assert main.get_description_counts() == (2, 1)
+    # The values are shared by every operation with the same description.
+    assert all(operation.depth is operations[0].depth for operation in operations)
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_description_counters(workbook, workers):
+    main.parse_description.cache_clear()
+    main.Profiler.counters.clear()
+    with pd.ExcelFile(workbook) as data:
+        sheets = main.get_date_sheets(data)
+        days = main.load_days(data, sheets, workers=workers)
+    main.Diagnostics.collect()
+
+    # Descriptions parsed in worker processes are counted too.
+    counters = main.Profiler.counters
+    assert counters["descriptions from cache"] + counters["descriptions parsed"] == sum(len(day) for day in days)
+
+def test_loaded_descriptions_are_reused(workbook):
+    main.parse_description.cache_clear()
+    with pd.ExcelFile(workbook) as data:
+        sheets = main.get_date_sheets(data)
+        main.load_days(data, sheets, workers=1)
+        main.Profiler.counters.clear()
+        days = main.load_days(data, sheets, workers=1)
+    main.Diagnostics.collect()
+
+    assert main.Profiler.counters["descriptions from cache"] == sum(len(day) for day in days)
+    assert main.Profiler.counters["descriptions parsed"] == 0
@@ -0,0 +1,33 @@
+"""
+Tests of the warnings recorded while generating a report.
+"""
+
+
+# IMPORTS
+import main
+
+
+# TESTS
+
+def test_repeated_warnings_are_counted_once():
+    main.Diagnostics.collect()
+    main.Profiler.counters.clear()
+    for _ in range(3):
+        main.Diagnostics.warn("No depth reported for an operation", 1, 2, "depth")
+    main.Diagnostics.warn("No depth reported for an operation", 1, 3, "depth")
+
+    assert main.Profiler.counters["warnings"] == 2
+    assert len(main.Diagnostics.collect()) == 2
+
+def test_missing_depth_is_reported_once_with_its_operation():
+    main.Diagnostics.collect()
+    main.Profiler.counters.clear()
+    operation = main.Drilling([0.25, 0.5, 6, "DRLG", "Drilling ahead"])
+    assert operation.get_depth() == None
+    assert main.Diagnostics.collect() == []
+
+    main.build_operation_table([[operation, operation]], [4])
+    diagnostics = main.Diagnostics.collect()
+
+    assert [(i.day, i.operation, i.metric) for i in diagnostics] == [(4, 1, "depth"), (4, 2, "depth")]
+    assert main.Profiler.counters["warnings"] == 2
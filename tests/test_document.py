@@ -0,0 +1,46 @@
+"""
+Tests of the Word documents written for reports.
+"""
+
+
+# IMPORTS
+from io import BytesIO
+import docx
+import pandas as pd
+import main
+
+
+# UTILITY FUNCTIONS
+
+def create_report(filename: str) -> main.Report:
+    """
+    Create a report of every day of a workbook.
+    """
+
+    with pd.ExcelFile(filename) as data:
+        sheets = main.get_date_sheets(data)
+        report = main.create_report(data, sheets, sheets[0], "00:00", sheets[-1], "23:59", workers=1)
+    main.Diagnostics.collect()
+    return report
+
+
+# TESTS
+
+def test_document_has_title_and_rows(workbook, tmp_path):
+    report = create_report(workbook)
+    filename = str(tmp_path / "report.docx")
+    main.write_document(report, filename)
+
+    document = docx.Document(filename)
+    assert document.paragraphs[0].text == f"{report.date_range} | Drilling to {report.maximum_depth.value:.0f} mMD"
+    table = document.tables[0]
+    assert [cell.text for cell in table.rows[0].cells] == main.REPORT_HEADERS
+    assert [[cell.text for cell in row.cells] for row in table.rows[1:]] == report.rows
+
+def test_document_is_written_to_file_objects(workbook):
+    report = create_report(workbook)
+    file = BytesIO()
+    main.write_document(report, file)
+
+    table = docx.Document(BytesIO(file.getvalue())).tables[0]
+    assert [[cell.text for cell in row.cells] for row in table.rows[1:]] == report.rows
@@ -0,0 +1,101 @@
+"""
+Tests that the exported rows and operations read back the same in every export format.
+"""
+
+
+# IMPORTS
+import json
+import math
+import os
+import pandas as pd
+import pytest
+import main
+
+
+# UTILITY FUNCTIONS
+
+def read_records(filename: str, columns: list) -> list:
+    """
+    Read an exported file back as a list of records, with empty values as None.
+    """
+
+    extension = os.path.splitext(filename)[1]
+    if extension == ".csv":
+        # The text columns are kept as text, so dates and times are not converted, and numbers are read back exactly.
+        table = pd.read_csv(filename, dtype={column: str for column in columns if column not in main.OPERATION_EXPORT_COLUMNS[4:-1]}, float_precision="round_trip")
+    elif extension == ".jsonl":
+        with open(filename, encoding="utf-8") as file:
+            table = pd.DataFrame([json.loads(line) for line in file], columns=columns)
+    else:
+        table = pd.read_parquet(filename)
+    assert list(table.columns) == columns
+    return normalize(table)
+
+def normalize(table: pd.DataFrame) -> list:
+    """
+    Convert a table to a list of records, with empty values as None.
+    """
+
+    return [
+        {key: None if value is None or (type(value) == float and math.isnan(value)) else value for key, value in record.items()}
+        for record in table.astype(object).to_dict("records")
+    ]
+
+def export_operations(filename: str, workbook: str) -> tuple:
+    """
+    Create a report of every day of a workbook, exporting its operations, and build the operations expected in the export.
+    """
+
+    with pd.ExcelFile(workbook) as data:
+        sheets = main.get_date_sheets(data)
+        with main.TableWriter(filename, main.OPERATION_EXPORT_COLUMNS) as operations:
+            main.create_report(data, sheets, sheets[0], "00:00", sheets[-1], "23:59", workers=1, operations=operations)
+        numbers = list(range(1, len(sheets) + 1))
+        table = main.build_operation_table(main.load_days(data, sheets, workers=1), numbers)
+    main.Diagnostics.collect()
+    return main.build_operation_export(table, {number: main.format_sheet_date(sheet) for number, sheet in zip(numbers, sheets)})
+
+
+# TESTS
+
+@pytest.mark.parametrize("extension", main.EXPORT_FORMATS)
+def test_rows_round_trip(workbook, tmp_path, extension):
+    with pd.ExcelFile(workbook) as data:
+        sheets = main.get_date_sheets(data)
+        report = main.create_report(data, sheets, sheets[0], "00:00", sheets[-1], "23:59", workers=1)
+    main.Diagnostics.collect()
+
+    filename = str(tmp_path / f"rows{extension}")
+    main.export_rows(report, filename)
+    assert read_records(filename, main.ROW_EXPORT_COLUMNS) == normalize(main.build_row_table(report))
+
+@pytest.mark.parametrize("extension", main.EXPORT_FORMATS)
+def test_operations_round_trip(workbook, tmp_path, monkeypatch, extension):
+    # Small chunks, so the operations are written in several parts.
+    monkeypatch.setattr(main, "STREAM_CHUNK_DAYS", 3)
+    filename = str(tmp_path / f"operations{extension}")
+    expected = export_operations(filename, workbook)
+
+    assert len(expected) > 0
+    assert read_records(filename, main.OPERATION_EXPORT_COLUMNS) == normalize(expected)
+
+@pytest.mark.parametrize("extension", main.EXPORT_FORMATS)
+def test_empty_export_has_columns(tmp_path, extension):
+    filename = str(tmp_path / f"empty{extension}")
+    main.write_table([], main.OPERATION_EXPORT_COLUMNS, filename)
+
+    if extension == ".jsonl":
+        assert os.path.getsize(filename) == 0
+    else:
+        assert read_records(filename, main.OPERATION_EXPORT_COLUMNS) == []
+
+def test_unsupported_export_format(tmp_path):
+    with pytest.raises(ValueError):
+        main.TableWriter(str(tmp_path / "operations.xlsx"), main.OPERATION_EXPORT_COLUMNS)
+
+def test_cli_exports_operations(workbook, tmp_path):
+    filename = str(tmp_path / "operations.csv")
+    status = main.cli([workbook, "-o", str(tmp_path / "report.docx"), "--start-date", "2024-01-01", "--workers", "1", "--no-cache", "--export-operations", filename])
+
+    assert status == main.EXIT_SUCCESS
+    assert read_records(filename, main.OPERATION_EXPORT_COLUMNS) == normalize(export_operations(str(tmp_path / "expected.csv"), workbook))
@@ -0,0 +1,47 @@
+"""
+Tests of incremental reports, which reuse the stored summaries of unchanged days.
+"""
+
+
+# IMPORTS
+import pandas as pd
+import main
+
+
+# UTILITY FUNCTIONS
+
+def create_rows(filename: str, directory: str | None = None) -> list:
+    """
+    Create a report of every day of a workbook, with a store of day summaries in the directory if one is given.
+    """
+
+    with pd.ExcelFile(filename) as data:
+        sheets = main.get_date_sheets(data)
+        store = main.DayStore(data, directory) if directory != None else None
+        report = main.create_report(data, sheets, sheets[0], "00:00", sheets[-1], "23:59", workers=1, store=store)
+    main.Diagnostics.collect()
+    return report.rows
+
+
+# TESTS
+
+def test_fingerprint_includes_shared_strings(shared_workbook, edit_shared_string):
+    with pd.ExcelFile(shared_workbook) as data:
+        sheet = main.get_date_sheets(data)[0]
+        before = main.DayStore(data).fingerprint(sheet)
+        assert len(main.get_shared_strings(data)) > 0
+
+    edit_shared_string(shared_workbook, r"Drilling \(to [0-9.]+m\)", "Drilling (to 9999m)")
+    with pd.ExcelFile(shared_workbook) as data:
+        assert main.DayStore(data).fingerprint(sheet) != before
+
+def test_shared_string_change_recomputes_day(shared_workbook, edit_shared_string, tmp_path):
+    directory = str(tmp_path / "days")
+    stale = create_rows(shared_workbook, directory)
+
+    # Only the shared strings change, every sheet stays byte for byte the same.
+    edit_shared_string(shared_workbook, r"Drilling \(to [0-9.]+m\)", "Drilling (to 9999m)")
+    rows = create_rows(shared_workbook, directory)
+
+    assert rows != stale
+    assert rows == create_rows(shared_workbook)
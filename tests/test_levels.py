@@ -0,0 +1,31 @@
+"""
+Tests of the reports at other levels than days.
+"""
+
+
+# IMPORTS
+import pandas as pd
+import main
+
+
+# TESTS
+
+def test_tour_labels_follow_time_range(workbook):
+    with pd.ExcelFile(workbook) as data:
+        sheets = main.get_date_sheets(data)
+        report = main.create_report(data, sheets, sheets[0], "06:30", sheets[2], "13:15", workers=1, levels=["tour"])
+    main.Diagnostics.collect()
+
+    labels = report.levels["tour"].labels
+    assert labels[0] == "2024-01-01 06:30 – 12:00"
+    assert labels[1] == "2024-01-01 12:00 – 24:00"
+    assert labels[-2] == "2024-01-03 00:00 – 12:00"
+    assert labels[-1] == "2024-01-03 12:00 – 13:15"
+
+def test_tour_labels_of_whole_days(workbook):
+    with pd.ExcelFile(workbook) as data:
+        sheets = main.get_date_sheets(data)
+        report = main.create_report(data, sheets, sheets[0], "00:00", sheets[0], "23:59", workers=1, levels=["tour"])
+    main.Diagnostics.collect()
+
+    assert report.levels["tour"].labels == ["2024-01-01 00:00 – 12:00", "2024-01-01 12:00 – 24:00"]
@@ -0,0 +1,77 @@
+"""
+Tests of the interval index over operations, against a linear scan of every operation.
+"""
+
+
+# IMPORTS
+import math
+import random
+import pytest
+import main
+
+
+# UTILITY FUNCTIONS
+
+def create_days(generator: random.Random, count: int) -> list:
+    """
+    Create days of operations at random quarter hours, so many operations touch each other and the windows.
+    Some operations have no valid times, some have no length, and some days were not loaded.
+    """
+
+    days = []
+    for _ in range(count):
+        if generator.random() < 0.1:
+            days.append(None)
+            continue
+        operations = []
+        for _ in range(generator.randint(0, 12)):
+            start = generator.randint(0, 96)
+            end = min(96, start + generator.choice([0, 1, 2, 4, 8, 30]))
+            times = [str(start / 96), str(end / 96)] if generator.random() > 0.05 else ["", ""]
+            operations.append(main.Drilling([*times, None, "D", "Drilling (to 1500m)"]))
+        days.append(operations)
+    return days
+
+def scan(days: list) -> list:
+    """
+    List the operations on the continuous time axis with a linear scan, in the order of the index.
+    """
+
+    entries = []
+    for day, operations in enumerate(days):
+        for position, operation in enumerate(operations or []):
+            start, end = main.to_number(operation.data[0]), main.to_number(operation.data[1])
+            if math.isnan(start) or math.isnan(end):
+                start, end = 0, 1
+            entries.append((day + start, day, position, day + end, operation))
+    entries.sort(key=lambda entry: entry[:3])
+    return entries
+
+
+# TESTS
+
+@pytest.mark.parametrize("seed", range(20))
+def test_index_matches_linear_scan(seed):
+    generator = random.Random(seed)
+    days = create_days(generator, generator.randint(1, 5))
+    index = main.OperationIndex(days)
+    entries = scan(days)
+    assert len(index) == len(entries)
+
+    # Windows on the same quarter hours as the operations, so endpoints touch, including empty windows and windows across days.
+    windows = [(0, len(days)), (1, 1), (0.5, 1.5), (-1, 0), (len(days), len(days) + 1)]
+    for _ in range(200):
+        start = generator.randint(-8, len(days) * 96 + 8) / 96
+        windows.append((start, start + generator.choice([0, 0, 1, 4, 48, 96, 200]) / 96))
+
+    for start, end in windows:
+        assert index.within(start, end) == [entry[4] for entry in entries if entry[0] >= start and entry[3] <= end]
+        assert index.overlapping(start, end) == [entry[4] for entry in entries if entry[0] < end and entry[3] > start]
+
+def test_trim_days_keeps_operations_within_the_range():
+    days = [
+        [main.Drilling(["0", "0.25", None, "D", "Drilling (to 1500m)"]), main.Drilling(["0.25", "1", None, "D", "Drilling (to 1510m)"])],
+        [main.Drilling(["0", "0.5", None, "D", "Drilling (to 1520m)"]), main.Drilling(["0.5", "1", None, "D", "Drilling (to 1530m)"])]
+    ]
+    main.trim_days(days, "06:00", "12:00")
+    assert [[operation.depth.value for operation in day] for day in days] == [[1510], [1520]]
@@ -0,0 +1,42 @@
+"""
+Tests that parsing sheets in worker processes gives exactly the same results as parsing them in this process.
+"""
+
+
+# IMPORTS
+import pandas as pd
+import main
+
+
+# UTILITY FUNCTIONS
+
+def describe_days(days: list) -> list:
+    """
+    Describe the operations of each day by their kind and their row, so days can be compared.
+    """
+
+    return [[(type(operation).__name__, operation.data) for operation in day] for day in days]
+
+
+# TESTS
+
+def test_parallel_operations_match_serial(workbook):
+    with pd.ExcelFile(workbook) as data:
+        sheets = list(main.get_date_sheets(data))
+        serial = main.load_days(data, sheets, workers=1)
+    parallel = main.parse_sheets_parallel(workbook, sheets, 3)
+
+    assert len(serial) == len(sheets)
+    assert describe_days(parallel) == describe_days(serial)
+
+def test_parallel_report_matches_serial(workbook):
+    reports = []
+    with pd.ExcelFile(workbook) as data:
+        sheets = main.get_date_sheets(data)
+        assert len(sheets) >= main.PARALLEL_MINIMUM_SHEETS
+        for workers in [1, 3]:
+            reports.append(main.create_report(data, sheets, sheets[0], "06:30", sheets[-1], "18:00", 1500, workers))
+            main.Diagnostics.collect()
+
+    assert reports[1].rows == reports[0].rows
+    assert reports[1].maximum_depth == reports[0].maximum_depth
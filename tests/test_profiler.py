@@ -0,0 +1,82 @@
+"""
+Tests of the timings and counters recorded by the profiler.
+"""
+
+
+# IMPORTS
+import json
+from time import sleep
+import pytest
+import main
+
+
+# FIXTURES
+
+@pytest.fixture
+def profiler(monkeypatch):
+    """
+    The profiler, enabled with no recorded timings, and restored after the test.
+    """
+
+    monkeypatch.setattr(main.Profiler, "enabled", True)
+    monkeypatch.setattr(main.Profiler, "timers", {})
+    monkeypatch.setattr(main.Profiler, "counters", {})
+    monkeypatch.setattr(main.Profiler, "events", [])
+    monkeypatch.setattr(main.Profiler, "stack", [])
+    return main.Profiler
+
+
+# TESTS
+
+def test_nested_stages(profiler):
+    with profiler.stage("outer"):
+        sleep(0.02)
+        for _ in range(2):
+            with profiler.stage("inner"):
+                sleep(0.02)
+
+    outer, inner = profiler.timers["outer"], profiler.timers["inner"]
+    assert (outer[0], inner[0]) == (1, 2)
+    assert inner[1] == pytest.approx(inner[2])
+    assert outer[1] >= inner[1] + 0.02
+    assert outer[2] == pytest.approx(outer[1] - inner[1])
+    assert [event[0] for event in profiler.events] == ["inner", "inner", "outer"]
+
+def test_iterate_excludes_the_consumer(profiler):
+    def produce():
+        for item in range(3):
+            sleep(0.01)
+            yield item
+
+    items = []
+    for item in profiler.iterate("read", produce()):
+        sleep(0.05)
+        items.append(item)
+
+    assert items == [0, 1, 2]
+    calls, total, _ = profiler.timers["read"]
+    assert calls == 1
+    assert 0.03 <= total < 0.15
+
+def test_disabled_profiler_records_nothing(profiler):
+    profiler.enabled = False
+    with profiler.stage("outer"):
+        list(profiler.iterate("read", range(3)))
+    assert profiler.timers == {}
+    assert profiler.events == []
+
+def test_trace(profiler, workbook, tmp_path, capsys):
+    profiler.enabled = False
+    trace = str(tmp_path / "trace.json")
+    status = main.cli([workbook, "-o", str(tmp_path / "report"), "--start-date", "2024-01-01", "--workers", "1", "--no-cache", "--trace", trace])
+    main.Diagnostics.collect()
+    assert status == main.EXIT_SUCCESS
+
+    with open(trace, encoding="utf-8") as file:
+        trace = json.load(file)
+    names = {event["name"] for event in trace["traceEvents"]}
+    assert {"total", "open", "report", "render"} <= names
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in trace["traceEvents"])
+    assert trace["otherData"]["counters"]["sheets parsed"] == 8
+    assert trace["otherData"]["timers"]["total"]["calls"] == 1
+    assert "sheets parsed" in capsys.readouterr().out
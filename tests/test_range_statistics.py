@@ -0,0 +1,78 @@
+"""
+Tests of the statistics of ranges of days, against a scan of every day in the range.
+"""
+
+
+# IMPORTS
+import random
+import pytest
+import main
+
+
+# UTILITY FUNCTIONS
+
+def create_days(generator: random.Random, count: int) -> list:
+    """
+    Create the statistics of random days, with some values not reported.
+    """
+
+    days = []
+    for _ in range(count):
+        day = []
+        for name in main.DAY_STATISTICS:
+            if name.endswith("_count"):
+                day.append(generator.randint(0, 5))
+            else:
+                day.append(None if generator.random() < 0.3 else generator.choice([0.5, 1200, 1262.5, -3, 4000.25, generator.uniform(-10, 5000)]))
+        days.append(day)
+    return days
+
+def scan(days: list, first: int, last: int) -> dict:
+    """
+    Calculate the statistics of a range of days by looking at every day.
+    """
+
+    columns = {name: [day[column] for day in days[first:last + 1]] for column, name in enumerate(main.DAY_STATISTICS)}
+    results = {}
+    for name, (_, unit) in main.STATISTIC_VALUES.items():
+        result = {"unit": unit}
+        for statistic, function in [("minimum", min), ("maximum", max)]:
+            if f"{name}_{statistic}" in columns:
+                values = [value for value in columns[f"{name}_{statistic}"] if value != None]
+                result[statistic] = function(values) if len(values) > 0 else None
+        if f"{name}_sum" in columns:
+            count = sum(columns[f"{name}_count"])
+            total = sum(value for value in columns[f"{name}_sum"] if value != None)
+            result["mean"] = total / count if count > 0 else None
+        results[name] = result
+    return results
+
+
+# TESTS
+
+@pytest.mark.parametrize("seed", range(10))
+def test_every_range_matches_scan(seed):
+    generator = random.Random(seed)
+    days = create_days(generator, generator.randint(1, 40))
+    statistics = main.RangeStatistics(days)
+    assert len(statistics) == len(days)
+
+    for first in range(len(days)):
+        for last in range(first, len(days)):
+            result = statistics.query(first, last)
+            expected = scan(days, first, last)
+            assert list(result) == list(expected)
+            for name in expected:
+                assert result[name] == pytest.approx(expected[name]), (first, last, name)
+
+@pytest.mark.parametrize("first, last", [(-1, 2), (2, 1), (0, 5), (5, 5)])
+def test_invalid_ranges(first, last):
+    statistics = main.RangeStatistics(create_days(random.Random(0), 5))
+    with pytest.raises(IndexError):
+        statistics.query(first, last)
+
+def test_no_days():
+    statistics = main.RangeStatistics([])
+    assert len(statistics) == 0
+    with pytest.raises(IndexError):
+        statistics.query(0, 0)
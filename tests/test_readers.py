@@ -0,0 +1,149 @@
+"""
+Tests that the streaming row readers return the same operations table as reading the sheets through pandas.
+"""
+
+
+# IMPORTS
+from collections import namedtuple
+from datetime import datetime, time
+import openpyxl
+import pandas as pd
+import pytest
+import main
+
+
+# CONSTANTS
+
+Cell = namedtuple("Cell", ["r", "c", "v"])
+
+
+# CLASSES
+
+class FakeSheet:
+    """
+    A sheet of an .xlsb file as pyxlsb reads it: rows that are not stored in the file are left out, and every stored row has a cell for each column.
+    """
+
+    def __init__(self, rows: dict, width: int):
+        self.stored = rows
+        self.width = width
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *arguments):
+        self.close()
+
+    def rows(self, sparse: bool = False):
+        for number in sorted(self.stored):
+            values = self.stored[number] + [None] * (self.width - len(self.stored[number]))
+            yield [Cell(number, column, value) for column, value in enumerate(values)]
+
+    def close(self):
+        pass
+
+class FakeWorkbook:
+    """
+    A workbook with the interface of pyxlsb.Workbook, used by both pandas and the streaming reader.
+    """
+
+    def __init__(self, sheets: dict):
+        self.sheets = list(sheets)
+        self.contents = sheets
+
+    def get_sheet(self, name: str) -> FakeSheet:
+        return FakeSheet(*self.contents[name])
+
+
+# UTILITY FUNCTIONS
+
+def to_binary_cell(value):
+    """
+    Convert a cell value to how it is stored in an .xlsb file, where numbers are floats and times are fractions of a day.
+    """
+
+    if type(value) == time:
+        return (value.hour * 60 + value.minute) / 1440
+    if type(value) == datetime:
+        return (value - datetime(1899, 12, 30)).total_seconds() / 86400
+    if type(value) == int:
+        return float(value)
+    return value
+
+def take_table(rows) -> list:
+    """
+    Take the rows of the operations table, up to and including the row that ends it, as read_operations_block returns them.
+    """
+
+    table = []
+    for row in rows:
+        table.append(row)
+        if len(row) <= 1:
+            break
+    return table
+
+def create_edge_sheet(sheet) -> None:
+    """
+    Fill a sheet with a DOR whose header rows and operations have gaps and unusual values.
+    """
+
+    sheet.append(["Daily Operations Report"])
+    for row in range(main.OPERATIONS_FIRST_ROW - 1):
+        sheet.append([f"Header {row}"] if row % 4 == 0 else [])
+    sheet.append([time(0, 0), None, time(1, 30), 1.5, None, "D", None, "Drilling (to 1500m) @ 1200 kg/m³ MW", "extra"])
+    sheet.append([time(1, 30), time(2, 0), 0.5, 3, "Connection @ 1500m. NA. 1240 kg/m³ ESD"])
+    sheet.append([time(2, 0), None, time(3, 0), 12.0, None, "#N/A", "C", "Connection @ 1501m", True])
+    sheet.append([0.125, 0.25, None, 3, "X", "Service rig"])
+    sheet.append([time(6, 0), time(24 - 1, 59), 17.98, "D", "Drilling (to 1510.5m)"])
+    sheet.append([None, None, "Remarks"])
+    sheet.append(["Crew", None, "Driller"])
+
+
+# FIXTURES
+
+@pytest.fixture
+def edge_workbook(tmp_path) -> str:
+    filename = str(tmp_path / "edge.xlsx")
+    workbook = openpyxl.Workbook()
+    create_edge_sheet(workbook.active)
+    workbook.active.title = "2024 Jan-01"
+    workbook.save(filename)
+    return filename
+
+
+# TESTS
+
+@pytest.mark.parametrize("name", ["workbook", "shared_workbook", "edge_workbook"])
+def test_openpyxl_rows_match_pandas(name, request):
+    with pd.ExcelFile(request.getfixturevalue(name)) as data:
+        assert data.engine == "openpyxl"
+        for sheet in main.get_date_sheets(data):
+            streamed = take_table(main.read_operations(data, sheet))
+            assert streamed == main.read_operations_block(data, sheet)
+            assert len(streamed) > 1
+
+@pytest.mark.parametrize("name", ["workbook", "edge_workbook"])
+def test_pyxlsb_rows_match_pandas(name, request, tmp_path, monkeypatch):
+    # The same sheets as pyxlsb would read them from an .xlsb file, where empty rows are usually not stored.
+    # Every other sheet stores its empty rows, as Excel does for formatted rows.
+    source = openpyxl.load_workbook(request.getfixturevalue(name))
+    sheets = {}
+    for position, worksheet in enumerate(source.worksheets):
+        rows = {}
+        for number, row in enumerate(worksheet.iter_rows(values_only=True)):
+            values = [to_binary_cell(value) for value in row]
+            if position % 2 == 1 or any(value != None for value in values):
+                rows[number] = values
+        sheets[worksheet.title] = (rows, worksheet.max_column)
+
+    import pyxlsb
+    monkeypatch.setattr(pyxlsb, "open_workbook", lambda *arguments, **options: FakeWorkbook(sheets))
+    filename = tmp_path / "workbook.xlsb"
+    filename.write_bytes(b"")
+
+    with pd.ExcelFile(str(filename), engine="pyxlsb") as data:
+        assert data.engine == "pyxlsb"
+        for sheet in main.get_date_sheets(data):
+            streamed = take_table(main.read_operations(data, sheet))
+            assert streamed == main.read_operations_block(data, sheet)
+            assert len(streamed) > 1
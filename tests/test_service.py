@@ -0,0 +1,137 @@
+"""
+Tests of the local report service, running on a free port of this computer.
+"""
+
+
+# IMPORTS
+import json
+import threading
+import zipfile
+from io import BytesIO
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+import pandas as pd
+import benchmark
+import pytest
+import main
+
+
+# UTILITY FUNCTIONS
+
+def request(url: str, parameters: dict | None = None, body: bytes | None = None) -> tuple:
+    """
+    Send a request to the service, as a GET with the parameters in the query string or a POST of the body.
+    It returns the status, the headers and the body of the response.
+    """
+
+    if parameters != None:
+        url += "?" + urlencode(parameters)
+    try:
+        with urlopen(Request(url, data=body), timeout=60) as response:
+            return response.status, response.headers, response.read()
+    except HTTPError as e:
+        return e.code, e.headers, e.read()
+
+def create_rows(filename: str) -> list:
+    """
+    Create the rows of a report of every day of a workbook, as they are exported.
+    """
+
+    with pd.ExcelFile(filename) as data:
+        sheets = main.get_date_sheets(data)
+        report = main.create_report(data, sheets, sheets[0], "00:00", sheets[-1], "23:59", workers=1)
+    main.Diagnostics.collect()
+    return main.build_row_table(report).values.tolist()
+
+
+# FIXTURES
+
+@pytest.fixture
+def service():
+    """
+    The address of a report service running in a thread, stopped after the test.
+    """
+
+    server = main.ReportService(("127.0.0.1", 0), main.WorkbookCache(), 1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+# TESTS
+
+def test_json_report_matches_report(service, workbook):
+    parameters = {"workbook": workbook, "dates": "2024-01-01..", "format": "json"}
+    status, _, body = request(f"{service}/report", parameters)
+    assert status == 200
+    assert json.loads(body)["rows"] == create_rows(workbook)
+
+    # The second report on the same workbook reuses the open workbook.
+    assert request(f"{service}/report", parameters)[2] == body
+    cache = json.loads(request(f"{service}/status")[2])
+    assert (cache["hits"], cache["misses"]) == (1, 1)
+    assert cache["workbooks"] == [{"workbook": workbook, "sheets": 8}]
+
+def test_post_csv_and_docx_reports(service, workbook):
+    body = json.dumps({"workbook": workbook, "dates": "2024-01-01..", "format": "csv"}).encode("utf-8")
+    status, headers, csv = request(f"{service}/report", body=body)
+    assert status == 200
+    assert headers["Content-Type"] == main.SERVICE_FORMATS["csv"]
+    assert pd.read_csv(BytesIO(csv), dtype=str, keep_default_na=False).values.tolist() == create_rows(workbook)
+
+    status, headers, document = request(f"{service}/report", {"workbook": workbook})
+    assert status == 200
+    assert "report.docx" in headers["Content-Disposition"]
+    with zipfile.ZipFile(BytesIO(document)) as archive:
+        assert main.DOCUMENT_PART in archive.namelist()
+
+def test_changed_workbook_is_read_again(service, workbook, edit_sheet):
+    parameters = {"workbook": workbook, "dates": "2024-01-01..", "format": "json"}
+    before = json.loads(request(f"{service}/report", parameters)[2])["rows"]
+    edit_sheet(workbook, "xl/worksheets/sheet3.xml", r"Drilling \(to [0-9.]+m\)", "Drilling (to 9999m)")
+    after = json.loads(request(f"{service}/report", parameters)[2])["rows"]
+
+    assert after != before
+    assert after == create_rows(workbook)
+
+def test_statistics(service, workbook):
+    status, _, body = request(f"{service}/statistics", {"workbook": workbook, "dates": "2024-01-02..2024-01-04"})
+    assert status == 200
+    statistics = json.loads(body)
+    assert (statistics["first"], statistics["last"], statistics["days"]) == ("2024-01-02", "2024-01-04", 3)
+    assert statistics["statistics"]["depth"]["minimum"] <= statistics["statistics"]["depth"]["maximum"]
+
+@pytest.mark.parametrize("path, parameters, body, expected", [
+    ("/report", {}, None, 400),
+    ("/report", {"workbook": "{missing}"}, None, 404),
+    ("/report", {"workbook": "{workbook}", "format": "xlsx"}, None, 400),
+    ("/report", {"workbook": "{workbook}", "start_time": "24:30"}, None, 400),
+    ("/report", {"workbook": "{workbook}", "weighted": "true"}, None, 400),
+    ("/report", {"workbook": "{workbook}", "dates": "2025-01-01.."}, None, 400),
+    ("/report", None, b"[1, 2]", 400),
+    ("/report", None, b"not json", 400),
+    ("/statistics", {"workbook": "{missing}"}, None, 404),
+    ("/unknown", {}, None, 404)
+])
+def test_errors(service, workbook, tmp_path, path, parameters, body, expected):
+    if parameters != None:
+        parameters = {key: value.format(workbook=workbook, missing=str(tmp_path / "missing.xlsx")) for key, value in parameters.items()}
+    status, headers, response = request(f"{service}{path}", parameters, body)
+
+    assert status == expected
+    assert headers["Content-Type"] == main.SERVICE_FORMATS["json"]
+    assert "error" in json.loads(response)
+
+def test_least_recently_used_workbook_is_evicted(tmp_path):
+    workbooks = [str(tmp_path / f"{name}.xlsx") for name in ["first", "second"]]
+    for workbook in workbooks:
+        benchmark.generate_workbook(workbook, 2, 5)
+
+    cache = main.WorkbookCache(size_limit=1)
+    for workbook in workbooks:
+        cache.open(workbook)
+    assert [entry["workbook"] for entry in cache.status()["workbooks"]] == [workbooks[1]]
@@ -0,0 +1,77 @@
+"""
+Tests of the date index over sheet names, against a linear scan of the sheets.
+"""
+
+
+# IMPORTS
+import random
+from datetime import date, timedelta
+import pytest
+import main
+
+
+# UTILITY FUNCTIONS
+
+def create_names(generator: random.Random) -> tuple:
+    """
+    Create the sheet names of a workbook with gaps between its days, out of order and with sheets without a date.
+    It returns the names, and the dates of the sheets with a date by name.
+    """
+
+    first = date(2023, 12, 20)
+    days = sorted(generator.sample(range(40), generator.randint(0, 15)))
+    dates = {(first + timedelta(days=day)).strftime(main.SHEET_DATE_FORMAT): first + timedelta(days=day) for day in days}
+    names = list(dates) + ["Summary", "2024 Foo-01", "Sheet1"]
+    generator.shuffle(names)
+    return names, dates
+
+def scan_range(dates: dict, start: date | None, end: date | None) -> tuple | None:
+    """
+    Find the first and last sheet within a date range by checking every sheet.
+    """
+
+    within = sorted((day, name) for name, day in dates.items() if (start == None or day >= start) and (end == None or day <= end))
+    return (within[0][1], within[-1][1]) if len(within) > 0 else None
+
+
+# TESTS
+
+@pytest.mark.parametrize("seed", range(20))
+def test_index_matches_linear_scan(seed):
+    generator = random.Random(seed)
+    names, dates = create_names(generator)
+    index = main.SheetIndex(names)
+
+    assert list(index) == sorted(dates, key=dates.get)
+    assert [index.index(name) for name in index] == list(range(len(dates)))
+    assert "Summary" not in index
+    with pytest.raises(ValueError):
+        index.index("Summary")
+
+    # Every day around the sheets, as a sheet name and as YYYY-MM-DD.
+    days = [date(2023, 12, 15) + timedelta(days=i) for i in range(50)]
+    for day in days:
+        expected = next((name for name, other in dates.items() if other == day), None)
+        assert index.find(day.strftime(main.SHEET_DATE_FORMAT)) == expected
+        assert index.find(day.isoformat()) == expected
+
+    for _ in range(100):
+        start, end = [generator.choice([None, *days]) for _ in range(2)]
+        text = f"{'' if start == None else start.isoformat()}..{'' if end == None else end.strftime(main.SHEET_DATE_FORMAT)}"
+        expected = scan_range(dates, start, end)
+        if expected == None:
+            with pytest.raises(ValueError):
+                index.range(text)
+        else:
+            assert index.range(text) == expected
+
+@pytest.mark.parametrize("text", ["2024-01-01", "2024-01-01...2024-01-02x", "yesterday..", "..2024-13-01"])
+def test_invalid_ranges(text):
+    with pytest.raises(ValueError):
+        main.SheetIndex(["2024 Jan-01", "2024 Jan-02"]).range(text)
+
+def test_invalid_dates_are_not_found():
+    index = main.SheetIndex(["2024 Jan-01"])
+    assert index.find("Summary") == None
+    assert index.find("2024-02-30") == None
+    assert index.find(" 2024-01-01 ") == "2024 Jan-01"
@@ -0,0 +1,70 @@
+"""
+Tests that starting the program does not load the heavy modules, which are only loaded when they are first used.
+The program is started in a new process, so the modules loaded by the other tests do not count.
+"""
+
+
+# IMPORTS
+import json
+import os
+import subprocess
+import sys
+
+
+# CONSTANTS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Records the modules searched for while main is imported, then prints them with the loaded modules.
+IMPORT_MAIN = """
+import importlib.util
+import json
+import sys
+searched = []
+find_spec = importlib.util.find_spec
+importlib.util.find_spec = lambda name, *arguments: searched.append(name) or find_spec(name, *arguments)
+import main
+loaded = sorted(sys.modules)
+main.pd.DataFrame
+print(json.dumps({"searched": searched, "loaded": loaded, "used": sorted(sys.modules)}))
+"""
+
+
+# UTILITY FUNCTIONS
+
+def run_python(*arguments: str) -> subprocess.CompletedProcess:
+    """
+    Run Python in a new process in the repository directory.
+    """
+
+    return subprocess.run([sys.executable, *arguments], cwd=ROOT, capture_output=True, text=True, timeout=120)
+
+def imported_modules(importtime: str) -> set:
+    """
+    Find the modules imported by a process from the output of python -X importtime.
+    """
+
+    return {line.split("|")[-1].strip() for line in importtime.splitlines() if line.startswith("import time:")}
+
+
+# TESTS
+
+def test_import_does_not_load_heavy_modules():
+    result = run_python("-c", IMPORT_MAIN)
+    assert result.returncode == 0, result.stderr
+    modules = json.loads(result.stdout.splitlines()[-1])
+
+    assert "pandas.core" not in modules["loaded"]
+    assert "docx" not in modules["loaded"]
+    assert "docx" not in modules["searched"]
+    # pandas is loaded on first use.
+    assert "pandas.core" in modules["used"]
+
+def test_help_does_not_load_heavy_modules():
+    result = run_python("-X", "importtime", "main.py", "--help")
+    assert result.returncode == 0, result.stderr
+    assert "usage:" in result.stdout
+
+    modules = imported_modules(result.stderr)
+    assert "argparse" in modules
+    assert not any(module.split(".")[0] in ["pandas", "numpy", "docx", "openpyxl"] for module in modules)
@@ -0,0 +1,22 @@
+"""
+Tests of the statistics of ranges of days.
+"""
+
+
+# IMPORTS
+import main
+
+
+# TESTS
+
+def test_shared_string_change_updates_statistics(shared_workbook, edit_shared_string):
+    statistics = main.WorkbookCache().statistics(shared_workbook, workers=1)
+    before = statistics.query(0, statistics.count - 1)
+
+    # The day summaries are stored between the two, so a stale day would be reused.
+    edit_shared_string(shared_workbook, r"Drilling \(to [0-9.]+m\)", "Drilling (to 9999m)")
+    statistics = main.WorkbookCache().statistics(shared_workbook, workers=1)
+    after = statistics.query(0, statistics.count - 1)
+
+    assert before["depth"]["maximum"] < 9999
+    assert after["depth"]["maximum"] == 9999
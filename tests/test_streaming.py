@@ -0,0 +1,40 @@
+"""
+Tests that reports are the same however many days are summarized at a time.
+"""
+
+
+# IMPORTS
+import pandas as pd
+import pytest
+import main
+
+
+# UTILITY FUNCTIONS
+
+def create_report(filename: str) -> main.Report:
+    """
+    Create a report of every day of a workbook, with its weekly level and weighted statistics.
+    """
+
+    with pd.ExcelFile(filename) as data:
+        sheets = main.get_date_sheets(data)
+        report = main.create_report(data, sheets, sheets[0], "06:30", sheets[-1], "18:00", 1500, workers=1, levels=["tour", "week"], weighted=True)
+    main.Diagnostics.collect()
+    return report
+
+
+# TESTS
+
+@pytest.mark.parametrize("chunk", [1, 3])
+def test_chunks_match_whole_range(workbook, monkeypatch, chunk):
+    whole = create_report(workbook)
+    monkeypatch.setattr(main, "STREAM_CHUNK_DAYS", chunk)
+    chunked = create_report(workbook)
+
+    assert chunked.rows == whole.rows
+    assert chunked.maximum_depth == whole.maximum_depth
+    assert chunked.statistics == whole.statistics
+    assert [i.key() for i in chunked.diagnostics] == [i.key() for i in whole.diagnostics]
+    pd.testing.assert_frame_equal(chunked.weighted, whole.weighted)
+    for level in ["tour", "week"]:
+        assert chunked.levels[level].rows == whole.levels[level].rows
@@ -0,0 +1,47 @@
+"""
+Tests of values, their units and arrays of values.
+"""
+
+
+# IMPORTS
+import math
+import pytest
+import main
+
+
+# TESTS
+
+def test_values_compare_by_unit():
+    assert main.Value(1200, "kg/m³") < main.Value(1250, "kg/m³")
+    assert main.Value(1200, "kg/m³") == 1200
+    assert main.Value(1200, "kg/m³") != main.Value(1200, "kPa")
+    with pytest.raises(ValueError):
+        main.Value(1200, "kg/m³") < main.Value(1250, "kPa")
+
+def test_value_units_are_interned():
+    first = main.Value(1, "".join(["kg/", "m³"]))
+    second = main.Value(2, "kg/m³")
+    assert first.unit is second.unit
+    assert not hasattr(first, "__dict__")
+
+def test_value_array_from_values():
+    array = main.ValueArray.from_values([main.Value(1.5, "m³/min"), None, main.Value(2, "m³/min")], "m³/min")
+    assert len(array) == 3
+    assert array.unit == "m³/min"
+    assert array.values[0] == 1.5 and math.isnan(array.values[1]) and array.values[2] == 2
+
+def test_value_array_rejects_other_units():
+    with pytest.raises(ValueError):
+        main.ValueArray.from_values([main.Value(1200, "kg/m³"), main.Value(300, "kPa")], "kg/m³")
+
+def test_operation_table_checks_units():
+    day = [main.Drilling(["0", "0.5", 12, None, "Drilling (to 1500m) @ 1200 kg/m³ MW. 2.5 m³/min. 1300 kg/m³ ECD"])]
+    table = main.build_operation_table([day])
+    assert table["depth"].tolist() == [1500]
+    assert table["mud_weight"].tolist() == [1200]
+    assert table["pump_rate"].tolist() == [2.5]
+
+    # A value parsed in an unexpected unit is not mixed into a column.
+    day[0].mud_weight = main.Value(1200, "kPa")
+    with pytest.raises(ValueError):
+        main.build_operation_table([day])
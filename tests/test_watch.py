@@ -0,0 +1,37 @@
+"""
+Tests of the reports generated in watch mode, which only read the sheets that changed.
+"""
+
+
+# IMPORTS
+import argparse
+import main
+
+
+# UTILITY FUNCTIONS
+
+def create_options() -> argparse.Namespace:
+    """
+    Create the command-line options of watch mode, for a report of every day.
+    """
+
+    return argparse.Namespace(
+        start_date="2024-01-01", start_time="00:00", end_date=None, end_time="23:59", dates=None,
+        threshold=main.LINE_RESTRICTION_MAXIMUM, no_cache=False
+    )
+
+
+# TESTS
+
+def test_only_changed_sheet_is_parsed(workbook, edit_sheet, tmp_path):
+    output = str(tmp_path)
+    _, _, error, _ = main.watch_report(workbook, output, create_options())
+    assert error == None
+
+    edit_sheet(workbook, "xl/worksheets/sheet3.xml", r"Drilling \(to [0-9.]+m\)", "Drilling (to 9999m)")
+    main.Profiler.counters.clear()
+    _, _, error, _ = main.watch_report(workbook, output, create_options())
+
+    assert error == None
+    assert main.Profiler.counters["sheets parsed"] == 1
+    assert main.Profiler.counters["days reused"] == 7
@@ -0,0 +1,78 @@
+"""
+Tests of the duration-weighted statistics of each day.
+"""
+
+
+# IMPORTS
+import math
+import pandas as pd
+import pytest
+import main
+
+
+# UTILITY FUNCTIONS
+
+def create_table(records: list) -> pd.DataFrame:
+    """
+    Create a table of operations with an ECD and a duration, without any other values.
+    """
+
+    table = pd.DataFrame(records, columns=["day", "duration", "ecd"])
+    for name in main.WEIGHTED_VALUES:
+        if name not in table:
+            table[name] = math.nan
+    return table
+
+
+# TESTS
+
+def test_weighted_mean_and_percentiles():
+    table = create_table([
+        # Day 1, in no particular order: 1200 for 2 hours, and 1250 and 1300 for 1 hour each.
+        (1, 1.0, 1300), (1, 2.0, 1200), (1, 1.0, 1250),
+        # Day 2: operations without a value or a duration are left out.
+        (2, 0.5, 1210), (2, 3.0, math.nan), (2, 1.5, 1220), (2, 0.0, 1230),
+        # A day that is not asked for.
+        (9, 1.0, 5000)
+    ])
+    weighted = main.weigh_days(table, [1, 2, 3])
+
+    assert list(weighted.index) == [1, 2, 3]
+    # (1200 * 2 + 1250 + 1300) / 4 hours.
+    assert weighted.loc[1, "ecd_mean"] == pytest.approx(1237.5)
+    # The running totals of duration are 2, 3 and 4 hours, so 0.4, 2 and 3.6 hours are reached at 1200, 1200 and 1300.
+    assert weighted.loc[1, ["ecd_p10", "ecd_p50", "ecd_p90"]].tolist() == [1200, 1200, 1300]
+    # (1210 * 0.5 + 1220 * 1.5) / 2 hours, with running totals of 0.5 and 2 hours.
+    assert weighted.loc[2, "ecd_mean"] == pytest.approx(1217.5)
+    assert weighted.loc[2, ["ecd_p10", "ecd_p50", "ecd_p90"]].tolist() == [1210, 1220, 1220]
+    # Days and values without any operations are not reported.
+    assert weighted.loc[3].isna().all()
+    assert weighted["esd_mean"].isna().all()
+
+def test_weighted_empty_table():
+    weighted = main.weigh_days(create_table([]), [1, 2])
+    assert weighted.shape == (2, len(main.WEIGHTED_VALUES) * (1 + len(main.PERCENTILES)))
+    assert weighted.isna().all().all()
+
+def test_weighted_rows_match_days(workbook):
+    with pd.ExcelFile(workbook) as data:
+        sheets = main.get_date_sheets(data)
+        report = main.create_report(data, sheets, sheets[0], "00:00", sheets[-1], "23:59", workers=1, weighted=True)
+        table = main.build_operation_table([main.load_days(data, [sheet])[0] for sheet in sheets], list(range(1, len(sheets) + 1)))
+    main.Diagnostics.collect()
+
+    rows = main.build_row_table(report)
+    assert list(rows.columns) == main.ROW_EXPORT_COLUMNS + main.WEIGHTED_EXPORT_COLUMNS
+    expected = main.weigh_days(table, list(range(1, len(sheets) + 1)))
+    assert rows["Weighted ECD (kg/m³)"].tolist() == pytest.approx(expected["ecd_mean"].tolist())
+
+@pytest.mark.parametrize("options", [{"weighted": True}, {"levels": ["week"]}, {"operations": ".csv"}])
+def test_store_cannot_be_combined(workbook, tmp_path, options):
+    if "operations" in options:
+        options = {"operations": main.TableWriter(str(tmp_path / f"operations{options['operations']}"), main.OPERATION_EXPORT_COLUMNS)}
+    with pd.ExcelFile(workbook) as data:
+        sheets = main.get_date_sheets(data)
+        with pytest.raises(ValueError):
+            main.create_report(data, sheets, sheets[0], "00:00", sheets[-1], "23:59", workers=1, store=main.DayStore(data, str(tmp_path)), **options)
+    if "operations" in options:
+        options["operations"].close()